@@ -0,0 +1,59 @@
+# backend/commons/management/commands/apply_retention.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from commons.retention import RetentionPolicy, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Archive rows older than settings.RETENTION_POLICIES to gzip files and delete them, in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--policy", action="append", choices=sorted(settings.RETENTION_POLICIES),
+            help="Policy to apply (repeatable; default: all)",
+        )
+        parser.add_argument("--keep-days", type=int, help="Override the policies' keep_days")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per transaction (default: 1000)")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between chunks (default: 0)")
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be archived; don't write")
+
+    def handle(self, *args, **opts):
+        if opts["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+        if opts["keep_days"] is not None and opts["keep_days"] < 0:
+            raise CommandError("--keep-days can't be negative")
+
+        names = opts["policy"] or sorted(settings.RETENTION_POLICIES)
+        for name in names:
+            config = settings.RETENTION_POLICIES[name]
+            keep_days = opts["keep_days"] if opts["keep_days"] is not None else config["keep_days"]
+            policy = RetentionPolicy(
+                name, config["model"], config["date_field"], keep_days, settings.RETENTION_ARCHIVE_DIR,
+            )
+            cutoff = retention_cutoff(keep_days)
+            plan = policy.plan(cutoff)
+            total = sum(rows for _, rows in plan)
+
+            self.stdout.write(f"📊 {name}: {total:,} rows before {cutoff:%Y-%m-%d} (keep {keep_days} days)")
+            for month, rows in plan:
+                self.stdout.write(f"  • {month:%Y-%m}: {rows:,}")
+            if not total:
+                continue
+            if opts["dry_run"]:
+                self.stdout.write(self.style.WARNING(f"🔍 DRY RUN - Would archive {total:,} {name} rows"))
+                continue
+
+            started = time.monotonic()
+
+            def progress(moved):
+                self.stdout.write(f"  ⏳ {moved:,}/{total:,}", ending="\r")
+                self.stdout.flush()
+
+            moved = policy.run(cutoff, chunk_size=opts["chunk_size"], pause=opts["pause"], progress=progress)
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Archived {moved:,} {name} rows to {settings.RETENTION_ARCHIVE_DIR / name} in {elapsed:.1f}s"
+            ))
@@ -0,0 +1,226 @@
+# backend/commons/pagination.py
+import base64
+import datetime
+import decimal
+import json
+
+from django.db import connections
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a unique sort key, (updated_at, id) by default.
+
+    Each page is `WHERE key < last_key ORDER BY key LIMIT n`, so deep pages cost
+    the same as the first one (given an index on the key) and rows don't shift
+    between pages while others edit. An explicit queryset ordering (a client's
+    ?ordering=, search rank) is honoured by putting its fields in front of the key.
+    Key fields that can be NULL (nullable columns, annotations) sort their NULLs
+    after every value, on every database, and the cursor comparison treats them
+    the same way.
+
+    No COUNT(*) by default; ?count=true adds a total that is exact up to
+    `count_limit` rows and an estimate beyond that.
+    """
+
+    ordering = ("-updated_at", "-id")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    count_limit = 10000
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.fields = self.get_ordering(queryset, request)
+        self.nullable = self.get_nullable(queryset, self.fields)
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() in ("1", "true", "yes"):
+            self.count, self.count_is_estimate = self.get_count(queryset)
+
+        values, reverse = self.decode_cursor(request)
+        ordering = [self._flip(f) for f in self.fields] if reverse else list(self.fields)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, values, self.nullable, nulls_first=reverse))
+
+        order_by = [self._order_expression(f, reverse) if f.lstrip("-") in self.nullable else f for f in ordering]
+        rows = list(queryset.order_by(*order_by)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Going back always leaves a next page; going forward, one exists past a cursor
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else values is not None
+        self.first, self.last = (rows[0], rows[-1]) if rows else (None, None)
+        if not rows and values is not None:
+            self.has_next = self.has_previous = False
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
+        if self.count is not None:
+            payload["count"] = self.count
+            payload["count_is_estimate"] = self.count_is_estimate
+        payload["results"] = data
+        return Response(payload)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset, request):
+        """Key fields: the queryset's explicit ordering followed by the unique key"""
+        fields = [f for f in queryset.query.order_by if isinstance(f, str) and f != "?"]
+        names = {f.lstrip("-") for f in fields}
+        return tuple(fields) + tuple(f for f in self.ordering if f.lstrip("-") not in names)
+
+    @staticmethod
+    def get_nullable(queryset, fields):
+        """
+        Names of key fields that can be NULL: annotations, and lookups through a
+        nullable column or relation
+        """
+        nullable = set()
+        for field in fields:
+            name = field.lstrip("-")
+            if name in queryset.query.annotations:
+                nullable.add(name)
+                continue
+            model = queryset.model
+            try:
+                for part in name.split(LOOKUP_SEP):
+                    model_field = model._meta.get_field(part)
+                    if model_field.null:
+                        nullable.add(name)
+                        break
+                    model = model_field.related_model
+            except (FieldDoesNotExist, AttributeError):
+                nullable.add(name)
+        return nullable
+
+    # ---------------- cursors ----------------
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(raw.encode()).decode())
+            values, reverse = data["v"], bool(data.get("r"))
+        except (ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, obj, reverse=False):
+        values = [getattr(obj, f.lstrip("-")) for f in self.fields]
+        data = json.dumps({"v": values, "r": int(reverse)}, default=self._encode_value)
+        cursor = base64.urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self.encode_cursor(self.last)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first is None:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.first, reverse=True)
+
+    # ---------------- helpers ----------------
+
+    @staticmethod
+    def _encode_value(value):
+        # Full microsecond precision: the key must round-trip exactly
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _order_expression(field, nulls_first):
+        expression = F(field.lstrip("-"))
+        if field.startswith("-"):
+            return expression.desc(nulls_first=nulls_first, nulls_last=not nulls_first)
+        return expression.asc(nulls_first=nulls_first, nulls_last=not nulls_first)
+
+    @staticmethod
+    def keyset_filter(ordering, values, nullable=(), nulls_first=False):
+        """
+        Rows strictly after `values` in `ordering`: a lexicographic comparison
+        built from Q objects. Fields in `nullable` sort NULLs last (first with
+        nulls_first), so a plain comparison, which never matches NULL, gets an
+        isnull term instead.
+        """
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name, value = field.lstrip("-"), values[i]
+            lookup = "lt" if field.startswith("-") else "gt"
+            if name not in nullable:
+                term = Q(**{f"{name}__{lookup}": value})
+            elif value is None:
+                if not nulls_first:
+                    continue  # nothing sorts after NULL
+                term = Q(**{f"{name}__isnull": False})
+            else:
+                term = Q(**{f"{name}__{lookup}": value})
+                if not nulls_first:
+                    term |= Q(**{f"{name}__isnull": True})
+            for prev_field, prev_value in zip(ordering[:i], values[:i]):
+                # field=None is an IS NULL lookup
+                term &= Q(**{prev_field.lstrip("-"): prev_value})
+            condition |= term
+        return condition
+
+    def get_count(self, queryset):
+        """(count, is_estimate): exact up to count_limit, then the planner's estimate where available"""
+        count = queryset.order_by()[:self.count_limit + 1].count()
+        if count <= self.count_limit:
+            return count, False
+        if connections[queryset.db].vendor == "postgresql":
+            sql, params = queryset.order_by().query.sql_with_params()
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return max(int(plan[0]["Plan"]["Plan Rows"]), count), True
+        return count, True
+
+
+class ChangedAtKeysetPagination(KeysetPagination):
+    """Keyset pagination for history rows, newest change first"""
+    ordering = ("-changed_at", "-id")
+
+
+class CreatedAtKeysetPagination(KeysetPagination):
+    """Keyset pagination for rows that keep their creation time, e.g. upserted forecasts"""
+    ordering = ("-created_at", "-id")
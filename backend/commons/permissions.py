@@ -2,7 +2,10 @@
 from rest_framework import permissions
 
 def get_role(user):
-    """Return role from UserProfile if exists, else 'buyer'."""
+    """Return role from the verified JWT (users.authentication), else UserProfile, else 'buyer'."""
+    role = getattr(user, "token_role", None)
+    if role is not None:
+        return role
     return getattr(getattr(user, "profile", None), "role", "buyer")
 
 def is_admin_user(user):
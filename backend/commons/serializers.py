@@ -0,0 +1,113 @@
+# backend/commons/serializers.py
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.functional import cached_property
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def _names(raw):
+    return [name.strip() for name in (raw or "").split(",") if name.strip()]
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets: ?fields=id,name keeps only those
+    fields, ?omit=description drops fields. Both read from the request in the
+    serializer context, for safe methods on the top-level serializer only, so
+    writes and nested serializers keep their full field set.
+
+    Explicit `fields=` / `omit=` kwargs take precedence over the request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._sparse_fields = kwargs.pop("fields", None)
+        self._sparse_omit = kwargs.pop("omit", None)
+        super().__init__(*args, **kwargs)
+
+    def get_sparse_names(self):
+        """(fields, omit) lists, or None where not requested"""
+        fields, omit = self._sparse_fields, self._sparse_omit
+        if fields is None and omit is None:
+            request = self.context.get("request")
+            root = self.root
+            is_top_level = root is self or getattr(root, "child", None) is self
+            if request is None or not is_top_level or request.method not in permissions.SAFE_METHODS:
+                return None, None
+            params = request.query_params
+            fields = _names(params.get(FIELDS_PARAM)) or None
+            omit = _names(params.get(OMIT_PARAM)) or None
+        return fields, omit
+
+    @cached_property
+    def fields(self):
+        fields = super().fields
+        keep, omit = self.get_sparse_names()
+        if keep is None and omit is None:
+            return fields
+
+        unknown = [name for name in (keep or []) + (omit or []) if name not in fields]
+        if unknown:
+            raise ValidationError({
+                FIELDS_PARAM if keep else OMIT_PARAM: f"Unknown field: {', '.join(unknown)}",
+            })
+        for name in list(fields):
+            if (keep is not None and name not in keep) or (omit is not None and name in omit):
+                fields.pop(name)
+        return fields
+
+
+def queryset_projection(queryset, serializer_fields, required=()):
+    """
+    Column list for queryset.only() that covers `serializer_fields` (plus the
+    `required` model field names, e.g. sort keys and fields used by permission
+    checks). Dotted sources are followed into select_related() relations.
+
+    Returns None when some field reads something other than a model field or a
+    queryset annotation (a property, a method), since its columns can't be known.
+    """
+    model = queryset.model
+    opts = model._meta
+    select_related = queryset.query.select_related
+    annotations = queryset.query.annotations
+
+    columns = {opts.pk.name}
+    for name in required:
+        try:
+            opts.get_field(name)
+        except FieldDoesNotExist:
+            continue  # annotation or reverse relation: nothing to load
+        columns.add(name)
+
+    for field in serializer_fields.values():
+        if field.write_only:
+            continue
+        attrs = field.source_attrs
+        if not attrs or attrs[0] in annotations:
+            continue
+        try:
+            model_field = opts.get_field(attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            return None
+        columns.add(model_field.name)
+        if model_field.is_relation and len(attrs) > 1 and attrs[1] != "pk":
+            related_opts = model_field.related_model._meta
+            followed = select_related is True or (
+                isinstance(select_related, dict) and attrs[0] in select_related
+            )
+            if attrs[1] == related_opts.pk.name:
+                continue  # the foreign key column already holds it
+            if not followed:
+                return None
+            try:
+                related_field = related_opts.get_field(attrs[1])
+            except FieldDoesNotExist:
+                return None
+            if len(attrs) > 2 or related_field.is_relation or not related_field.concrete:
+                return None
+            columns.add(f"{attrs[0]}__{attrs[1]}")
+    return sorted(columns)
@@ -1,3 +1,73 @@
+from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from products.models import Product, ProductPriceHistory
+
+from .pagination import KeysetPagination
+
+
+class UnitsSoldPagination(KeysetPagination):
+    """Keyed on a nullable column: history rows recorded before units_sold was tracked are NULL"""
+    ordering = ("-units_sold", "-id")
+    page_size = 3
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user("supplier1", password="x")
+        product = Product.objects.create(
+            owner=owner, name="Lamp", sku="LAMP-1", category="other",
+            base_price=Decimal("10.00"), current_price=Decimal("15.00"),
+        )
+        for units_sold in (5, None, 9, 5, None, 1, None, 9):
+            ProductPriceHistory.objects.create(
+                product=product, old_price=Decimal("1.00"), new_price=Decimal("2.00"), units_sold=units_sold,
+            )
+        self.queryset = ProductPriceHistory.objects.all()
+
+    def page(self, pagination, query=None):
+        request = Request(APIRequestFactory().get("/history/", query or {}))
+        rows = pagination.paginate_queryset(self.queryset, request)
+        response = pagination.get_paginated_response([row.pk for row in rows]).data
+        return [(row.units_sold, row.pk) for row in rows], response
+
+    @staticmethod
+    def cursor(link):
+        return {"cursor": parse_qs(urlparse(link).query)["cursor"][0]}
+
+    def expected(self):
+        # NULLs after every value, ties broken on id
+        rows = [(r.units_sold, r.pk) for r in self.queryset]
+        present = sorted((r for r in rows if r[0] is not None), key=lambda r: (-r[0], -r[1]))
+        missing = sorted((r for r in rows if r[0] is None), key=lambda r: -r[1])
+        return present + missing
+
+    def test_nullable_key_pages_forward_and_back(self):
+        pagination = UnitsSoldPagination()
+        self.assertEqual(pagination.get_nullable(self.queryset, pagination.ordering), {"units_sold"})
+
+        pages, response = [], None
+        query = None
+        while True:
+            rows, response = self.page(pagination, query)
+            pages.append(rows)
+            if not response["next"]:
+                break
+            query = self.cursor(response["next"])
+        self.assertEqual([row for page in pages for row in page], self.expected())
+        self.assertEqual([len(page) for page in pages], [3, 3, 2])
+
+        # Back from the last page, through the NULL/non-NULL boundary
+        for expected in reversed(pages[:-1]):
+            rows, response = self.page(pagination, self.cursor(response["previous"]))
+            self.assertEqual(rows, expected)
 
-# Create your tests here.
+    def test_non_null_keys_keep_plain_comparisons(self):
+        condition = KeysetPagination.keyset_filter(["-updated_at", "-id"], ["2026-01-01T00:00:00", 5])
+        self.assertNotIn("isnull", str(condition))
+        self.assertEqual(KeysetPagination.get_nullable(Product.objects.all(), KeysetPagination.ordering), set())
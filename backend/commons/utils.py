@@ -0,0 +1,30 @@
+# backend/commons/utils.py
+import numpy as np
+
+
+def minmax_downsample(values, max_points):
+    """
+    Indices of the points to keep so a series fits in `max_points`.
+
+    Min/max bucketing: the first and last points are always kept and the
+    points in between are split into equal buckets, keeping each bucket's
+    lowest and highest value so peaks and dips survive. Fully vectorized
+    (one lexsort), returns sorted indices into `values`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+
+    buckets = max(1, (max_points - 2) // 2)
+    inner = np.arange(1, n - 1)
+    bucket_id = ((inner - 1) * buckets) // (n - 2)
+
+    # Sort by (bucket, value): first row of a bucket is its min, last is its max
+    order = np.lexsort((values[inner], bucket_id))
+    sorted_ids = bucket_id[order]
+    starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    ends = np.r_[starts[1:], len(order)] - 1
+
+    keep = np.concatenate(([0], inner[order[starts]], inner[order[ends]], [n - 1]))
+    return np.unique(keep)
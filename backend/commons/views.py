@@ -1,3 +1,138 @@
-from django.shortcuts import render
+# backend/commons/views.py
+import hashlib
 
-# Create your views here.
+from django.db.models import Count, Max
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import permissions
+
+from .serializers import queryset_projection
+
+
+class SparseFieldsViewMixin:
+    """
+    Push a serializer's sparse fieldset (commons.serializers.SparseFieldsMixin)
+    into SQL with .only(), so unrequested columns are never fetched or decoded.
+
+    `projection_actions` are the actions whose queryset is serialized with the
+    view's serializer; other actions project their own querysets, if at all.
+    `projection_required_fields` lists model fields the view itself reads
+    (ownership checks, filters run in Python); sort keys are added automatically.
+    """
+
+    projection_actions = ("list", "retrieve")
+    projection_required_fields = ()
+
+    def get_projection_serializer(self):
+        return self.get_serializer()
+
+    def project_queryset(self, queryset, serializer=None, required=()):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return queryset
+        serializer = serializer or self.get_projection_serializer()
+        keep, omit = serializer.get_sparse_names()
+        if keep is None and omit is None:
+            return queryset
+
+        required = set(self.projection_required_fields) | set(required)
+        required.update(f.lstrip("-") for f in queryset.query.order_by if isinstance(f, str))
+        paginator = self.paginator if self.action in self.projection_actions else None
+        required.update(f.lstrip("-") for f in getattr(paginator, "ordering", ()) if isinstance(f, str))
+
+        columns = queryset_projection(queryset, serializer.fields, required)
+        if columns is None:
+            return queryset
+        if isinstance(queryset.query.select_related, dict):
+            # Only join the relations the remaining fields read
+            followed = {c.split("__", 1)[0] for c in columns if "__" in c}
+            queryset = queryset.select_related(None)
+            if followed:
+                # select_related() with no arguments would follow every relation
+                queryset = queryset.select_related(*sorted(followed))
+        return queryset.only(*columns)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.projection_actions:
+            queryset = self.project_queryset(queryset)
+        return queryset
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified on read endpoints.
+
+    Validators come from one aggregate query (max timestamp + row count) over
+    the queryset a response would be built from, so an unchanged poll returns
+    304 before anything is serialized. The ETag also covers the path, query
+    string and user, since those change the representation but not the rows.
+
+    Fields read through a relation without a timestamp of their own (e.g. the
+    owner's username) are passed as `related_fields`: their distinct values are
+    read with a second query and hashed into the ETag, so renaming the owner
+    changes it even though no row's timestamp moved.
+
+    Last-Modified is only sent for a single instance. A collection can change
+    without its newest timestamp moving (a row deleted, or edited within the
+    same second), and HTTP dates only have one-second resolution, so
+    collections are revalidated on the ETag alone.
+    """
+
+    def get_validators(self, queryset=None, timestamp_fields=("updated_at",), instance=None, related_fields=()):
+        """(etag, last_modified) for a queryset, or for a single instance"""
+        related = []
+        if instance is not None:
+            stamps = [getattr(instance, f) for f in timestamp_fields]
+            count = 1
+            for lookup in related_fields:
+                value = instance
+                for name in lookup.split(LOOKUP_SEP):
+                    value = getattr(value, name, None)
+                related.append(value)
+        else:
+            aggregates = {f"max_{i}": Max(f) for i, f in enumerate(timestamp_fields)}
+            result = queryset.order_by().aggregate(count=Count("pk"), **aggregates)
+            count = result.pop("count")
+            stamps = list(result.values())
+            if related_fields:
+                related = sorted(
+                    queryset.order_by().values_list(*related_fields).distinct(),
+                    key=repr,
+                )
+        stamps = [s for s in stamps if s is not None]
+        last_modified = max(stamps) if stamps else None
+
+        request = self.request
+        params = sorted(request.query_params.lists())
+        key = "|".join([
+            request.path, repr(params), str(getattr(request.user, "pk", "")),
+            str(count), last_modified.isoformat() if last_modified else "", repr(related),
+        ])
+        return quote_etag(hashlib.md5(key.encode()).hexdigest()), last_modified
+
+    def check_not_modified(self, queryset=None, timestamp_fields=("updated_at",), instance=None, related_fields=()):
+        """A 304 response when the client's copy is current, else None (headers are set on the response)"""
+        if self.request.method not in ("GET", "HEAD"):
+            return None
+        etag, last_modified = self.get_validators(queryset, timestamp_fields, instance, related_fields)
+        if instance is None:
+            last_modified = None
+        self._conditional_validators = (etag, last_modified)
+        return get_conditional_response(
+            self.request._request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, "_conditional_validators", None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response.headers.setdefault("ETag", etag)
+            if last_modified:
+                response.headers.setdefault("Last-Modified", http_date(last_modified.timestamp()))
+            # Let browsers keep a copy but revalidate every time
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -59,7 +59,8 @@ INSTALLED_APPS += EXTEND_APPS
 # DRF
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Request user and role come from the token's claims (users.tokens.role_claims)
+        "users.authentication.RoleClaimsJWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
@@ -135,6 +136,9 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+# How long a process trusts its cached role version; a role change (revoke_role_tokens)
+# reaches processes with a separate cache within this many seconds
+ROLE_VERSION_CACHE_SECONDS = int(os.getenv("ROLE_VERSION_CACHE_SECONDS", "60"))
 # ----------------------------
 
 
@@ -204,4 +208,24 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
-SITE_URL = "http://127.0.0.1:8000"
\ No newline at end of file
+SITE_URL = "http://127.0.0.1:8000"
+# Retention (python manage.py apply_retention): rows older than keep_days are
+# appended to RETENTION_ARCHIVE_DIR/<policy>/<YYYY-MM>.jsonl.gz and deleted.
+# Price history stays summarised in products.PriceRollup after archiving.
+RETENTION_ARCHIVE_DIR = Path(os.getenv("RETENTION_ARCHIVE_DIR", BASE_DIR / "archive"))
+RETENTION_POLICIES = {
+    "price_history": {
+        "model": "products.ProductPriceHistory",
+        "date_field": "changed_at",
+        "keep_days": int(os.getenv("PRICE_HISTORY_KEEP_DAYS", "365")),
+    },
+    "forecasts": {
+        "model": "forecast.DemandForecast",
+        "date_field": "updated_at",
+        "keep_days": int(os.getenv("FORECAST_KEEP_DAYS", "730")),
+    },
+}
+# Catalog uploads (POST /api/products/import/) are streamed to IMPORT_UPLOAD_DIR and
+# run by the import worker: python manage.py process_imports
+IMPORT_UPLOAD_DIR = Path(os.getenv("IMPORT_UPLOAD_DIR", BASE_DIR / "uploads"))
+IMPORT_MAX_UPLOAD_BYTES = int(os.getenv("IMPORT_MAX_UPLOAD_MB", "1024")) * 1024 * 1024
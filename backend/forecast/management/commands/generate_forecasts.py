@@ -0,0 +1,143 @@
+# backend/forecast/management/commands/generate_forecasts.py
+import multiprocessing
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef
+
+from products.models import Product
+from forecast.methods import FORECAST_METHODS, ENSEMBLE
+from forecast.models import DemandForecast
+from forecast.services import DemandForecastService
+
+User = get_user_model()
+
+
+def _init_worker():
+    """Give each worker process its own DB connections"""
+    django.setup()
+    connections.close_all()
+
+
+def _generate_chunk(task):
+    """Build and upsert forecasts for one chunk of product ids; returns products processed"""
+    ids, method, years, paths, seed, user_id = task
+    products = list(Product.objects.filter(id__in=ids))
+    user = User.objects.filter(pk=user_id).first() if user_id else None
+    forecasts = DemandForecastService.build_forecasts(
+        products, method, years, user=user, paths=paths, seed=seed,
+    )
+    with transaction.atomic():
+        DemandForecastService.save_forecasts(forecasts)
+    return len(products)
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = "Generate demand forecasts for the whole catalog (or a filtered part of it) in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--method", default="historical_simulation",
+            choices=sorted(list(FORECAST_METHODS) + [ENSEMBLE]),
+            help="Forecast method to run (default: historical_simulation)",
+        )
+        parser.add_argument("--years", type=int, default=5, help="Years of demand to generate (1-10)")
+        parser.add_argument("--paths", type=int, default=2000, help="Simulated paths per product (monte_carlo/ensemble)")
+        parser.add_argument("--owner", help="Only products owned by this username")
+        parser.add_argument("--category", choices=[c for c, _ in Product.CATEGORY_CHOICES], help="Only this category")
+        parser.add_argument("--include-inactive", action="store_true", help="Also forecast inactive products")
+        parser.add_argument(
+            "--stale-only", action="store_true",
+            help="Skip products whose forecast for --method is newer than their last update",
+        )
+        parser.add_argument("--user", help="Username recorded as created_by")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Products per chunk (default: 2000)")
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Worker processes (default: 1). Parallel writes need PostgreSQL; SQLite serializes them.",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+
+    def handle(self, *args, **opts):
+        if not 1 <= opts["years"] <= 10:
+            raise CommandError("--years must be between 1 and 10")
+        if opts["chunk_size"] < 1 or opts["workers"] < 1:
+            raise CommandError("--chunk-size and --workers must be positive")
+
+        qs = Product.objects.all()
+        if not opts["include_inactive"]:
+            qs = qs.filter(is_active=True)
+        if opts["category"]:
+            qs = qs.filter(category=opts["category"])
+        if opts["owner"]:
+            owner = User.objects.filter(username__iexact=opts["owner"]).first()
+            if not owner:
+                raise CommandError(f"Owner user '{opts['owner']}' not found")
+            qs = qs.filter(owner=owner)
+        if opts["stale_only"]:
+            fresh = DemandForecast.objects.filter(
+                product=OuterRef("pk"),
+                forecast_method=opts["method"],
+                updated_at__gte=OuterRef("updated_at"),
+            )
+            qs = qs.filter(~Exists(fresh))
+
+        user_id = None
+        if opts["user"]:
+            user = User.objects.filter(username__iexact=opts["user"]).first()
+            if not user:
+                raise CommandError(f"User '{opts['user']}' not found")
+            user_id = user.id
+
+        total = qs.count()
+        self.stdout.write(f"📊 {total:,} products to forecast with method={opts['method']}")
+        if not total:
+            return
+
+        # Stream ids in primary-key order; each chunk reloads its own products
+        ids = qs.order_by("id").values_list("id", flat=True).iterator(chunk_size=opts["chunk_size"])
+        seed = opts["seed"]
+        tasks = (
+            (chunk, opts["method"], opts["years"], opts["paths"],
+             None if seed is None else seed + n, user_id)
+            for n, chunk in enumerate(_chunked(ids, opts["chunk_size"]))
+        )
+
+        started = time.monotonic()
+        done = 0
+        if opts["workers"] == 1:
+            for task in tasks:
+                done += _generate_chunk(task)
+                self._progress(done, total, started)
+        else:
+            # Workers open their own connections; don't hand them ours
+            connections.close_all()
+            with multiprocessing.Pool(opts["workers"], initializer=_init_worker) as pool:
+                for count in pool.imap_unordered(_generate_chunk, tasks):
+                    done += count
+                    self._progress(done, total, started)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Generated forecasts for {done:,} products in {elapsed:.1f}s "
+            f"({done / max(elapsed, 1e-9):,.0f} products/s)"
+        ))
+
+    def _progress(self, done, total, started):
+        elapsed = time.monotonic() - started
+        rate = done / max(elapsed, 1e-9)
+        self.stdout.write(f"  • {done:,}/{total:,} ({done * 100 / total:.1f}%) – {rate:,.0f} products/s")
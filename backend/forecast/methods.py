@@ -0,0 +1,157 @@
+# backend/forecast/methods.py
+import numpy as np
+
+from . import simulation
+
+# name -> function(frame, years, rng, **options) returning a result dict:
+#   {"demand": (products, years) array, "bands": optional (products, 3, years),
+#    "confidence": optional (products,) array}
+FORECAST_METHODS = {}
+
+ENSEMBLE = "ensemble"
+
+# Fallback ensemble weights, used when too few products have sales history to
+# backtest against (see backtest_weights). monte_carlo is the median of the
+# simulated paths, so it gets the most; trend_analysis extrapolates a crude
+# sales-implied level, so the least.
+ENSEMBLE_WEIGHTS = {
+    "monte_carlo": 0.35,
+    "historical_simulation": 0.25,
+    "price_elasticity": 0.25,
+    "trend_analysis": 0.15,
+}
+DEFAULT_ENSEMBLE_WEIGHT = 0.25
+
+# Products with held-out sales needed before fitted weights replace the fixed ones
+BACKTEST_MIN_PRODUCTS = 20
+
+
+def register(name):
+    """Register a vectorized forecast method under `name`"""
+    def decorator(func):
+        FORECAST_METHODS[name] = func
+        return func
+    return decorator
+
+
+class ProductFrame:
+    """Column arrays for a batch of products, loaded once and shared by all methods"""
+
+    def __init__(self, products):
+        self.products = list(products)
+        self.ids = np.array([p.id for p in self.products], dtype=np.int64)
+        self.categories = np.array([p.category for p in self.products])
+        self.base = np.array([simulation.base_demand(p) for p in self.products], dtype=np.float64)
+        self.units_sold = np.array([p.units_sold for p in self.products], dtype=np.float64)
+        self.current_price = np.array([float(p.current_price) for p in self.products], dtype=np.float64)
+        self.optimized_price = np.array([float(p.optimized_price) for p in self.products], dtype=np.float64)
+        self.elasticity = np.array([p.elasticity for p in self.products], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.products)
+
+
+def _seasonal(years):
+    i = np.arange(years, dtype=np.float64)
+    return 1 + 0.1 * np.sin((i * 2 * np.pi) / 4)
+
+
+@register("historical_simulation")
+def historical_simulation(frame, years, rng, **options):
+    """Category growth pattern with seasonality and volatility for default categories"""
+    noise = rng.uniform(-0.1, 0.1, size=(len(frame), years))
+    curves = simulation.growth_curves(frame.categories, years, noise=noise)
+    return {"demand": frame.base[:, None] * curves}
+
+
+@register("price_elasticity")
+def price_elasticity(frame, years, rng, **options):
+    """Demand at the optimized price using each product's elasticity, with seasonality"""
+    valid = (frame.current_price > 0) & (frame.optimized_price > 0)
+    ratio = np.where(valid, frame.optimized_price / np.where(valid, frame.current_price, 1), 1.0)
+    level = frame.base * ratio ** (-np.abs(frame.elasticity))
+    return {"demand": level[:, None] * _seasonal(years)}
+
+
+@register("trend_analysis")
+def trend_analysis(frame, years, rng, **options):
+    """
+    Linear trend from the sales-implied level (units_sold share) to the current
+    demand level, capped at +/-20% of the base per year.
+    """
+    past = np.where(frame.units_sold > 0, frame.units_sold * 0.018, frame.base)
+    slope = (frame.base - past) / max(years - 1, 1)
+    slope = np.clip(slope, -0.2 * frame.base, 0.2 * frame.base)
+    steps = np.arange(years, dtype=np.float64) - (years - 1)
+    return {"demand": frame.base[:, None] + slope[:, None] * steps}
+
+
+@register("monte_carlo")
+def monte_carlo(frame, years, rng, paths=2000, **options):
+    """Median of simulated demand paths, with p10/p50/p90 bands"""
+    bands = simulation.simulate_bands(
+        frame.base, frame.categories, years, paths=paths, seed=rng,
+    )
+    return {
+        "demand": bands[:, 1, :],
+        "bands": bands,
+        "confidence": simulation.band_confidence(bands),
+    }
+
+
+def ensemble_weights(names):
+    """
+    Fixed weights for the methods in `names`, normalized to sum to 1. Methods
+    without an ENSEMBLE_WEIGHTS entry get DEFAULT_ENSEMBLE_WEIGHT.
+    """
+    weights = np.array([ENSEMBLE_WEIGHTS.get(name, DEFAULT_ENSEMBLE_WEIGHT) for name in names], dtype=np.float64)
+    return weights / weights.sum()
+
+
+def backtest_weights(predicted, actual):
+    """
+    Weights fitted from a backtest: `predicted` is (products, methods) annual
+    demand forecast from data up to a cutoff, `actual` is (products,) annualized
+    sales after it. Each method is scored by its median absolute log error and
+    weighted by the inverse of that score, normalized to sum to 1. Returns None
+    when fewer than BACKTEST_MIN_PRODUCTS products are given.
+    """
+    if len(actual) < BACKTEST_MIN_PRODUCTS:
+        return None
+    error = np.abs(np.log1p(np.maximum(predicted, 0)) - np.log1p(actual)[:, None])
+    score = 1.0 / np.maximum(np.median(error, axis=0), 0.01)
+    return score / score.sum()
+
+
+def method_agreement(stacked):
+    """
+    Confidence per product from how closely the component methods agree:
+    1 minus their mean coefficient of variation over the horizon, clipped to 0-1.
+    `stacked` is (products, methods, years).
+    """
+    spread = stacked.std(axis=1) / np.maximum(stacked.mean(axis=1), 1)
+    return np.clip(1.0 - spread.mean(axis=1), 0.0, 1.0).round(2)
+
+
+def run_methods(frame, methods, years, seed=None, **options):
+    """Evaluate each method on the same frame; returns {name: result}"""
+    rng = np.random.default_rng(seed)
+    return {name: FORECAST_METHODS[name](frame, years, rng, **options) for name in methods}
+
+
+def run_ensemble(frame, years, seed=None, weights=None, **options):
+    """
+    Evaluate every registered method once and combine them with `weights` (a
+    (methods,) array in FORECAST_METHODS order), or ensemble_weights() when None.
+    Returns (results, weights) where results includes the "ensemble" entry.
+    """
+    results = run_methods(frame, list(FORECAST_METHODS), years, seed=seed, **options)
+    if weights is None:
+        weights = ensemble_weights(list(results))
+
+    stacked = np.stack([result["demand"] for result in results.values()], axis=1)  # (products, methods, years)
+    results[ENSEMBLE] = {
+        "demand": np.tensordot(stacked, weights, axes=([1], [0])),
+        "confidence": method_agreement(stacked),
+    }
+    return results, weights
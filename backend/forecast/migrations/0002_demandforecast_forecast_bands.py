@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forecast", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="demandforecast",
+            name="forecast_bands",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
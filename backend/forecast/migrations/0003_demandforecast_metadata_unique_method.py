@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forecast", "0002_demandforecast_forecast_bands"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="demandforecast",
+            name="metadata",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddConstraint(
+            model_name="demandforecast",
+            constraint=models.UniqueConstraint(
+                fields=("product", "forecast_method"),
+                name="uniq_forecast_product_method",
+            ),
+        ),
+    ]
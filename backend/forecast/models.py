@@ -25,6 +25,13 @@ class DemandForecast(models.Model):
     # Demand vs Price data for linear plot
     # Format: [{"price": 10.0, "demand": 80}, {"price": 15.0, "demand": 60}, ...]
     demand_price_curve = models.JSONField(default=list)
+
+    # Monte Carlo percentile bands (empty for point-estimate methods)
+    # Format: [{"year": 2020, "p10": 80, "p50": 100, "p90": 125}, ...]
+    forecast_bands = models.JSONField(default=list, blank=True)
+
+    # Method-specific details, e.g. ensemble weights per component
+    metadata = models.JSONField(default=dict, blank=True)
     
     # Summary statistics
     total_forecasted_demand = models.PositiveIntegerField(default=0)
@@ -40,6 +47,9 @@ class DemandForecast(models.Model):
             models.Index(fields=["created_by"]),
             models.Index(fields=["forecast_method"]),
         ]
+        constraints = [
+            models.UniqueConstraint(fields=["product", "forecast_method"], name="uniq_forecast_product_method"),
+        ]
         
     def __str__(self):
         return f"Forecast for {self.product.name} ({self.forecast_method})"
\ No newline at end of file
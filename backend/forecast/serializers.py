@@ -1,9 +1,11 @@
 # backend/forecast/serializers.py
 from rest_framework import serializers
+
+from commons.serializers import SparseFieldsMixin
 from products.models import Product
 from .models import DemandForecast
 
-class DemandForecastSerializer(serializers.ModelSerializer):
+class DemandForecastSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source="product.name", read_only=True)
     product_category = serializers.CharField(source="product.category", read_only=True)
     created_by_username = serializers.CharField(source="created_by.username", read_only=True)
@@ -13,7 +15,7 @@ class DemandForecastSerializer(serializers.ModelSerializer):
         fields = [
             "id", "product", "product_name", "product_category",
             "forecast_method", "version", "start_year", "end_year",
-            "forecast_data", "demand_price_curve", 
+            "forecast_data", "demand_price_curve", "forecast_bands", "metadata",
             "total_forecasted_demand", "confidence_score",
             "created_by", "created_by_username", "created_at", "updated_at"
         ]
@@ -30,11 +32,17 @@ class ForecastRequestSerializer(serializers.Serializer):
         choices=[
             ("historical_simulation", "Historical Simulation"),
             ("price_elasticity", "Price Elasticity Model"),
-            ("trend_analysis", "Trend Analysis")
+            ("trend_analysis", "Trend Analysis"),
+            ("monte_carlo", "Monte Carlo Simulation"),
+            ("ensemble", "Ensemble (all methods, fixed weights)")
         ],
         default="historical_simulation"
     )
     years = serializers.IntegerField(default=5, min_value=1, max_value=10)
+    paths = serializers.IntegerField(
+        default=2000, min_value=100, max_value=20000,
+        help_text="Number of simulated demand paths per product (monte_carlo only)"
+    )
 
 class ForecastSummarySerializer(serializers.Serializer):
     """Serializer for forecast overview/summary"""
@@ -0,0 +1,210 @@
+# backend/forecast/services.py
+import copy
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from commons.utils import minmax_downsample
+from products.models import ProductPriceHistory
+from .models import DemandForecast
+from . import methods as forecast_methods
+
+DEFAULT_CONFIDENCE = 0.85
+
+# Columns rewritten when a (product, forecast_method) row already exists
+UPSERT_FIELDS = [
+    "created_by", "version", "start_year", "end_year",
+    "forecast_data", "demand_price_curve", "forecast_bands", "metadata",
+    "total_forecasted_demand", "confidence_score", "updated_at",
+]
+
+CHART_CACHE_TIMEOUT = 60 * 60
+
+# Shortest held-out window (since a product's last units_sold snapshot) worth annualizing
+BACKTEST_MIN_DAYS = 30
+
+
+def _downsample_rows(rows, max_points, key="demand"):
+    keep = minmax_downsample([row.get(key, 0) for row in rows], max_points)
+    return [rows[i] for i in keep]
+
+
+class DemandForecastService:
+    """Service class for demand forecasting algorithms"""
+    
+    @staticmethod
+    def generate_demand_price_curve(product):
+        """Generate demand vs price curve for linear plot"""
+        base_price = float(product.current_price)
+        base_demand = product.demand_forecast or (product.units_sold * 0.018) or 100
+        
+        # Price elasticity based on category
+        elasticity_map = {
+            "electronics": -1.5,  # Elastic
+            "other": -1.0,        # Unit elastic
+        }
+        elasticity = elasticity_map.get(product.category, -1.2)
+        
+        # Generate price points (±50% of current price)
+        price_points = []
+        for i in range(11):  # 11 points for smooth curve
+            price_multiplier = 0.5 + (i * 0.1)  # 0.5 to 1.5
+            price = base_price * price_multiplier
+            
+            # Demand = base_demand * (price_ratio ^ elasticity)
+            price_ratio = price / base_price
+            demand = base_demand * (price_ratio ** elasticity)
+            
+            price_points.append({
+                "price": round(price, 2),
+                "demand": max(0, int(demand))
+            })
+        
+        return price_points
+
+
+    @staticmethod
+    def backtest_sample(products, now=None):
+        """
+        Cutoff copies of `products` and their annualized sales since the cutoff.
+        The cutoff is each product's last ProductPriceHistory units_sold snapshot
+        at least BACKTEST_MIN_DAYS old; the copies carry the units_sold and price
+        recorded there. Products without such a snapshot, or whose units_sold went
+        down since (a re-import), are left out.
+        """
+        now = now or timezone.now()
+        by_id = {p.pk: p for p in products}
+        last = {}
+        snapshots = (
+            ProductPriceHistory.objects
+            .filter(product_id__in=list(by_id), units_sold__isnull=False,
+                    changed_at__lte=now - timedelta(days=BACKTEST_MIN_DAYS))
+            .order_by("product_id", "changed_at")
+            .values_list("product_id", "new_price", "units_sold", "changed_at")
+        )
+        for product_id, price, units_sold, changed_at in snapshots:
+            last[product_id] = (price, units_sold, changed_at)
+
+        cutoff, actual = [], []
+        for product_id, (price, units_sold, changed_at) in last.items():
+            product = by_id[product_id]
+            if product.units_sold < units_sold:
+                continue
+            years_held_out = (now - changed_at).total_seconds() / (365 * 86400)
+            past = copy.copy(product)
+            past.units_sold, past.current_price = units_sold, price
+            cutoff.append(past)
+            actual.append((product.units_sold - units_sold) / years_held_out)
+        return cutoff, np.array(actual, dtype=np.float64)
+
+    @staticmethod
+    def fit_ensemble_weights(products, years, seed=None, paths=2000):
+        """
+        (weights, backtested products) for the ensemble. Every method forecasts
+        from the backtest_sample() cutoffs; its final-year demand is scored against
+        the sales that followed. Weights are None (use the fixed ENSEMBLE_WEIGHTS)
+        when too few products have held-out sales.
+        """
+        cutoff, actual = DemandForecastService.backtest_sample(products)
+        if len(cutoff) < forecast_methods.BACKTEST_MIN_PRODUCTS:
+            return None, len(cutoff)
+        frame = forecast_methods.ProductFrame(cutoff)
+        results = forecast_methods.run_methods(
+            frame, list(forecast_methods.FORECAST_METHODS), years, seed=seed, paths=paths,
+        )
+        predicted = np.stack([result["demand"][:, -1] for result in results.values()], axis=1)
+        return forecast_methods.backtest_weights(predicted, actual), len(cutoff)
+
+    @staticmethod
+    def build_forecasts(products, method, years=5, user=None, paths=2000, seed=None):
+        """
+        Build unsaved DemandForecast rows for a batch of products.
+        Products are loaded into arrays once; method="ensemble" evaluates every
+        registered method on them and returns the ensemble plus one row per component,
+        weighted by fit_ensemble_weights().
+        """
+        frame = forecast_methods.ProductFrame(products)
+        if not len(frame):
+            return []
+
+        weights = None
+        if method == forecast_methods.ENSEMBLE:
+            fitted, backtested = DemandForecastService.fit_ensemble_weights(
+                frame.products, years, seed=seed, paths=paths,
+            )
+            results, weights = forecast_methods.run_ensemble(
+                frame, years, seed=seed, weights=fitted, paths=paths,
+            )
+        else:
+            results = forecast_methods.run_methods(frame, [method], years, seed=seed, paths=paths)
+        components = [name for name in results if name != forecast_methods.ENSEMBLE]
+
+        start_year = 2025 - years
+        forecasts = []
+        for idx, product in enumerate(frame.products):
+            demand_price_curve = DemandForecastService.generate_demand_price_curve(product)
+            for name, result in results.items():
+                forecast_data = [
+                    {"year": start_year + t, "demand": max(0, int(d))}
+                    for t, d in enumerate(result["demand"][idx])
+                ]
+                bands = result.get("bands")
+                confidence = result.get("confidence")
+                metadata = {}
+                if name == forecast_methods.ENSEMBLE:
+                    metadata = {
+                        "weights": {c: round(float(weights[m]), 4) for m, c in enumerate(components)},
+                        "weights_source": "fixed" if fitted is None else "backtest",
+                        "backtest_products": backtested,
+                    }
+                forecasts.append(DemandForecast(
+                    product=product,
+                    created_by=user,
+                    forecast_method=name,
+                    version=1,
+                    start_year=start_year,
+                    end_year=2024,
+                    forecast_data=forecast_data,
+                    demand_price_curve=demand_price_curve,
+                    forecast_bands=[] if bands is None else forecast_methods.simulation.bands_to_rows(bands[idx], start_year),
+                    metadata=metadata,
+                    total_forecasted_demand=sum(item["demand"] for item in forecast_data),
+                    confidence_score=DEFAULT_CONFIDENCE if confidence is None else float(confidence[idx]),
+                ))
+        return forecasts
+
+    @staticmethod
+    def save_forecasts(forecasts, batch_size=1000):
+        """Upsert forecasts on (product, forecast_method) in one bulk write"""
+        return DemandForecast.objects.bulk_create(
+            forecasts,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["product", "forecast_method"],
+            update_fields=UPSERT_FIELDS,
+        )
+
+    @staticmethod
+    def chart_series(forecast, max_points=None):
+        """
+        (forecast_data, demand_price_curve) downsampled to at most max_points each.
+        Results are cached per forecast version; any rewrite bumps updated_at and
+        therefore the cache key.
+        """
+        if not max_points:
+            return forecast.forecast_data, forecast.demand_price_curve
+
+        key = (
+            f"forecast:chart:{forecast.pk}:{forecast.version}:"
+            f"{forecast.updated_at.timestamp()}:{max_points}"
+        )
+        series = cache.get(key)
+        if series is None:
+            series = (
+                _downsample_rows(forecast.forecast_data, max_points),
+                _downsample_rows(forecast.demand_price_curve, max_points),
+            )
+            cache.set(key, series, CHART_CACHE_TIMEOUT)
+        return series
@@ -0,0 +1,102 @@
+# backend/forecast/simulation.py
+import numpy as np
+
+# Log-space volatility of year-over-year demand shocks per category
+CATEGORY_VOLATILITY = {
+    "electronics": 0.12,
+    "other": 0.08,
+}
+DEFAULT_VOLATILITY = 0.10
+
+PERCENTILES = (10, 50, 90)
+
+# Upper bound on floats drawn per chunk (products x years x paths), ~64 MB as float32
+MAX_CHUNK_CELLS = 16_000_000
+
+
+def base_demand(product):
+    """Starting demand level: CSV demand_forecast, else a share of units_sold"""
+    return product.demand_forecast or (product.units_sold * 0.018) or 100
+
+
+def growth_curves(categories, years, noise=None):
+    """
+    Growth x seasonality per product, shape (products, years).
+    Optional `noise` (products, years) is added to the growth of default
+    categories, which are the only ones with year-to-year volatility.
+    """
+    i = np.arange(years, dtype=np.float64)
+    categories = np.asarray(categories)
+
+    growth = np.empty((len(categories), years), dtype=np.float64)
+    growth[:] = 1.0 + i * 0.03                                      # default: slight growth
+    if noise is not None:
+        growth += noise
+    growth[categories == "electronics"] = 1.0 + 0.15 * np.exp(-i * 0.3)  # rapid early growth, then plateau
+    growth[categories == "other"] = 1.0 + i * 0.05                 # steady moderate growth
+
+    seasonal = 1 + 0.1 * np.sin((i * 2 * np.pi) / 4)
+    return growth * seasonal
+
+
+def simulate_bands(base, categories, years, paths=2000, seed=None, chunk_size=None):
+    """
+    Monte Carlo demand bands for many products at once.
+
+    Each chunk draws a (products, years, paths) block of normal shocks in one
+    call, accumulates them as a log random walk on top of the deterministic
+    growth curve and reduces it to percentiles along the path axis, so memory
+    is bounded by the chunk and not the catalog.
+
+    Returns an int array of shape (products, len(PERCENTILES), years).
+    """
+    base = np.asarray(base, dtype=np.float64)
+    categories = np.asarray(categories)
+    rng = np.random.default_rng(seed)
+
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_CELLS // (paths * years))
+
+    sigma = np.array(
+        [CATEGORY_VOLATILITY.get(c, DEFAULT_VOLATILITY) for c in categories],
+        dtype=np.float32,
+    )
+    trend = growth_curves(categories, years) * base[:, None]
+
+    bands = np.empty((len(base), len(PERCENTILES), years), dtype=np.int64)
+    for start in range(0, len(base), chunk_size):
+        stop = min(start + chunk_size, len(base))
+        # Paths on the last axis keep the percentile reduction contiguous
+        shocks = rng.standard_normal((stop - start, years, paths), dtype=np.float32)
+        shocks *= sigma[start:stop, None, None]
+        np.cumsum(shocks, axis=1, out=shocks)
+        np.exp(shocks, out=shocks)
+        shocks *= trend[start:stop, :, None].astype(np.float32)
+
+        q = np.percentile(shocks, PERCENTILES, axis=2)  # (percentiles, chunk, years)
+        bands[start:stop] = np.maximum(0, q.transpose(1, 0, 2)).astype(np.int64)
+
+    return bands
+
+
+def band_confidence(bands):
+    """
+    Confidence score per product from the relative width of the p10-p90 band,
+    averaged over the horizon and clipped to the 0-1 scale used by DemandForecast.
+    """
+    p10, p50, p90 = bands[:, 0, :], bands[:, 1, :], bands[:, 2, :]
+    spread = (p90 - p10) / np.maximum(p50, 1)
+    return np.clip(1.0 - spread.mean(axis=1) / 2, 0.0, 1.0).round(2)
+
+
+def bands_to_rows(bands, start_year):
+    """Convert one product's (percentiles, years) band into JSON rows"""
+    return [
+        {
+            "year": start_year + t,
+            "p10": int(bands[0, t]),
+            "p50": int(bands[1, t]),
+            "p90": int(bands[2, t]),
+        }
+        for t in range(bands.shape[1])
+    ]
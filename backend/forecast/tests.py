@@ -1,3 +1,70 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from products.models import Product, ProductPriceHistory
+
+from . import methods
+from .services import DemandForecastService
+
+
+class BacktestWeightsTests(SimpleTestCase):
+    def test_closest_method_gets_the_most_weight(self):
+        actual = np.linspace(100, 500, 30)
+        predicted = np.stack([actual * 3, actual * 1.05, actual / 2], axis=1)
+        weights = methods.backtest_weights(predicted, actual)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertEqual(int(weights.argmax()), 1)
+
+    def test_too_few_products(self):
+        actual = np.ones(methods.BACKTEST_MIN_PRODUCTS - 1)
+        self.assertIsNone(methods.backtest_weights(np.ones((len(actual), 2)), actual))
+
+
+class EnsembleWeightsTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("supplier1", password="x")
+        self.products = [
+            Product.objects.create(
+                owner=self.owner, name=f"Product {i}", sku=f"P-{i}", category="other",
+                base_price=Decimal("10.00"), current_price=Decimal("15.00"),
+                stock_qty=50, units_sold=1000 + 50 * i, demand_forecast=200,
+            )
+            for i in range(methods.BACKTEST_MIN_PRODUCTS)
+        ]
+
+    def ensemble_metadata(self):
+        forecasts = DemandForecastService.build_forecasts(self.products, methods.ENSEMBLE, years=3, paths=50, seed=1)
+        return next(f.metadata for f in forecasts if f.forecast_method == methods.ENSEMBLE)
+
+    def test_fixed_weights_without_history(self):
+        metadata = self.ensemble_metadata()
+        self.assertEqual(metadata["weights_source"], "fixed")
+        self.assertEqual(metadata["backtest_products"], 0)
+        self.assertEqual(metadata["weights"]["monte_carlo"], methods.ENSEMBLE_WEIGHTS["monte_carlo"])
+
+    def test_weights_fitted_from_sales_history(self):
+        for product in self.products:
+            ProductPriceHistory.objects.create(
+                product=product, old_price=Decimal("14.00"), new_price=Decimal("15.00"), units_sold=950,
+            )
+        # Half a year ago: the held-out sales since are annualized
+        ProductPriceHistory.objects.update(changed_at=timezone.now() - timedelta(days=182))
+
+        metadata = self.ensemble_metadata()
+        self.assertEqual(metadata["weights_source"], "backtest")
+        self.assertEqual(metadata["backtest_products"], len(self.products))
+        self.assertEqual(set(metadata["weights"]), set(methods.FORECAST_METHODS))
+        self.assertAlmostEqual(sum(metadata["weights"].values()), 1.0, places=3)
+
+    def test_snapshots_inside_the_holdout_window_are_ignored(self):
+        for product in self.products:
+            ProductPriceHistory.objects.create(
+                product=product, old_price=Decimal("14.00"), new_price=Decimal("15.00"), units_sold=950,
+            )
+        cutoff, actual = DemandForecastService.backtest_sample(self.products)
+        self.assertEqual((cutoff, len(actual)), ([], 0))
@@ -1,96 +1,34 @@
 # backend/forecast/views.py
-import math
-import random
 from django.db.models import Avg, Sum, Count
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from commons.permissions import IsAdminOrSupplierOwner
+from commons.pagination import CreatedAtKeysetPagination
+from commons.permissions import IsAdminOrSupplierOwner, get_role
+from commons.views import ConditionalGetMixin, SparseFieldsViewMixin
 from products.models import Product
 from .models import DemandForecast
+from .services import DemandForecastService
 from .serializers import (
     DemandForecastSerializer, 
     ForecastRequestSerializer, 
     ForecastSummarySerializer
 )
 
-class DemandForecastService:
-    """Service class for demand forecasting algorithms"""
-    
-    @staticmethod
-    def generate_historical_simulation(product, years=5):
-        """Generate historical demand simulation based on product data"""
-        base_demand = product.demand_forecast or (product.units_sold * 0.018) or 100
-        start_year = 2025 - years
-        
-        # Create realistic historical trends
-        forecast_data = []
-        for i, year in enumerate(range(start_year, 2025)):
-            # Different growth patterns based on product category
-            if product.category == "electronics":
-                # Tech products: rapid early growth, then plateau
-                growth_factor = 1.0 + (0.15 * math.exp(-i * 0.3))
-            elif product.category == "other":
-                # Other products: steady moderate growth
-                growth_factor = 1.0 + (i * 0.05)
-            else:
-                # Default: slight growth with some volatility
-                growth_factor = 1.0 + (i * 0.03) + (random.uniform(-0.1, 0.1))
-            
-            # Add some seasonality
-            seasonal_factor = 1 + 0.1 * math.sin((i * 2 * math.pi) / 4)
-            
-            year_demand = int(base_demand * growth_factor * seasonal_factor)
-            forecast_data.append({
-                "year": year,
-                "demand": max(0, year_demand)
-            })
-        
-        return forecast_data
-    
-    @staticmethod
-    def generate_demand_price_curve(product):
-        """Generate demand vs price curve for linear plot"""
-        base_price = float(product.current_price)
-        base_demand = product.demand_forecast or (product.units_sold * 0.018) or 100
-        
-        # Price elasticity based on category
-        elasticity_map = {
-            "electronics": -1.5,  # Elastic
-            "other": -1.0,        # Unit elastic
-        }
-        elasticity = elasticity_map.get(product.category, -1.2)
-        
-        # Generate price points (±50% of current price)
-        price_points = []
-        for i in range(11):  # 11 points for smooth curve
-            price_multiplier = 0.5 + (i * 0.1)  # 0.5 to 1.5
-            price = base_price * price_multiplier
-            
-            # Demand = base_demand * (price_ratio ^ elasticity)
-            price_ratio = price / base_price
-            demand = base_demand * (price_ratio ** elasticity)
-            
-            price_points.append({
-                "price": round(price, 2),
-                "demand": max(0, int(demand))
-            })
-        
-        return price_points
-
-class DemandForecastViewSet(viewsets.ModelViewSet):
-    """API endpoints for demand forecasting"""
-    queryset = DemandForecast.objects.all()
+class DemandForecastViewSet(ConditionalGetMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
+    """API endpoints for demand forecasting; reads accept ?fields= / ?omit="""
+    queryset = DemandForecast.objects.select_related('product', 'created_by')
     serializer_class = DemandForecastSerializer
     permission_classes = [IsAdminOrSupplierOwner]
+    pagination_class = CreatedAtKeysetPagination
 
     def get_queryset(self):
         qs = super().get_queryset()
         user = self.request.user
         
         # Filter by user role
-        if hasattr(user, 'profile') and user.profile.role == 'admin':
+        if get_role(user) == 'admin':
             return qs
         else:
             # Suppliers see only forecasts for their products
@@ -102,6 +40,8 @@ class DemandForecastViewSet(viewsets.ModelViewSet):
         POST /api/forecast/generate/
         Generate demand forecasts for specified products
         Body: {"product_ids": [1, 2, 3], "method": "historical_simulation", "years": 5}
+        method="monte_carlo" also accepts "paths" and stores p10/p50/p90 bands.
+        method="ensemble" stores the weighted combination plus every component method.
         """
         serializer = ForecastRequestSerializer(data=request.data)
         if not serializer.is_valid():
@@ -110,54 +50,32 @@ class DemandForecastViewSet(viewsets.ModelViewSet):
         product_ids = serializer.validated_data['product_ids']
         method = serializer.validated_data['method']
         years = serializer.validated_data['years']
+        paths = serializer.validated_data['paths']
         
         # Filter products by user permissions
         user = request.user
-        if hasattr(user, 'profile') and user.profile.role == 'admin':
+        if get_role(user) == 'admin':
             products = Product.objects.filter(id__in=product_ids, is_active=True)
         else:
             products = Product.objects.filter(id__in=product_ids, owner=user, is_active=True)
+        products = list(products)
         
-        if not products.exists():
+        if not products:
             return Response(
                 {"detail": "No accessible products found with the provided IDs"}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        generated_forecasts = []
-        service = DemandForecastService()
-        
-        for product in products:
-            # Generate forecast data
-            if method == "historical_simulation":
-                forecast_data = service.generate_historical_simulation(product, years)
-            else:
-                # Fallback to historical simulation for now
-                forecast_data = service.generate_historical_simulation(product, years)
-            
-            # Generate demand vs price curve
-            demand_price_curve = service.generate_demand_price_curve(product)
-            
-            # Calculate summary statistics
-            total_demand = sum(item['demand'] for item in forecast_data)
-            
-            # Create or update forecast record
-            forecast, created = DemandForecast.objects.update_or_create(
-                product=product,
-                forecast_method=method,
-                defaults={
-                    'created_by': user,
-                    'version': 1,
-                    'start_year': 2025 - years,
-                    'end_year': 2024,
-                    'forecast_data': forecast_data,
-                    'demand_price_curve': demand_price_curve,
-                    'total_forecasted_demand': total_demand,
-                    'confidence_score': 0.85,  # Default confidence
-                }
-            )
-            
-            generated_forecasts.append(DemandForecastSerializer(forecast).data)
+        # One read of the products, one bulk write for every method's rows
+        forecasts = DemandForecastService.build_forecasts(products, method, years, user=user, paths=paths)
+        DemandForecastService.save_forecasts(forecasts)
+
+        saved = (
+            DemandForecast.objects
+            .filter(product_id__in=[p.id for p in products], forecast_method=method)
+            .select_related('product', 'created_by')
+        )
+        generated_forecasts = DemandForecastSerializer(saved, many=True).data
         
         return Response({
             'message': f'Generated forecasts for {len(generated_forecasts)} products',
@@ -173,10 +91,18 @@ class DemandForecastViewSet(viewsets.ModelViewSet):
         user = request.user
         
         # Filter forecasts by user permissions
-        if hasattr(user, 'profile') and user.profile.role == 'admin':
+        if get_role(user) == 'admin':
             forecasts = DemandForecast.objects.all()
         else:
             forecasts = DemandForecast.objects.filter(product__owner=user)
+
+        # Summary reads product categories too, so product edits count as changes
+        not_modified = self.check_not_modified(
+            forecasts, timestamp_fields=('updated_at', 'product__updated_at'),
+            related_fields=('created_by__username',),
+        )
+        if not_modified:
+            return not_modified
         
         if not forecasts.exists():
             return Response({
@@ -189,8 +115,9 @@ class DemandForecastViewSet(viewsets.ModelViewSet):
         
         # Calculate summary statistics
         total_products = forecasts.values('product').distinct().count()
-        total_demand = forecasts.aggregate(Sum('total_forecasted_demand'))['total_forecasted_demand'] or 0
-        avg_confidence = forecasts.aggregate(Avg('confidence_score'))['confidence_score'] or 0
+        totals = forecasts.aggregate(demand=Sum('total_forecasted_demand'), confidence=Avg('confidence_score'))
+        total_demand = totals['demand'] or 0
+        avg_confidence = totals['confidence'] or 0
         
         # Group by category
         category_data = {}
@@ -223,12 +150,25 @@ class DemandForecastViewSet(viewsets.ModelViewSet):
         """
         GET /api/forecast/chart-data/
         Get formatted data for frontend charts
+        Optional ?max_points=N downsamples every series server-side (min/max buckets)
         """
         user = request.user
         product_ids = request.query_params.get('product_ids', '').split(',')
+
+        max_points = request.query_params.get('max_points')
+        if max_points:
+            try:
+                max_points = int(max_points)
+            except ValueError:
+                max_points = 0
+            if max_points < 4:
+                return Response(
+                    {"detail": "max_points must be an integer >= 4"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
         # Filter forecasts
-        if hasattr(user, 'profile') and user.profile.role == 'admin':
+        if get_role(user) == 'admin':
             forecasts_qs = DemandForecast.objects.all()
         else:
             forecasts_qs = DemandForecast.objects.filter(product__owner=user)
@@ -243,6 +183,10 @@ class DemandForecastViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
+        not_modified = self.check_not_modified(forecasts_qs, timestamp_fields=('updated_at', 'product__updated_at'))
+        if not_modified:
+            return not_modified
+
         # Get latest forecasts for each product
         forecasts = forecasts_qs.select_related('product').order_by('product_id', '-created_at').distinct('product_id')[:4]
         
@@ -252,26 +196,28 @@ class DemandForecastViewSet(viewsets.ModelViewSet):
                 'demand_price_curves': []
             })
         
+        series = {
+            forecast.pk: DemandForecastService.chart_series(forecast, max_points)
+            for forecast in forecasts
+        }
+
         # Format historical data for line chart
-        years = set()
-        for forecast in forecasts:
-            for item in forecast.forecast_data:
-                years.add(item['year'])
-        
-        years = sorted(years)
+        demand_by_year = {
+            forecast.pk: {item['year']: item['demand'] for item in series[forecast.pk][0]}
+            for forecast in forecasts
+        }
+        years = sorted({year for lookup in demand_by_year.values() for year in lookup})
         historical_data = []
         
         for year in years:
             year_data = {'year': year}
             for forecast in forecasts:
-                product_name = forecast.product.name
-                # Find demand for this year
-                year_demand = 0
-                for item in forecast.forecast_data:
-                    if item['year'] == year:
-                        year_demand = item['demand']
-                        break
-                year_data[product_name] = year_demand
+                lookup = demand_by_year[forecast.pk]
+                if year in lookup:
+                    year_data[forecast.product.name] = lookup[year]
+                elif not max_points:
+                    year_data[forecast.product.name] = 0
+                # Downsampled series leave a gap instead of a false zero
             historical_data.append(year_data)
         
         # Format demand vs price curves
@@ -280,7 +226,7 @@ class DemandForecastViewSet(viewsets.ModelViewSet):
             demand_price_curves.append({
                 'product_id': forecast.product.id,
                 'product_name': forecast.product.name,
-                'curve_data': forecast.demand_price_curve
+                'curve_data': series[forecast.pk][1]
             })
         
         return Response({
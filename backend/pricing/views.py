@@ -4,7 +4,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Q, Avg
 from products.models import Product
-from commons.permissions import IsAdminOrSupplierOwner
+from commons.permissions import IsAdminOrSupplierOwner, get_role
 import math
 
 class PriceOptimizationViewSet(viewsets.ViewSet):
@@ -120,7 +120,7 @@ class PriceOptimizationViewSet(viewsets.ViewSet):
         Returns optimized prices for all user's products
         """
         user = request.user
-        if hasattr(user, 'profile') and user.profile.role == 'admin':
+        if get_role(user) == 'admin':
             products = Product.objects.filter(is_active=True).select_related('owner')
         else:
             products = Product.objects.filter(owner=user, is_active=True)
@@ -184,7 +184,7 @@ class PriceOptimizationViewSet(viewsets.ViewSet):
             return Response({'error': 'No product IDs provided'}, status=400)
 
         user = request.user
-        if hasattr(user, 'profile') and user.profile.role == 'admin':
+        if get_role(user) == 'admin':
             products = Product.objects.filter(id__in=product_ids, is_active=True)
         else:
             products = Product.objects.filter(id__in=product_ids, owner=user, is_active=True)
@@ -207,7 +207,8 @@ class PriceOptimizationViewSet(viewsets.ViewSet):
                     old_price=old_price,
                     new_price=new_price,
                     changed_by=user,
-                    reason=reason
+                    reason=reason,
+                    units_sold=product.units_sold,
                 )
                 
                 updated_products.append({
@@ -231,7 +232,7 @@ class PriceOptimizationViewSet(viewsets.ViewSet):
         Returns market analysis for pricing strategy
         """
         user = request.user
-        if hasattr(user, 'profile') and user.profile.role == 'admin':
+        if get_role(user) == 'admin':
             products = Product.objects.filter(is_active=True)
         else:
             products = Product.objects.filter(owner=user, is_active=True)
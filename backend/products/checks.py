@@ -0,0 +1,66 @@
+# backend/products/checks.py
+"""
+System check for the triggers the products migrations install with raw SQL.
+
+Search (0006), the change log (0008) and price rollups (0010) are kept up to
+date by database triggers. On SQLite, a later migration that rebuilds
+products_product or products_productpricehistory drops them without an error,
+and those features go stale. The check runs with the database checks
+(`manage.py check --database default`, `migrate` and the test runner).
+"""
+from django.core import checks
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+
+# migration -> vendor -> triggers it creates (see the migration on how to recreate them)
+EXPECTED_TRIGGERS = {
+    ("products", "0006_product_search_index"): {
+        "sqlite": ("products_product_fts_ai", "products_product_fts_ad", "products_product_fts_au"),
+    },
+    ("products", "0008_product_change_log"): {
+        "sqlite": ("products_productchange_ai", "products_productchange_au", "products_productchange_ad"),
+        "postgresql": ("products_productchange_log",),
+    },
+    ("products", "0010_price_rollups"): {
+        "sqlite": ("products_pricerollup_ai",),
+        "postgresql": ("products_pricerollup_log",),
+    },
+}
+
+TRIGGER_NAMES_SQL = {
+    "sqlite": "SELECT name FROM sqlite_master WHERE type = 'trigger'",
+    "postgresql": "SELECT tgname FROM pg_trigger WHERE NOT tgisinternal",
+}
+
+
+@checks.register(checks.Tags.database)
+def check_product_triggers(app_configs=None, databases=None, **kwargs):
+    errors = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor not in TRIGGER_NAMES_SQL:
+            continue
+        executor = MigrationExecutor(connection)
+        if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+            # Unapplied migrations (maybe one restoring the triggers): nothing to compare yet
+            continue
+        applied = executor.loader.applied_migrations
+        with connection.cursor() as cursor:
+            cursor.execute(TRIGGER_NAMES_SQL[connection.vendor])
+            present = {row[0] for row in cursor.fetchall()}
+
+        for migration, by_vendor in EXPECTED_TRIGGERS.items():
+            if migration not in applied:
+                continue
+            missing = [name for name in by_vendor.get(connection.vendor, ()) if name not in present]
+            if missing:
+                errors.append(checks.Error(
+                    f"Database '{alias}' is missing triggers created by {migration[0]}.{migration[1]}: "
+                    f"{', '.join(missing)}.",
+                    hint=(
+                        "A later migration probably rebuilt the table and dropped them. Recreate them "
+                        f"as described at the top of {migration[0]}/migrations/{migration[1]}.py."
+                    ),
+                    id="products.E001",
+                ))
+    return errors
@@ -0,0 +1,257 @@
+# backend/products/columnar.py
+"""
+Parquet / Arrow IPC import and export of the product catalog (import_products,
+export_products, Parquet/Arrow uploads). Requires pyarrow (requirements.txt);
+callers import this module lazily and report a missing pyarrow themselves.
+
+Imports follow products.feed.parse_row() exactly, but convert whole columns
+with pyarrow.compute; the only per-row step left is building the field dicts
+handed to ProductFeedWriter.
+"""
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+from .feed import CATEGORY_MAP
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+# Amounts are parsed exactly, then rounded to Product's DecimalField scale
+AMOUNT_TYPE = pa.decimal128(38, 18)
+PRICE_TYPE = pa.decimal128(38, 2)
+
+# Plain decimal notation, as accepted by Decimal() in the CSV path
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+# Larger amounts don't fit AMOUNT_TYPE (nor Product's max_digits)
+AMOUNT_LIMIT = 1e18
+
+# (column, Product field or lookup, Arrow type). Column names follow the CSV feed,
+# plus `sku`, which import_products reads back in place of product_id.
+EXPORT_COLUMNS = [
+    ("sku", "sku", pa.string()),
+    ("name", "name", pa.string()),
+    ("description", "description", pa.string()),
+    ("category", "category", pa.string()),
+    ("cost_price", "base_price", pa.decimal128(10, 2)),
+    ("selling_price", "current_price", pa.decimal128(10, 2)),
+    ("optimized_price", "optimized_price", pa.decimal128(10, 2)),
+    ("min_price", "min_price", pa.decimal128(10, 2)),
+    ("max_price", "max_price", pa.decimal128(10, 2)),
+    ("stock_available", "stock_qty", pa.int64()),
+    ("units_sold", "units_sold", pa.int64()),
+    ("customer_rating", "customer_rating", pa.int64()),
+    ("demand_forecast", "demand_forecast", pa.int64()),
+    ("elasticity", "elasticity", pa.float64()),
+    ("is_active", "is_active", pa.bool_()),
+    ("owner", "owner__username", pa.string()),
+    ("created_at", "created_at", pa.timestamp("us", tz="UTC")),
+    ("updated_at", "updated_at", pa.timestamp("us", tz="UTC")),
+]
+EXPORT_SCHEMA = pa.schema([(name, type_) for name, _, type_ in EXPORT_COLUMNS])
+
+
+def file_format(path):
+    """"parquet" or "arrow" from the file suffix, else None"""
+    suffix = path.suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in ARROW_SUFFIXES:
+        return "arrow"
+    return None
+
+
+def count_rows(path):
+    """Row count from file metadata (no data is decoded); None for Arrow streams"""
+    if file_format(path) == "parquet":
+        return pq.ParquetFile(path).metadata.num_rows
+    with pa.memory_map(str(path)) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            return None
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+
+def read_batches(path, batch_size):
+    """Yield record batches of at most `batch_size` rows without loading the whole file"""
+    if file_format(path) == "parquet":
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+        return
+    with pa.memory_map(str(path)) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            batches = pa.ipc.open_stream(source)
+        for batch in batches:
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def _text(column):
+    """Trimmed strings; nulls stay null"""
+    if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+        column = pc.cast(column, pa.string())
+    return pc.utf8_trim_whitespace(column)
+
+
+def _number(column):
+    """float64 column, null where a value isn't a number (to_decimal/to_int's fallback)"""
+    numeric = column.type
+    if not (pa.types.is_integer(numeric) or pa.types.is_floating(numeric) or pa.types.is_decimal(numeric)):
+        text = _text(column)
+        column = pc.if_else(pc.match_substring_regex(text, NUMBER_PATTERN), text, pa.scalar(None, pa.string()))
+    column = pc.cast(column, pa.float64(), safe=False)
+    return pc.if_else(pc.is_finite(column), column, pa.scalar(None, pa.float64()))
+
+
+def _amount(column, name):
+    """
+    to_decimal() for a column: exact decimals (18 places), 0 when missing or
+    invalid. Floats go through their shortest repr, so 2.675 behaves like the
+    CSV cell "2.675" would, not like its binary value.
+    """
+    if pa.types.is_decimal(column.type):
+        value = pc.cast(column, pa.float64())
+    else:
+        value = _number(column)
+        column = pc.if_else(pc.is_valid(value), _text(column), pa.scalar(None, pa.string()))
+    if pc.any(pc.greater_equal(pc.abs(value), AMOUNT_LIMIT)).as_py():
+        raise ValueError(f"{name}: amount out of range")
+    return pc.fill_null(pc.cast(column, AMOUNT_TYPE, safe=False), pa.scalar(Decimal("0"), AMOUNT_TYPE))
+
+
+def _cents(column):
+    """Rounded half-even to cents, as Product's DecimalFields store amounts"""
+    return pc.cast(pc.round(column, 2, round_mode="half_to_even"), PRICE_TYPE)
+
+
+def _count(column):
+    """to_int() for a column: truncated toward zero, 0 when missing or invalid"""
+    return pc.cast(pc.trunc(pc.fill_null(_number(column), 0.0)), pa.int64(), safe=False)
+
+
+def _category(column):
+    keys = pa.array(list(CATEGORY_MAP))
+    values = pa.array(list(CATEGORY_MAP.values()))
+    index = pc.index_in(pc.utf8_lower(_text(column)), value_set=keys)
+    return pc.fill_null(pc.take(values, index), "other")
+
+
+def _sku(sku, product_id, name):
+    """make_sku() for columns"""
+    def present(column):
+        return pc.fill_null(pc.not_equal(column, ""), False)
+
+    sku, product_id = _text(sku), _text(product_id)
+    from_name = pc.replace_substring_regex(pc.utf8_upper(pc.fill_null(_text(name), "")), r"[^\p{L}\p{N}]", "")
+    from_name = pc.if_else(pc.equal(from_name, ""), pa.scalar("UNKNOWN"), from_name)
+    fallback = pc.binary_join_element_wise("CSV-", pc.if_else(present(product_id), product_id, from_name), "")
+    return pc.if_else(present(sku), sku, fallback)
+
+
+def _bool(column):
+    """Booleans from bool, number or text ("true"/"1"/"yes"...) columns; null when unrecognized"""
+    if pa.types.is_boolean(column.type):
+        return column
+    if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+        return pc.not_equal(column, 0)
+    text = pc.utf8_lower(_text(column))
+    truthy = pc.is_in(text, value_set=pa.array(["true", "t", "1", "yes", "y"]))
+    falsy = pc.is_in(text, value_set=pa.array(["false", "f", "0", "no", "n"]))
+    return pc.if_else(truthy, True, pc.if_else(falsy, False, pa.scalar(None, pa.bool_())))
+
+
+def _given_amount(columns, name, derived):
+    """The file's `name` amounts where present and valid, else `derived`"""
+    if name not in columns:
+        return derived
+    given = pc.if_else(
+        pc.is_valid(_number(columns[name])), _amount(columns[name], name), pa.scalar(None, AMOUNT_TYPE),
+    )
+    return pc.coalesce(given, derived)
+
+
+def parse_batch(batch):
+    """
+    A record batch -> [(sku, fields)], matching parse_row() for each row.
+
+    Columns export_products writes beyond the CSV feed (min_price, max_price,
+    is_active, elasticity) are used where present and not null, so importing
+    an export changes nothing; otherwise they are derived as for a CSV row.
+    """
+    n = batch.num_rows
+    # Case-insensitive field mapping
+    columns = {name.strip().lower(): batch.column(i) for i, name in enumerate(batch.schema.names)}
+
+    def column(name):
+        return columns[name] if name in columns else pa.nulls(n, pa.string())
+
+    base_price = _amount(column("cost_price"), "cost_price")
+    current_price = _amount(column("selling_price"), "selling_price")
+    optimized_price = _amount(column("optimized_price"), "optimized_price")
+
+    # Price bounds come from the positive prices; current_price falls back afterwards
+    zero = pa.scalar(Decimal("0"), AMOUNT_TYPE)
+    positive = [pc.if_else(pc.greater(p, zero), p, pa.scalar(None, AMOUNT_TYPE))
+                for p in (base_price, current_price, optimized_price)]
+    min_price = pc.fill_null(pc.min_element_wise(*positive, skip_nulls=True), zero)
+    max_price = pc.coalesce(pc.max_element_wise(*positive, skip_nulls=True), current_price)
+    min_price = _given_amount(columns, "min_price", min_price)
+    max_price = _given_amount(columns, "max_price", max_price)
+    current_price = pc.if_else(
+        pc.less_equal(current_price, zero),
+        pc.if_else(pc.greater(base_price, zero), base_price, pa.scalar(Decimal("1.00"), AMOUNT_TYPE)),
+        current_price,
+    )
+    rating = pc.max_element_wise(pc.min_element_wise(_count(column("customer_rating")), 5), 0)
+
+    fields = {
+        "name": pc.fill_null(_text(column("name")), ""),
+        "description": pc.fill_null(_text(column("description")), ""),
+        "category": _category(column("category")),
+        "base_price": _cents(base_price),
+        "current_price": _cents(current_price),
+        "min_price": _cents(min_price),
+        "max_price": _cents(max_price),
+        "optimized_price": _cents(optimized_price),
+        "stock_qty": _count(column("stock_available")),
+        "units_sold": _count(column("units_sold")),
+        "customer_rating": rating,
+        "demand_forecast": _count(column("demand_forecast")),
+        "is_active": pc.fill_null(_bool(column("is_active")), True),
+    }
+    if "elasticity" in columns:
+        # Rows without a value keep the stored elasticity (ProductFeedWriter)
+        fields["elasticity"] = _number(columns["elasticity"])
+
+    skus = _sku(column("sku"), column("product_id"), column("name")).to_pylist()
+    names = list(fields)
+    values = [fields[name].to_pylist() for name in names]
+    rows = []
+    for sku, row in zip(skus, zip(*values)):
+        payload = dict(zip(names, row))
+        if payload.get("elasticity", 0) is None:
+            del payload["elasticity"]
+        rows.append((sku, payload))
+    return rows
+
+
+def open_writer(path, schema=EXPORT_SCHEMA):
+    if file_format(path) == "parquet":
+        return pq.ParquetWriter(path, schema)
+    return pa.ipc.new_file(str(path), schema)
+
+
+def record_batch(rows, schema=EXPORT_SCHEMA):
+    """Rows of values (in schema order) -> one record batch, built column by column"""
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
@@ -0,0 +1,77 @@
+# backend/products/elasticity.py
+import numpy as np
+
+# Estimates are clipped to a sane range; pricing treats > 1.5 as highly elastic
+MIN_ELASTICITY = 0.1
+MAX_ELASTICITY = 5.0
+
+# Segments shorter than this are too short to measure a sales rate
+MIN_SEGMENT_SECONDS = 3600
+
+
+def sales_segments(positions, prices, units, times, current_units, now):
+    """
+    Turn price-history rows into (price, sales rate) observations.
+
+    Rows must be sorted by (product, changed_at). `positions` maps each row to
+    its product's index in `current_units`. The price set by a row stays in
+    effect until the product's next change (or `now` for the last one), and the
+    units sold in that window come from consecutive units_sold snapshots.
+
+    Returns (positions, log_price, log_rate) for the usable segments.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    units = np.asarray(units, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+
+    last = np.r_[positions[1:] != positions[:-1], True]
+    next_units = np.where(last, np.asarray(current_units, dtype=np.float64)[positions], np.r_[units[1:], 0])
+    next_times = np.where(last, now, np.r_[times[1:], 0])
+
+    sold = next_units - units
+    elapsed = next_times - times
+    usable = (sold > 0) & (elapsed >= MIN_SEGMENT_SECONDS) & (prices > 0) & ~np.isnan(units)
+
+    rate = sold[usable] / (elapsed[usable] / 86400)
+    return positions[usable], np.log(prices[usable]), np.log(rate)
+
+
+def fit_loglog(positions, log_price, log_rate, size):
+    """
+    Per-product least squares of log(rate) on log(price) from grouped sums.
+    Returns (n_observations, elasticity) arrays of length `size`; elasticity is
+    -slope and NaN where a product has fewer than two distinct prices.
+    """
+    n = np.bincount(positions, minlength=size).astype(np.float64)
+    sx = np.bincount(positions, weights=log_price, minlength=size)
+    sy = np.bincount(positions, weights=log_rate, minlength=size)
+    sxx = np.bincount(positions, weights=log_price * log_price, minlength=size)
+    sxy = np.bincount(positions, weights=log_price * log_rate, minlength=size)
+
+    denom = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(denom > 1e-12, (n * sxy - sx * sy) / denom, np.nan)
+    return n, -slope
+
+
+def shrink_to_category(n, elasticity, categories, prior_strength=5.0, fallback=1.2):
+    """
+    Shrink noisy per-product estimates toward their category mean:
+    (n * estimate + k * category_mean) / (n + k). Products without an estimate
+    get the category mean; categories without any estimate use `fallback`.
+    """
+    categories = np.asarray(categories)
+    codes, inverse = np.unique(categories, return_inverse=True)
+    has_fit = ~np.isnan(elasticity)
+    clipped = np.clip(np.nan_to_num(elasticity), MIN_ELASTICITY, MAX_ELASTICITY)
+
+    weight = np.where(has_fit, n, 0.0)
+    cat_n = np.bincount(inverse, weights=weight, minlength=len(codes))
+    cat_sum = np.bincount(inverse, weights=weight * clipped, minlength=len(codes))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cat_mean = np.where(cat_n > 0, cat_sum / cat_n, fallback)
+
+    prior = cat_mean[inverse]
+    shrunk = (weight * clipped + prior_strength * prior) / (weight + prior_strength)
+    return np.clip(shrunk, MIN_ELASTICITY, MAX_ELASTICITY), dict(zip(codes.tolist(), cat_mean.tolist()))
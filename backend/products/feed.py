@@ -0,0 +1,204 @@
+# backend/products/feed.py
+"""
+Parsing of supplier product feeds (CSV), shared by seed_products' serial and
+parallel modes. Nothing here touches Django, so pool workers can import it
+under any multiprocessing start method.
+"""
+import csv
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+
+# Parallel parsing hands out ranges of about this many bytes
+RANGE_BYTES = 4 * 1024 * 1024
+BLOCK_BYTES = 1024 * 1024
+
+CSV_HEADERS = [
+    "product_id", "name", "description", "cost_price", "selling_price",
+    "category", "stock_available", "units_sold", "customer_rating",
+    "demand_forecast", "optimized_price",
+]
+
+
+CATEGORY_MAP = {
+    "electronics": "electronics",
+    "grocery": "grocery", 
+    "stationery": "stationery",
+    "stationary": "stationery",  # Handle common typo
+    "outdoor & sports": "other",
+    "apparel": "other",
+    "home automation": "electronics",
+    "transportation": "other",
+    "wearables": "electronics",
+}
+
+
+def to_decimal(value, default="0"):
+    """Convert value to Decimal, handling empty/invalid values"""
+    if value is None or str(value).strip() == "":
+        value = default
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError, TypeError):
+        return Decimal(str(default))
+
+
+def to_int(value, default=0):
+    """Convert value to int, handling decimals and invalid values"""
+    try:
+        return int(float(str(value)))  # Handle "131244.0" format
+    except Exception:
+        return default
+
+
+def normalize_category(raw):
+    """Map CSV categories to our model choices"""
+    if not raw:
+        return "other"
+    key = str(raw).strip().lower()
+    return CATEGORY_MAP.get(key, "other")
+
+
+def make_sku(row):
+    """SKU from an explicit sku column (e.g. export_products output), else product_id or name"""
+    sku = str(row.get("sku") or "").strip()
+    if sku:
+        return sku
+    pid = str(row.get("product_id") or "").strip()
+    name = str(row.get("name") or "").strip()
+    if pid:
+        return f"CSV-{pid}"
+    # Fallback: from name
+    base = "".join(ch for ch in name.upper() if ch.isalnum())
+    return f"CSV-{base or 'UNKNOWN'}"
+
+
+def parse_row(raw):
+    """One CSV row -> (sku, product fields). Owner and defaults are added by the writer."""
+    # Case-insensitive field mapping
+    row = {k.strip().lower(): v for k, v in raw.items() if k}
+
+    # Parse ALL numeric fields from CSV
+    base_price = to_decimal(row.get("cost_price"), "0")  # cost_price -> base_price
+    current_price = to_decimal(row.get("selling_price"), "0")  # selling_price -> current_price
+    optimized_price = to_decimal(row.get("optimized_price"), "0")  # ✅ From CSV
+
+    # Set price bounds
+    prices = [p for p in [base_price, current_price, optimized_price] if p > 0]
+    min_price = min(prices) if prices else Decimal("0")
+    max_price = max(prices) if prices else current_price
+
+    # Ensure we have a valid current_price
+    if current_price <= 0:
+        current_price = base_price if base_price > 0 else Decimal("1.00")
+
+    return make_sku(row), {
+        "name": (row.get("name") or "").strip(),
+        "description": (row.get("description") or "").strip(),
+        "category": normalize_category(row.get("category")),
+        "base_price": base_price,
+        "current_price": current_price,
+        "min_price": min_price,
+        "max_price": max_price,
+        "optimized_price": optimized_price,  # ✅ Save optimized_price from CSV
+        "stock_qty": to_int(row.get("stock_available"), 0),
+        "units_sold": to_int(row.get("units_sold"), 0),
+        "customer_rating": max(0, min(5, to_int(row.get("customer_rating"), 0))),  # Ensure 0-5 range
+        "demand_forecast": to_int(row.get("demand_forecast"), 0),  # ✅ Save demand_forecast from CSV
+        "is_active": True,
+    }
+
+
+def preview_item(sku, payload):
+    """Display form of a parsed row for --preview"""
+    return {
+        "sku": sku,
+        "name": payload["name"],
+        "category": payload["category"],
+        "base_price": f"${payload['base_price']}",
+        "current_price": f"${payload['current_price']}",
+        "optimized_price": f"${payload['optimized_price']}",  # ✅ Show in preview
+        "stock_qty": f"{payload['stock_qty']:,}",
+        "units_sold": f"{payload['units_sold']:,}",
+        "customer_rating": f"{payload['customer_rating']}/5",
+        "demand_forecast": f"{payload['demand_forecast']:,}",  # ✅ Show in preview
+    }
+
+
+def read_header(path):
+    """(fieldnames, offset of the first data row); fieldnames is None for an empty file"""
+    with open(path, "rb") as f:
+        header = f.readline()
+        # A quoted header cell may itself contain a newline
+        while header.count(b'"') % 2:
+            line = f.readline()
+            if not line:
+                break
+            header += line
+    fieldnames = next(csv.reader(io.StringIO(header.decode("utf-8-sig"), newline="")), None)
+    return fieldnames, len(header)
+
+
+def split_ranges(path, start, range_bytes=RANGE_BYTES):
+    """
+    Yield (start, end) byte ranges of about `range_bytes` covering the file from
+    `start`, each ending just after a row. A newline only ends a row outside
+    quotes, i.e. where an even number of quote characters precede it ("" escapes
+    count twice), so a single sequential pass of bytes.count() finds the cuts.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        range_start = cut = start
+        block_start = start
+        quoted = False
+        while True:
+            block = f.read(BLOCK_BYTES)
+            if not block:
+                break
+            i = max(0, cut + range_bytes - block_start)
+            in_quotes = quoted ^ bool(block.count(b'"', 0, i) % 2)
+            while i < len(block):
+                j = block.find(b"\n", i)
+                if j == -1:
+                    break
+                in_quotes ^= bool(block.count(b'"', i, j) % 2)
+                i = j + 1
+                if in_quotes:
+                    continue
+                cut = block_start + i
+                yield range_start, cut
+                range_start = cut
+                # Skip ahead to the next target, keeping track of the quote state
+                nxt = max(i, cut + range_bytes - block_start)
+                in_quotes ^= bool(block.count(b'"', i, nxt) % 2)
+                i = nxt
+            quoted ^= bool(block.count(b'"') % 2)
+            block_start += len(block)
+        if range_start < block_start:
+            yield range_start, block_start
+
+
+def parse_range(path, start, end, fieldnames):
+    """Parse the rows in one byte range (runs in a worker process)"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8"), newline=""), fieldnames=fieldnames)
+    return [parse_row(raw) for raw in reader]
+
+
+def parse_parallel(path, fieldnames, start, workers, range_bytes=RANGE_BYTES):
+    """
+    Yield parse_row() results for the whole file, in file order, with the
+    ranges parsed in a pool of `workers` processes. Only a couple of ranges per
+    worker are in flight, so memory stays bounded when the consumer is slower.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for begin, end in split_ranges(path, start, range_bytes):
+            pending.append(pool.submit(parse_range, path, begin, end, fieldnames))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
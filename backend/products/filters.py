@@ -0,0 +1,233 @@
+# backend/products/filters.py
+import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from .models import Product, METRIC_EXPRESSIONS
+
+# current_price buckets for the price facet: (label, low inclusive, high exclusive)
+PRICE_BUCKETS = [
+    ("0-10", 0, 10),
+    ("10-25", 10, 25),
+    ("25-50", 25, 50),
+    ("50-100", 50, 100),
+    ("100-250", 100, 250),
+    ("250-500", 250, 500),
+    ("500-1000", 500, 1000),
+    ("1000+", 1000, None),
+]
+
+LOW_STOCK_THRESHOLD = 10
+
+STOCK_STATUSES = {
+    "out_of_stock": Q(stock_qty=0),
+    "low_stock": Q(stock_qty__gt=0, stock_qty__lte=LOW_STOCK_THRESHOLD),
+    "in_stock": Q(stock_qty__gt=LOW_STOCK_THRESHOLD),
+}
+
+RATINGS = range(0, 6)
+
+# Range lookups allowed on the with_metrics() annotations, e.g. ?stock_velocity__gt=2
+METRIC_LOOKUPS = ("gt", "gte", "lt", "lte")
+
+
+def _price_bucket_q(low, high):
+    q = Q(current_price__gte=low)
+    if high is not None:
+        q &= Q(current_price__lt=high)
+    return q
+
+
+def _number(params, name, cast):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return cast(raw)
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValidationError({name: f"Invalid number: {raw}"})
+
+
+def parse_datetime_param(params, name, end_of_day=False):
+    """ISO datetime or date; a bare date covers the whole day. Naive values are in the current time zone"""
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        value = parse_datetime(raw)
+        if value is None:
+            day = parse_date(raw)
+            if day is None:
+                raise ValueError
+            value = datetime.datetime.combine(day, datetime.time.max if end_of_day else datetime.time.min)
+    except ValueError:
+        raise ValidationError({name: f"Invalid date/time: {raw}"})
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def _to_bool(params, name):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    value = str(raw).lower()
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    raise ValidationError({name: f"Invalid boolean: {raw}"})
+
+
+class ProductFilterBackend(filters.BaseFilterBackend):
+    """
+    Structured product filters:
+      ?category=electronics,grocery  ?price_min=10&price_max=50
+      ?stock_min=1&stock_max=100     ?stock_status=low_stock
+      ?rating_min=4&rating_max=5     ?is_active=true
+      ?profit_margin__gte=20         ?stock_velocity__gt=2   (needs Product.objects.with_metrics())
+    """
+
+    def get_facet_filters(self, request):
+        """{facet: Q} for every filter present in the request"""
+        params = request.query_params
+        facet_filters = {}
+
+        categories = [c for c in params.get("category", "").split(",") if c]
+        if categories:
+            valid = {c for c, _ in Product.CATEGORY_CHOICES}
+            unknown = [c for c in categories if c not in valid]
+            if unknown:
+                raise ValidationError({"category": f"Unknown category: {', '.join(unknown)}"})
+            facet_filters["category"] = Q(category__in=categories)
+
+        price = Q()
+        price_min = _number(params, "price_min", Decimal)
+        price_max = _number(params, "price_max", Decimal)
+        if price_min is not None:
+            price &= Q(current_price__gte=price_min)
+        if price_max is not None:
+            price &= Q(current_price__lte=price_max)
+        if price:
+            facet_filters["price"] = price
+
+        stock = Q()
+        stock_min = _number(params, "stock_min", int)
+        stock_max = _number(params, "stock_max", int)
+        if stock_min is not None:
+            stock &= Q(stock_qty__gte=stock_min)
+        if stock_max is not None:
+            stock &= Q(stock_qty__lte=stock_max)
+        status = params.get("stock_status")
+        if status:
+            if status not in STOCK_STATUSES:
+                raise ValidationError({"stock_status": f"Choose one of: {', '.join(STOCK_STATUSES)}"})
+            stock &= STOCK_STATUSES[status]
+        if stock:
+            facet_filters["stock"] = stock
+
+        rating = Q()
+        rating_min = _number(params, "rating_min", int)
+        rating_max = _number(params, "rating_max", int)
+        if rating_min is not None:
+            rating &= Q(customer_rating__gte=rating_min)
+        if rating_max is not None:
+            rating &= Q(customer_rating__lte=rating_max)
+        if rating:
+            facet_filters["rating"] = rating
+
+        is_active = _to_bool(params, "is_active")
+        if is_active is not None:
+            facet_filters["is_active"] = Q(is_active=is_active)
+
+        metrics = Q()
+        for metric in METRIC_EXPRESSIONS:
+            for lookup in METRIC_LOOKUPS:
+                name = f"{metric}__{lookup}"
+                value = _number(params, name, float)
+                if value is not None:
+                    metrics &= Q(**{name: value})
+        if metrics:
+            facet_filters["metrics"] = metrics
+
+        return facet_filters
+
+    def filter_queryset(self, request, queryset, view):
+        for q in self.get_facet_filters(request).values():
+            queryset = queryset.filter(q)
+        return queryset
+
+
+class PriceHistoryFilterBackend(filters.BaseFilterBackend):
+    """
+    Price-history filters:
+      ?from=2024-01-01&to=2024-03-31T12:00:00   (inclusive; a bare `to` date covers the whole day)
+      ?owner=3   ?category=electronics,grocery  (product's owner / category, for the feed)
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        start = parse_datetime_param(params, "from")
+        end = parse_datetime_param(params, "to", end_of_day=True)
+        if start is not None:
+            queryset = queryset.filter(changed_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(changed_at__lte=end)
+
+        owner = _number(params, "owner", int)
+        if owner is not None:
+            queryset = queryset.filter(product__owner_id=owner)
+        categories = [c for c in params.get("category", "").split(",") if c]
+        if categories:
+            valid = {c for c, _ in Product.CATEGORY_CHOICES}
+            unknown = [c for c in categories if c not in valid]
+            if unknown:
+                raise ValidationError({"category": f"Unknown category: {', '.join(unknown)}"})
+            queryset = queryset.filter(product__category__in=categories)
+        return queryset
+
+
+def product_facets(queryset, facet_filters):
+    """
+    Counts per category, price bucket, rating, stock status and active flag
+    in a single aggregate query.
+
+    Each facet's counts apply every filter except its own, so a client can see
+    how many products the other options of a facet would give.
+    """
+    def others(facet):
+        q = Q()
+        for name, f in facet_filters.items():
+            if name != facet:
+                q &= f
+        return q
+
+    groups = {
+        "category": {c: Q(category=c) for c, _ in Product.CATEGORY_CHOICES},
+        "price": {label: _price_bucket_q(low, high) for label, low, high in PRICE_BUCKETS},
+        "rating": {str(r): Q(customer_rating=r) for r in RATINGS},
+        "stock": dict(STOCK_STATUSES),
+        "is_active": {"true": Q(is_active=True), "false": Q(is_active=False)},
+    }
+
+    aggregates = {"total": Count("id", filter=others(None))}
+    keys = {}
+    for facet, options in groups.items():
+        scope = others(facet)
+        for n, (label, q) in enumerate(options.items()):
+            alias = f"{facet}_{n}"
+            aggregates[alias] = Count("id", filter=scope & q)
+            keys[alias] = (facet, label)
+
+    counts = queryset.order_by().aggregate(**aggregates)
+
+    result = {"total": counts.pop("total"), **{facet: {} for facet in groups}}
+    for alias, value in counts.items():
+        facet, label = keys[alias]
+        result[facet][label] = value
+    return result
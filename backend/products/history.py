@@ -0,0 +1,37 @@
+# backend/products/history.py
+import datetime
+
+from django.db.models import Case, F, OuterRef, Subquery, When
+from django.db.models.functions import Coalesce
+
+from .models import PriceRollup, ProductPriceHistory
+
+
+def price_at_expression(at):
+    """
+    Product's price at time `at`, as an expression for .annotate():
+
+    - new_price of the last change at or before `at`
+    - else the close of the last earlier day in PriceRollup (history archived by
+      apply_retention survives there, at day granularity)
+    - else the open of the first rollup day from `at` on, or the old_price of the
+      first change after `at` (the price it started with)
+    - else current_price (never changed)
+    - NULL for products created after `at`
+
+    Each lookup is one seek on a (product, time) index, so a whole catalog
+    resolves in a single query.
+    """
+    day = at.astimezone(datetime.timezone.utc).date()
+    history = ProductPriceHistory.objects.filter(product=OuterRef("pk"))
+    rollups = PriceRollup.objects.filter(product=OuterRef("pk"))
+    before = history.filter(changed_at__lte=at).order_by("-changed_at", "-id").values("new_price")[:1]
+    day_before = rollups.filter(day__lt=day).order_by("-day").values("close")[:1]
+    day_after = rollups.filter(day__gte=day).order_by("day").values("open")[:1]
+    after = history.filter(changed_at__gt=at).order_by("changed_at", "id").values("old_price")[:1]
+    return Case(
+        When(created_at__gt=at, then=None),
+        default=Coalesce(
+            Subquery(before), Subquery(day_before), Subquery(day_after), Subquery(after), F("current_price"),
+        ),
+    )
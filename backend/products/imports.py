@@ -0,0 +1,174 @@
+# backend/products/imports.py
+"""
+Catalog uploads: POST /api/products/import/ streams the file to disk and
+queues a ProductImportJob; the worker (`python manage.py process_imports`)
+claims jobs from the table and runs them through ProductFeedWriter.
+
+Each chunk is committed together with the job's progress, so clients polling
+the job see counts as rows land. A job that dies half way is requeued and
+started over; rows it already wrote are then unchanged and skipped.
+"""
+import csv
+import importlib.util
+import io
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.db import transaction
+from django.utils import timezone
+
+from commons.permissions import is_admin_user
+from .feed import parse_row
+from .models import ProductImportJob
+from .services import ProductFeedWriter
+
+UPLOAD_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+IMPORT_CHUNK_SIZE = 2000
+
+# A running job whose heartbeat is older than this lost its worker and is requeued
+STALE_AFTER = timedelta(minutes=10)
+
+
+def upload_format(name):
+    """"csv", "parquet" or "arrow" from the file name, else None"""
+    return UPLOAD_FORMATS.get(Path(name or "").suffix.lower())
+
+
+def columnar_supported():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def enqueue_upload(upload, owner, created_by, deactivate_missing=False):
+    """
+    Store an uploaded file in IMPORT_UPLOAD_DIR and queue a job for it. Uploads
+    Django spooled to a temporary file are moved there (a rename on the same
+    filesystem); small in-memory ones are written out chunk by chunk.
+    """
+    directory = Path(settings.IMPORT_UPLOAD_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{uuid.uuid4().hex}{Path(upload.name).suffix.lower()}"
+    if hasattr(upload, "temporary_file_path"):
+        file_move_safe(upload.temporary_file_path(), str(path))
+    else:
+        with open(path, "wb") as out:
+            for chunk in upload.chunks(UPLOAD_CHUNK_BYTES):
+                out.write(chunk)
+    return ProductImportJob.objects.create(
+        owner=owner,
+        created_by=created_by,
+        file_path=str(path),
+        original_name=Path(upload.name).name[:255],
+        format=upload_format(upload.name),
+        size_bytes=upload.size or 0,
+        deactivate_missing=deactivate_missing,
+    )
+
+
+def claim_next_job():
+    """Mark the oldest queued job running and return it; None when the queue is empty"""
+    now = timezone.now()
+    ProductImportJob.objects.filter(status="running", heartbeat_at__lt=now - STALE_AFTER).update(status="queued")
+    queued = ProductImportJob.objects.filter(status="queued").order_by("id").values_list("id", flat=True)
+    for pk in queued[:10]:
+        # Only one worker's conditional UPDATE can match
+        claimed = ProductImportJob.objects.filter(pk=pk, status="queued").update(
+            status="running", started_at=now, heartbeat_at=now, finished_at=None,
+            rows_processed=0, progress=0, counts={}, errors=[], error_count=0, message="",
+        )
+        if claimed:
+            return ProductImportJob.objects.select_related("owner", "created_by__profile").get(pk=pk)
+    return None
+
+
+def _csv_chunks(path, chunk_size):
+    """(parsed rows, fraction of the file read) per chunk, streaming the CSV"""
+    size = os.path.getsize(path) or 1
+    with open(path, "rb") as raw:
+        reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+        if not reader.fieldnames:
+            raise ValueError("CSV has no header row.")
+        chunk = []
+        for row in reader:
+            chunk.append(parse_row(row))
+            if len(chunk) == chunk_size:
+                yield chunk, min(raw.tell() / size, 1.0)
+                chunk = []
+        if chunk:
+            yield chunk, 1.0
+
+
+def _columnar_chunks(path, chunk_size, job):
+    from . import columnar
+
+    job.rows_total = columnar.count_rows(path)
+    done = 0
+    for batch in columnar.read_batches(path, chunk_size):
+        done += batch.num_rows
+        yield columnar.parse_batch(batch), done / job.rows_total if job.rows_total else 0.0
+
+
+def _save_progress(job, writer, progress):
+    counts = dict(writer.counts)
+    job.rows_processed = counts.pop("rows")
+    job.error_count = counts.pop("errors")
+    job.counts = counts
+    job.errors = writer.errors
+    job.progress = round(progress, 1)
+    job.heartbeat_at = timezone.now()
+    job.save(update_fields=[
+        "status", "rows_processed", "rows_total", "progress", "counts", "errors", "error_count",
+        "message", "heartbeat_at", "finished_at",
+    ])
+
+
+def run_job(job, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import a claimed job's file; the job ends "done" or "failed" with its counts.
+    The stored upload is deleted either way.
+    """
+    # Suppliers may only touch their own catalog; admins upload on anyone's behalf
+    writer = ProductFeedWriter(
+        job.owner, reason="Catalog upload", collect_errors=True,
+        own_products_only=not (job.created_by and is_admin_user(job.created_by)),
+    )
+    path = Path(job.file_path)
+    try:
+        if job.format == "csv":
+            chunks = _csv_chunks(path, chunk_size)
+        elif columnar_supported():
+            chunks = _columnar_chunks(path, chunk_size, job)
+        else:
+            raise ValueError("Parquet/Arrow imports need pyarrow installed on the worker (pip install -r requirements.txt)")
+        for chunk, fraction in chunks:
+            with transaction.atomic():
+                writer.write(chunk)
+                _save_progress(job, writer, 100 * fraction)
+
+        with transaction.atomic():
+            if job.deactivate_missing:
+                writer.deactivate_missing()
+            job.status = "done"
+            job.rows_total = writer.counts["rows"]
+            job.finished_at = timezone.now()
+            _save_progress(job, writer, 100)
+    except Exception as exc:
+        # Chunks committed so far stay; the job records where and why it stopped
+        job.status = "failed"
+        job.message = str(exc) or exc.__class__.__name__
+        job.finished_at = timezone.now()
+        _save_progress(job, writer, job.progress)
+    finally:
+        path.unlink(missing_ok=True)
+    return job
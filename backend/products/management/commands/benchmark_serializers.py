@@ -0,0 +1,56 @@
+# backend/products/management/commands/benchmark_serializers.py
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from products.models import Product
+from products.serializers import ProductSerializer, ProductListSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare per-row serialization cost of ProductSerializer and ProductListSerializer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Products to serialize (default: 1000)")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per serializer; best is reported (default: 5)")
+
+    def handle(self, *args, **opts):
+        if opts["rows"] < 1 or opts["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be positive")
+
+        products = list(Product.objects.with_metrics().select_related("owner").order_by("id")[:opts["rows"]])
+        if not products:
+            raise CommandError("No products found; run seed_products first")
+
+        renderer = JSONRenderer()
+        outputs = {}
+        timings = {}
+        for serializer_class in (ProductSerializer, ProductListSerializer):
+            best = None
+            for _ in range(opts["repeat"]):
+                started = time.perf_counter()
+                data = serializer_class(products, many=True).data
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            outputs[serializer_class.__name__] = renderer.render(data)
+            timings[serializer_class.__name__] = best
+
+        before = timings["ProductSerializer"] / len(products) * 1e6
+        after = timings["ProductListSerializer"] / len(products) * 1e6
+        self.stdout.write(f"📊 {len(products):,} products, best of {opts['repeat']} runs")
+        self.stdout.write(f"  • ProductSerializer:     {before:8.1f} µs/row")
+        self.stdout.write(f"  • ProductListSerializer: {after:8.1f} µs/row ({before / after:.1f}x)")
+
+        if outputs["ProductSerializer"] != outputs["ProductListSerializer"]:
+            expected = json.loads(outputs["ProductSerializer"])
+            actual = json.loads(outputs["ProductListSerializer"])
+            for row_expected, row_actual in zip(expected, actual):
+                if row_expected != row_actual:
+                    diff = {k: (row_expected.get(k), row_actual.get(k))
+                            for k in row_expected.keys() | row_actual.keys()
+                            if row_expected.get(k) != row_actual.get(k)}
+                    raise CommandError(f"Output differs for product {row_expected.get('id')}: {diff}")
+            raise CommandError("Output differs")
+        self.stdout.write(self.style.SUCCESS("✅ Identical output"))
@@ -0,0 +1,114 @@
+# backend/products/management/commands/estimate_elasticity.py
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from products.elasticity import sales_segments, fit_loglog, shrink_to_category
+from products.models import Product, ProductPriceHistory
+
+
+class Command(BaseCommand):
+    help = "Fit Product.elasticity from price history and the sales that followed each change"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Products per chunk (default: 5000)")
+        parser.add_argument(
+            "--prior-strength", type=float, default=5.0,
+            help="Observations' worth of weight given to the category mean (default: 5)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Fit and report; don't write to DB")
+
+    def handle(self, *args, **opts):
+        chunk_size = opts["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        started = time.monotonic()
+        now = timezone.now().timestamp()
+
+        # Pass 1: per-product fits, one chunk of products (and their history) at a time.
+        # Only a few numbers per product are kept, so memory follows the catalog size,
+        # never the history table.
+        ids, categories, current, n_obs, raw = [], [], [], [], []
+        products = Product.objects.order_by("id").values_list("id", "category", "units_sold", "elasticity")
+        chunk = []
+        for row in products.iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                self._fit_chunk(chunk, now, ids, categories, current, n_obs, raw)
+                chunk = []
+        if chunk:
+            self._fit_chunk(chunk, now, ids, categories, current, n_obs, raw)
+
+        if not ids:
+            self.stdout.write("No products found")
+            return
+
+        ids = np.concatenate(ids)
+        current = np.concatenate(current)
+        n_obs = np.concatenate(n_obs)
+        raw = np.concatenate(raw)
+        categories = np.concatenate(categories)
+
+        # Pass 2: shrink toward category means and write back what changed
+        estimates, category_means = shrink_to_category(
+            n_obs, raw, categories, prior_strength=opts["prior_strength"],
+        )
+        estimates = estimates.round(3)
+        changed = np.flatnonzero(np.abs(estimates - current) >= 0.001)
+
+        fitted = int((~np.isnan(raw)).sum())
+        self.stdout.write(f"📊 {len(ids):,} products, {fitted:,} with their own fit")
+        for category, mean in sorted(category_means.items()):
+            self.stdout.write(f"  • {category}: mean elasticity {mean:.3f}")
+
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"🔍 DRY RUN - Would update {len(changed):,} products"))
+            return
+
+        now_dt = timezone.now()
+        for start in range(0, len(changed), chunk_size):
+            batch = [
+                Product(pk=int(ids[i]), elasticity=float(estimates[i]), updated_at=now_dt)
+                for i in changed[start:start + chunk_size]
+            ]
+            with transaction.atomic():
+                Product.objects.bulk_update(batch, ["elasticity", "updated_at"], batch_size=1000)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Updated elasticity for {len(changed):,} products in {elapsed:.1f}s"
+        ))
+
+    def _fit_chunk(self, chunk, now, ids, categories, current, n_obs, raw):
+        chunk_ids = np.array([r[0] for r in chunk], dtype=np.int64)
+        current_units = np.array([r[2] for r in chunk], dtype=np.float64)
+
+        history = list(
+            ProductPriceHistory.objects
+            .filter(product_id__in=chunk_ids.tolist())
+            .order_by("product_id", "changed_at")
+            .values_list("product_id", "new_price", "units_sold", "changed_at")
+        )
+        n = np.zeros(len(chunk))
+        elasticity = np.full(len(chunk), np.nan)
+        if history:
+            positions = np.searchsorted(chunk_ids, [h[0] for h in history])
+            pos, log_price, log_rate = sales_segments(
+                positions,
+                [float(h[1]) for h in history],
+                [np.nan if h[2] is None else h[2] for h in history],
+                [h[3].timestamp() for h in history],
+                current_units,
+                now,
+            )
+            n, elasticity = fit_loglog(pos, log_price, log_rate, len(chunk))
+
+        ids.append(chunk_ids)
+        categories.append(np.array([r[1] for r in chunk]))
+        current.append(np.array([r[3] for r in chunk], dtype=np.float64))
+        n_obs.append(n)
+        raw.append(elasticity)
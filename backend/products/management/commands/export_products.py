@@ -0,0 +1,61 @@
+# backend/products/management/commands/export_products.py
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from products.models import Product
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Export the product catalog to a Parquet or Arrow IPC file, streamed in record batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", required=True, help="Output .parquet or .arrow/.feather file")
+        parser.add_argument("--owner", help="Only products owned by this username")
+        parser.add_argument("--batch-size", type=int, default=50000, help="Rows per record batch (default: 50000)")
+
+    def handle(self, *args, **opts):
+        try:
+            from products import columnar
+        except ImportError:
+            raise CommandError("export_products needs pyarrow; install it with: pip install -r requirements.txt")
+
+        path = Path(opts["path"])
+        if columnar.file_format(path) is None:
+            raise CommandError("Use a .parquet/.pq or .arrow/.feather/.ipc file")
+        batch_size = opts["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive")
+
+        products = Product.objects.order_by("id")
+        if opts["owner"]:
+            owner = User.objects.filter(username__iexact=opts["owner"]).first()
+            if not owner:
+                raise CommandError(f"Owner user '{opts['owner']}' not found")
+            products = products.filter(owner=owner)
+
+        # One server-side cursor; only one batch of rows is held at a time
+        rows = products.values_list(*(lookup for _, lookup, _ in columnar.EXPORT_COLUMNS))
+        started = time.monotonic()
+        exported = 0
+        with columnar.open_writer(path) as writer:
+            batch = []
+            for row in rows.iterator(chunk_size=min(batch_size, 10000)):
+                batch.append(row)
+                if len(batch) == batch_size:
+                    writer.write_batch(columnar.record_batch(batch))
+                    exported += len(batch)
+                    batch = []
+            if batch or not exported:
+                writer.write_batch(columnar.record_batch(batch))
+                exported += len(batch)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Exported {exported:,} products to {path} in {elapsed:.1f}s "
+            f"({exported / max(elapsed, 1e-9):,.0f} rows/s)"
+        ))
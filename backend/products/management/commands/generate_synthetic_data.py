@@ -0,0 +1,299 @@
+# backend/products/management/commands/generate_synthetic_data.py
+import json
+import multiprocessing
+import re
+import secrets
+import time
+from collections import deque
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from forecast.methods import FORECAST_METHODS
+from forecast.models import DemandForecast
+from forecast.services import DemandForecastService
+from products import synthetic
+from products.models import Product, ProductPriceHistory
+from users.models import UserProfile
+
+User = get_user_model()
+
+HISTORY_REASON = "Synthetic price change"
+HISTORY_COLUMNS = ["product_id", "old_price", "new_price", "changed_by_id", "reason", "units_sold", "changed_at"]
+CENT = Decimal("0.01")
+
+
+def _columns(model):
+    """Attribute names of a model's columns other than the primary key"""
+    return [f.attname for f in model._meta.concrete_fields if not f.primary_key]
+
+
+PRODUCT_COLUMNS = _columns(Product)
+FORECAST_COLUMNS = _columns(DemandForecast)
+
+
+def _money(values):
+    return [Decimal(f"{v:.2f}") for v in values.tolist()]
+
+
+def _init_worker():
+    """Give each worker process its own DB connections (they never query)"""
+    django.setup()
+    connections.close_all()
+
+
+def _build_chunk(task):
+    """
+    Rows for one chunk of products, in database form and ready to insert.
+    History and forecast rows point at products by position in the chunk;
+    the writer swaps in the real ids once the products are inserted.
+    """
+    stream, start, count, suppliers, weights, sku_format, opts = task
+    rng = np.random.default_rng(stream)
+    cols = synthetic.products(rng, count, weights)
+    base_prices, current_prices = _money(cols["base_price"]), _money(cols["current_price"])
+    now_db = connection.ops.adapt_datetimefield_value(opts["now"])
+
+    products = []
+    for i in range(count):
+        owner_id, username = suppliers[cols["owner"][i]]
+        number = start + i + 1
+        product = Product(
+            pk=i,
+            owner_id=owner_id,
+            sku=sku_format.format(number),
+            name=f"{cols['adjective'][i]} {cols['noun'][i]} {number}",
+            description=f"{cols['adjective'][i]} {cols['noun'][i].lower()} by {username}",
+            category=cols["category"][i],
+            base_price=base_prices[i],
+            current_price=current_prices[i],
+            stock_qty=int(cols["stock_qty"][i]),
+            units_sold=int(cols["units_sold"][i]),
+            customer_rating=int(cols["customer_rating"][i]),
+            demand_forecast=int(cols["demand_forecast"][i]),
+            elasticity=float(cols["elasticity"][i]),
+        )
+        # Same price bounds as a feed import (feed.parse_row)
+        product.optimized_price = Decimal(str(product.calculate_optimized_price())).quantize(CENT)
+        prices = (product.base_price, product.current_price, product.optimized_price)
+        product.min_price, product.max_price = min(prices), max(prices)
+        product.fill_defaults()
+        products.append(product)
+
+    timestamps = {"created_at", "updated_at"}
+    rows = {
+        "skus": [p.sku for p in products],
+        "products": [
+            tuple(now_db if name in timestamps else getattr(p, name) for name in PRODUCT_COLUMNS)
+            for p in products
+        ],
+        "history": [],
+        "forecasts": [],
+    }
+
+    if opts["history"]:
+        # Backdated: changed_at is auto_now_add, which only a plain INSERT can set
+        adapt = connection.ops.adapt_datetimefield_value
+        index, old, new, age, sold = synthetic.price_history(
+            rng, cols["current_price"], cols["units_sold"], opts["history"], opts["days"],
+        )
+        old, new = _money(old), _money(new)
+        rows["history"] = [
+            (i, old[k], new[k], products[i].owner_id, HISTORY_REASON, units,
+             adapt(opts["now"] - timedelta(seconds=seconds)))
+            for k, (i, seconds, units) in enumerate(zip(index.tolist(), age.tolist(), sold.tolist()))
+        ]
+
+    if opts["forecast_method"]:
+        forecasts = DemandForecastService.build_forecasts(
+            products, opts["forecast_method"], opts["years"], seed=int(stream.generate_state(1)[0]),
+        )
+        convert = {
+            f.attname: json.dumps for f in DemandForecast._meta.concrete_fields if isinstance(f, models.JSONField)
+        }
+        rows["forecasts"] = [
+            tuple(
+                now_db if name in timestamps else convert[name](getattr(f, name)) if name in convert
+                else getattr(f, name)
+                for name in FORECAST_COLUMNS
+            )
+            for f in forecasts
+        ]
+    return rows
+
+
+def _insert(model, columns, rows, batch_size=1000):
+    """
+    Multi-row INSERTs of rows that are already in database form. Skips the
+    per-value preparation bulk_create does, which dominates at this volume;
+    database triggers (search index, change log, rollups) fire as usual.
+    """
+    ops = connection.ops
+    fields = [model._meta.get_field(name) for name in columns]
+    size = max(1, min(batch_size, ops.bulk_batch_size(fields, rows)))
+    head = (
+        f"INSERT INTO {ops.quote_name(model._meta.db_table)} "
+        f"({', '.join(ops.quote_name(f.column) for f in fields)}) VALUES "
+    )
+    placeholder = f"({', '.join(['%s'] * len(fields))})"
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), size):
+            batch = rows[start:start + size]
+            cursor.execute(head + ", ".join([placeholder] * len(batch)), [v for row in batch for v in row])
+
+
+def _with_ids(rows, position, ids):
+    return [(*row[:position], ids[row[position]], *row[position + 1:]) for row in rows]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large synthetic catalog for load testing: suppliers, products, "
+        "price history and demand forecasts. The same --seed gives the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--suppliers", type=int, default=10, help="Supplier accounts to create or reuse (default: 10)")
+        parser.add_argument("--products", type=int, default=100_000, help="Products to create (default: 100000)")
+        parser.add_argument(
+            "--history", type=float, default=5.0,
+            help="Average price changes per product, 0 for none (default: 5)",
+        )
+        parser.add_argument("--days", type=int, default=365, help="Days of price history (default: 365)")
+        parser.add_argument(
+            "--forecast-method", default="historical_simulation",
+            choices=sorted(FORECAST_METHODS) + ["none"],
+            help="Forecast method run for every product, or none (default: historical_simulation)",
+        )
+        parser.add_argument("--years", type=int, default=5, help="Years of forecast demand (1-10, default: 5)")
+        parser.add_argument(
+            "--prefix", default="synth",
+            help="Prefix of supplier usernames and SKUs, e.g. synth_supplier_001 / SYNTH-0000001 (default: synth)",
+        )
+        parser.add_argument("--password", help="Password for new supplier accounts (default: unusable)")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Products per transaction (default: 5000)")
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Build rows in this many processes; one connection writes them (default: 1)",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed; printed when omitted so a run can be repeated")
+
+    def handle(self, *args, **opts):
+        if min(opts["suppliers"], opts["products"], opts["chunk_size"], opts["workers"]) < 1:
+            raise CommandError("--suppliers, --products, --chunk-size and --workers must be positive")
+        if opts["history"] < 0 or opts["days"] < 1:
+            raise CommandError("--history can't be negative and --days must be positive")
+        if not 1 <= opts["years"] <= 10:
+            raise CommandError("--years must be between 1 and 10")
+        prefix = opts["prefix"].lower()
+        if not re.fullmatch(r"[a-z0-9_]{1,20}", prefix):
+            raise CommandError("--prefix must be 1-20 letters, digits or underscores")
+        sku_prefix = f"{prefix.upper()}-"
+        if Product.objects.filter(sku__startswith=sku_prefix).exists():
+            raise CommandError(f"Products with SKU prefix '{sku_prefix}' already exist; pick another --prefix")
+
+        seed = opts["seed"] if opts["seed"] is not None else secrets.randbelow(2**31)
+        self.stdout.write(f"🎲 Seed {seed} (pass --seed {seed} with the same options to repeat this run)")
+
+        suppliers = self.suppliers(prefix, opts["suppliers"], opts["password"])
+        self.stdout.write(f"👥 {len(suppliers)} suppliers: {suppliers[0].username} … {suppliers[-1].username}")
+
+        total, chunk_size = opts["products"], opts["chunk_size"]
+        # Zero-padded so SKU order is creation order (write_chunk relies on it)
+        sku_format = sku_prefix + "{:0%dd}" % max(7, len(str(total)))
+        # One independent random stream per chunk, so the data doesn't depend on --workers
+        streams = np.random.SeedSequence(seed).spawn((total + chunk_size - 1) // chunk_size)
+        build_opts = {
+            "now": timezone.now(),
+            "history": opts["history"],
+            "days": opts["days"],
+            "forecast_method": None if opts["forecast_method"] == "none" else opts["forecast_method"],
+            "years": opts["years"],
+        }
+        tasks = (
+            (stream, n * chunk_size, min(chunk_size, total - n * chunk_size),
+             [(u.pk, u.username) for u in suppliers], synthetic.owner_weights(len(suppliers)),
+             sku_format, build_opts)
+            for n, stream in enumerate(streams)
+        )
+
+        self.counts = {"products": 0, "history": 0, "forecasts": 0}
+        started = time.monotonic()
+        for rows in self.build(tasks, opts["workers"]):
+            with transaction.atomic():
+                self.write_chunk(rows)
+            self._progress(total, started)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Generated {self.counts['products']:,} products, {self.counts['history']:,} price changes and "
+            f"{self.counts['forecasts']:,} forecasts in {elapsed:.1f}s "
+            f"({self.counts['products'] / max(elapsed, 1e-9):,.0f} products/s)"
+        ))
+
+    def suppliers(self, prefix, count, password):
+        """Create (or reuse) prefix_supplier_001 … with role=supplier"""
+        users = []
+        for k in range(1, count + 1):
+            username = f"{prefix}_supplier_{k:03d}"
+            user, created = User.objects.get_or_create(
+                username=username, defaults={"email": f"{username}@example.com"},
+            )
+            if created:
+                if password:
+                    user.set_password(password)
+                else:
+                    user.set_unusable_password()
+                user.save(update_fields=["password"])
+            users.append(user)
+        # A queryset update skips the revocation signals, so bump role_version here too
+        UserProfile.objects.filter(user__in=users).exclude(role="supplier").update(
+            role="supplier", role_version=F("role_version") + 1,
+        )
+        return users
+
+    def build(self, tasks, workers):
+        """Yield _build_chunk() results in chunk order"""
+        if workers == 1:
+            yield from map(_build_chunk, tasks)
+            return
+
+        # Workers open their own connections; don't hand them ours
+        connections.close_all()
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            # A couple of chunks per worker in flight keeps memory bounded when writing is slower
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.apply_async(_build_chunk, (task,)))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+    def write_chunk(self, rows):
+        _insert(Product, PRODUCT_COLUMNS, rows["products"])
+        # SKUs are zero-padded and sequential, so the new ids are one range scan away
+        skus = rows["skus"]
+        by_sku = dict(Product.objects.filter(sku__range=(skus[0], skus[-1])).values_list("sku", "id"))
+        ids = [by_sku[sku] for sku in skus]
+
+        _insert(ProductPriceHistory, HISTORY_COLUMNS, _with_ids(rows["history"], 0, ids))
+        _insert(DemandForecast, FORECAST_COLUMNS, _with_ids(rows["forecasts"], FORECAST_COLUMNS.index("product_id"), ids))
+        self.counts["products"] += len(skus)
+        self.counts["history"] += len(rows["history"])
+        self.counts["forecasts"] += len(rows["forecasts"])
+
+    def _progress(self, total, started):
+        done = self.counts["products"]
+        rate = done / max(time.monotonic() - started, 1e-9)
+        self.stdout.write(
+            f"  • {done:,}/{total:,} ({done * 100 / total:.1f}%) – {self.counts['history']:,} price changes, "
+            f"{rate:,.0f} products/s"
+        )
@@ -0,0 +1,69 @@
+# backend/products/management/commands/import_products.py
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from products.services import ProductFeedWriter
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Import products from a Parquet or Arrow IPC file (columns as in the CSV feed)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", required=True, help="Path to a .parquet or .arrow/.feather file")
+        parser.add_argument("--owner", required=True, help="Username of supplier/admin owner")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per record batch (default: 5000)")
+        parser.add_argument("--dry-run", action="store_true", help="Parse only; don't write to DB")
+        parser.add_argument(
+            "--deactivate-missing", action="store_true",
+            help="Deactivate the owner's products that are no longer in the file",
+        )
+
+    def handle(self, *args, **opts):
+        try:
+            from products import columnar
+        except ImportError:
+            raise CommandError("import_products needs pyarrow; install it with: pip install -r requirements.txt")
+
+        path = Path(opts["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        if columnar.file_format(path) is None:
+            raise CommandError("Use a .parquet/.pq or .arrow/.feather/.ipc file")
+        batch_size = opts["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive")
+
+        owner = User.objects.filter(username__iexact=opts["owner"]).first()
+        if not owner:
+            raise CommandError(f"Owner user '{opts['owner']}' not found")
+
+        writer = ProductFeedWriter(owner, reason="Parquet import/update", dry_run=opts["dry_run"])
+        counts = writer.counts
+        started = time.monotonic()
+        try:
+            with transaction.atomic():
+                for batch in columnar.read_batches(path, batch_size):
+                    writer.write(columnar.parse_batch(batch))
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(f"⏳ {counts['rows']:,} rows ({counts['rows'] / max(elapsed, 1e-9):,.0f} rows/s)")
+                if opts["deactivate_missing"]:
+                    writer.deactivate_missing()
+        except (ValueError, columnar.pa.ArrowException) as exc:
+            raise CommandError(f"Could not import {path}: {exc}")
+
+        elapsed = time.monotonic() - started
+        summary = (
+            "Created={created}, Changed={changed}, Unchanged={unchanged}, "
+            "Removed={removed}, PriceChanged={price_changed}".format(**counts)
+        )
+        rate = f"{counts['rows']:,} rows in {elapsed:.1f}s ({counts['rows'] / max(elapsed, 1e-9):,.0f} rows/s)"
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"🔍 DRY RUN - Would import {rate}: {summary}"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"✅ Imported {rate}: {summary}"))
@@ -0,0 +1,47 @@
+# backend/products/management/commands/process_imports.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.imports import IMPORT_CHUNK_SIZE, claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued catalog uploads (POST /api/products/import/); keep one or more running next to the web server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+        parser.add_argument("--poll", type=float, default=2.0, help="Seconds between queue checks (default: 2)")
+        parser.add_argument(
+            "--chunk-size", type=int, default=IMPORT_CHUNK_SIZE,
+            help=f"Rows per committed chunk (default: {IMPORT_CHUNK_SIZE})",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        self.stdout.write("⏳ Waiting for import jobs" + (" (until the queue is empty)" if opts["once"] else ""))
+        try:
+            while True:
+                job = claim_next_job()
+                if job is None:
+                    if opts["once"]:
+                        break
+                    time.sleep(opts["poll"])
+                    continue
+
+                self.stdout.write(f"📁 Import #{job.pk}: {job.original_name} for {job.owner.username}")
+                started = time.monotonic()
+                run_job(job, chunk_size=opts["chunk_size"])
+                elapsed = time.monotonic() - started
+                summary = ", ".join(f"{k}={v}" for k, v in job.counts.items())
+                if job.status == "done":
+                    self.stdout.write(self.style.SUCCESS(
+                        f"✅ Import #{job.pk}: {job.rows_processed:,} rows in {elapsed:.1f}s "
+                        f"({summary}, errors={job.error_count})"
+                    ))
+                else:
+                    self.stdout.write(self.style.ERROR(f"❌ Import #{job.pk} failed: {job.message}"))
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Stopped"))
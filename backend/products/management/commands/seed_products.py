@@ -1,6 +1,6 @@
 # backend/products/management/commands/seed_products.py - Fixed imports
 import csv
-from decimal import Decimal, InvalidOperation
+import time
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
@@ -8,61 +8,12 @@ from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.db import models  # ✅ Add this import
 
-from products.models import Product, ProductPriceHistory
+from products.feed import parse_parallel, parse_row, preview_item, read_header
+from products.models import Product
+from products.services import ProductFeedWriter
 
 User = get_user_model()
 
-CSV_HEADERS = [
-    "product_id", "name", "description", "cost_price", "selling_price",
-    "category", "stock_available", "units_sold", "customer_rating",
-    "demand_forecast", "optimized_price",
-]
-
-CATEGORY_MAP = {
-    "electronics": "electronics",
-    "grocery": "grocery", 
-    "stationery": "stationery",
-    "stationary": "stationery",  # Handle common typo
-    "outdoor & sports": "other",
-    "apparel": "other",
-    "home automation": "electronics",
-    "transportation": "other",
-    "wearables": "electronics",
-}
-
-def to_decimal(value, default="0"):
-    """Convert value to Decimal, handling empty/invalid values"""
-    if value is None or str(value).strip() == "":
-        value = default
-    try:
-        return Decimal(str(value))
-    except (InvalidOperation, ValueError, TypeError):
-        return Decimal(str(default))
-
-def to_int(value, default=0):
-    """Convert value to int, handling decimals and invalid values"""
-    try:
-        return int(float(str(value)))  # Handle "131244.0" format
-    except Exception:
-        return default
-
-def normalize_category(raw):
-    """Map CSV categories to our model choices"""
-    if not raw:
-        return "other"
-    key = str(raw).strip().lower()
-    return CATEGORY_MAP.get(key, "other")
-
-def make_sku(row):
-    """Generate SKU from product_id or name"""
-    pid = str(row.get("product_id") or "").strip()
-    name = str(row.get("name") or "").strip()
-    if pid:
-        return f"CSV-{pid}"
-    # Fallback: from name
-    base = "".join(ch for ch in name.upper() if ch.isalnum())
-    return f"CSV-{base or 'UNKNOWN'}"
-
 class Command(BaseCommand):
     help = "Import products from CSV with ALL fields: optimized_price, demand_forecast, customer_rating, etc."
 
@@ -71,143 +22,74 @@ class Command(BaseCommand):
         parser.add_argument("--owner", required=True, help="Username of supplier/admin owner")
         parser.add_argument("--dry-run", action="store_true", help="Parse only; don't write to DB")
         parser.add_argument("--preview", action="store_true", help="Show first 5 parsed rows")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows per chunk (default: 2000)")
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Parse the file in this many processes; rows are still written by one (default: 1)",
+        )
+        parser.add_argument(
+            "--deactivate-missing", action="store_true",
+            help="Deactivate the owner's products that are no longer in the feed",
+        )
 
     def handle(self, *args, **opts):
         csv_path = Path(opts["path"])
         if not csv_path.exists():
             raise CommandError(f"CSV not found: {csv_path}")
+        chunk_size = opts["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be positive")
+        if opts["workers"] < 1:
+            raise CommandError("--workers must be positive")
 
         owner = User.objects.filter(username__iexact=opts["owner"]).first()
         if not owner:
             raise CommandError(f"Owner user '{opts['owner']}' not found")
 
-        # Read CSV
-        with csv_path.open("r", newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-            if not reader.fieldnames:
-                raise CommandError("CSV has no header row.")
-            
-            self.stdout.write(f"📁 CSV Headers Found: {list(reader.fieldnames)}")
-            rows = list(reader)
-            self.stdout.write(f"📊 Found {len(rows)} data rows")
-
-        created = 0
-        updated = 0
-        price_changed = 0
+        writer = ProductFeedWriter(owner, dry_run=opts["dry_run"])
+        self.counts = writer.counts
         preview = []
-
-        try:
-            with transaction.atomic():
-                for i, raw in enumerate(rows, start=1):
-                    # Case-insensitive field mapping
-                    row = {k.strip().lower(): v for k, v in raw.items() if k}
-
-                    # Basic product info
-                    sku = make_sku(row)
-                    name = (row.get("name") or "").strip()
-                    description = (row.get("description") or "").strip()
-                    category = normalize_category(row.get("category"))
-
-                    # Parse ALL numeric fields from CSV
-                    base_price = to_decimal(row.get("cost_price"), "0")  # cost_price -> base_price
-                    current_price = to_decimal(row.get("selling_price"), "0")  # selling_price -> current_price
-                    optimized_price = to_decimal(row.get("optimized_price"), "0")  # ✅ From CSV
-                    
-                    # Stock and sales data
-                    stock_qty = to_int(row.get("stock_available"), 0)
-                    units_sold = to_int(row.get("units_sold"), 0)
-                    
-                    # Analytics fields
-                    customer_rating = to_int(row.get("customer_rating"), 0)  # ✅ From CSV
-                    demand_forecast = to_int(row.get("demand_forecast"), 0)  # ✅ From CSV
-
-                    # Set price bounds
-                    prices = [p for p in [base_price, current_price, optimized_price] if p > 0]
-                    min_price = min(prices) if prices else Decimal("0")
-                    max_price = max(prices) if prices else current_price
-
-                    # Ensure we have a valid current_price
-                    if current_price <= 0:
-                        current_price = base_price if base_price > 0 else Decimal("1.00")
-
-                    payload = {
-                        "owner": owner,
-                        "name": name,
-                        "description": description,
-                        "category": category,
-                        "base_price": base_price,
-                        "current_price": current_price,
-                        "min_price": min_price,
-                        "max_price": max_price,
-                        "optimized_price": optimized_price,  # ✅ Save optimized_price from CSV
-                        "stock_qty": stock_qty,
-                        "units_sold": units_sold,
-                        "customer_rating": max(0, min(5, customer_rating)),  # Ensure 0-5 range
-                        "demand_forecast": demand_forecast,  # ✅ Save demand_forecast from CSV
-                        "elasticity": 1.2,  # Default elasticity
-                        "is_active": True,
-                    }
-
-                    # Preview data
-                    if opts["preview"] and len(preview) < 5:
-                        preview.append({
-                            "sku": sku,
-                            "name": name,
-                            "category": category,
-                            "base_price": f"${base_price}",
-                            "current_price": f"${current_price}",
-                            "optimized_price": f"${optimized_price}",  # ✅ Show in preview
-                            "stock_qty": f"{stock_qty:,}",
-                            "units_sold": f"{units_sold:,}",
-                            "customer_rating": f"{customer_rating}/5",
-                            "demand_forecast": f"{demand_forecast:,}",  # ✅ Show in preview
-                        })
-
-                    # Create or update product
-                    try:
-                        obj = Product.objects.get(sku=sku)
-                        old_price = obj.current_price
-                        
-                        # Update all fields
-                        for k, v in payload.items():
-                            setattr(obj, k, v)
-                        obj.save()
-                        updated += 1
-
-                        # Track price changes
-                        if old_price != obj.current_price:
-                            ProductPriceHistory.objects.create(
-                                product=obj,
-                                old_price=old_price,
-                                new_price=obj.current_price,
-                                changed_by=owner,
-                                reason="CSV import/update",
-                            )
-                            price_changed += 1
-
-                    except Product.DoesNotExist:
-                        Product.objects.create(sku=sku, **payload)
-                        created += 1
-
-                if opts["dry_run"]:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"🔍 DRY RUN - Would create={created}, update={updated}, price_changed={price_changed}"
-                        )
-                    )
-                    if preview:
-                        self.stdout.write(self.style.HTTP_INFO("📋 Preview of data to import:"))
-                        for item in preview:
-                            self.stdout.write(f"  • {item}")
-                    raise CommandError("Dry run completed - no data saved")
-
-        except CommandError:
-            raise
+        started = time.monotonic()
+
+        with transaction.atomic():
+            chunk = []
+            for sku, payload in self.parse(csv_path, opts["workers"]):
+                if opts["preview"] and len(preview) < 5:
+                    preview.append(preview_item(sku, payload))
+                chunk.append((sku, payload))
+                if len(chunk) == chunk_size:
+                    writer.write(chunk)
+                    self.report_progress(started)
+                    chunk = []
+            if chunk:
+                writer.write(chunk)
+            if opts["deactivate_missing"]:
+                writer.deactivate_missing()
+
+        summary = (
+            "Created={created}, Changed={changed}, Unchanged={unchanged}, "
+            "Removed={removed}, PriceChanged={price_changed}".format(**self.counts)
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"📊 Processed {self.counts['rows']:,} data rows in {elapsed:.1f}s "
+                          f"({self.counts['rows'] / max(elapsed, 1e-9):,.0f} rows/s)")
+
+        if opts["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"🔍 DRY RUN - Would apply: {summary}"
+                )
+            )
+            if preview:
+                self.stdout.write(self.style.HTTP_INFO("📋 Preview of data to import:"))
+                for item in preview:
+                    self.stdout.write(f"  • {item}")
+            raise CommandError("Dry run completed - no data saved")
 
         # Success summary
         self.stdout.write(
             self.style.SUCCESS(
-                f"✅ Import completed! Created={created}, Updated={updated}, PriceChanged={price_changed}"
+                f"✅ Import completed! {summary}"
             )
         )
 
@@ -235,4 +117,30 @@ class Command(BaseCommand):
                 f"  • Average Customer Rating: {stats['avg_rating']:.1f}/5\n"
                 f"  • Average Optimization Savings: ${stats['avg_optimized_savings']:.2f}"
             )
-        )
\ No newline at end of file
+        )
+
+    def parse(self, csv_path, workers):
+        """Yield (sku, fields) for each row, in file order"""
+        if workers > 1:
+            # Byte ranges split on row boundaries, parsed in a process pool
+            fieldnames, start = read_header(csv_path)
+            if not fieldnames:
+                raise CommandError("CSV has no header row.")
+            self.stdout.write(f"📁 CSV Headers Found: {fieldnames}")
+            yield from parse_parallel(csv_path, fieldnames, start, workers)
+            return
+
+        # Stream the CSV: only one chunk of rows is held in memory at a time
+        with csv_path.open("r", newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames:
+                raise CommandError("CSV has no header row.")
+
+            self.stdout.write(f"📁 CSV Headers Found: {list(reader.fieldnames)}")
+            for raw in reader:
+                yield parse_row(raw)
+
+    def report_progress(self, started):
+        elapsed = time.monotonic() - started
+        rows = self.counts["rows"]
+        self.stdout.write(f"⏳ {rows:,} rows ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
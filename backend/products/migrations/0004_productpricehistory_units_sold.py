@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_product_customer_rating_product_demand_forecast_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productpricehistory",
+            name="units_sold",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_productpricehistory_units_sold"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["-updated_at", "-id"], name="product_updated_id_idx"
+            ),
+        ),
+    ]
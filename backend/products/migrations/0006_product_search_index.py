@@ -0,0 +1,90 @@
+# Full-text search index for ProductSearchFilter (products/search.py)
+#
+# On SQLite, a later migration that rebuilds products_product drops the three
+# triggers below without an error. Django rebuilds the table for most
+# AddField/AlterField/RemoveField operations; prefer a plain ALTER TABLE (see 0011).
+# The products.E001 system check reports missing triggers. To recreate them, add a
+# migration that runs the three CREATE TRIGGER statements from SQLITE_FORWARD and
+# then the final 'rebuild' insert, so rows written in the meantime are indexed.
+# PostgreSQL uses a generated column, which survives ALTER TABLE.
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE products_product_fts USING fts5(
+        name, sku, category, description,
+        content='products_product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    # Triggers rather than model signals so bulk_create/bulk_update/update() stay in sync too
+    """
+    CREATE TRIGGER products_product_fts_ai AFTER INSERT ON products_product BEGIN
+        INSERT INTO products_product_fts(rowid, name, sku, category, description)
+        VALUES (new.id, new.name, new.sku, new.category, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER products_product_fts_ad AFTER DELETE ON products_product BEGIN
+        INSERT INTO products_product_fts(products_product_fts, rowid, name, sku, category, description)
+        VALUES ('delete', old.id, old.name, old.sku, old.category, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER products_product_fts_au AFTER UPDATE OF name, sku, category, description
+    ON products_product BEGIN
+        INSERT INTO products_product_fts(products_product_fts, rowid, name, sku, category, description)
+        VALUES ('delete', old.id, old.name, old.sku, old.category, old.description);
+        INSERT INTO products_product_fts(rowid, name, sku, category, description)
+        VALUES (new.id, new.name, new.sku, new.category, new.description);
+    END
+    """,
+    "INSERT INTO products_product_fts(products_product_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS products_product_fts_au",
+    "DROP TRIGGER IF EXISTS products_product_fts_ad",
+    "DROP TRIGGER IF EXISTS products_product_fts_ai",
+    "DROP TABLE IF EXISTS products_product_fts",
+]
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE products_product ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(sku, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX products_product_search_gin ON products_product USING GIN (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS products_product_search_gin",
+    "ALTER TABLE products_product DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0005_product_updated_id_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:24
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0006_product_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                models.Case(
+                    models.When(
+                        current_price__gt=0,
+                        then=django.db.models.functions.comparison.Cast(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.expressions.CombinedExpression(
+                                    django.db.models.expressions.CombinedExpression(
+                                        models.F("current_price"),
+                                        "-",
+                                        models.F("base_price"),
+                                    ),
+                                    "*",
+                                    models.Value(100),
+                                ),
+                                "/",
+                                models.F("current_price"),
+                            ),
+                            models.FloatField(),
+                        ),
+                    ),
+                    default=models.Value(0.0),
+                    output_field=models.FloatField(),
+                ),
+                name="product_profit_margin_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                models.Case(
+                    models.When(
+                        stock_qty__gt=0,
+                        then=django.db.models.expressions.CombinedExpression(
+                            django.db.models.functions.comparison.Cast(
+                                models.F("units_sold"), models.FloatField()
+                            ),
+                            "/",
+                            models.F("stock_qty"),
+                        ),
+                    ),
+                    default=models.Value(0.0),
+                    output_field=models.FloatField(),
+                ),
+                name="product_stock_velocity_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                django.db.models.functions.comparison.Cast(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("optimized_price"), "*", models.F("demand_forecast")
+                    ),
+                    models.FloatField(),
+                ),
+                name="product_revenue_pot_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:32
+# Change log for delta sync (ProductChange), kept by triggers so bulk writes are covered too
+#
+# On SQLite, a later migration that rebuilds products_product drops these triggers
+# without an error (see 0006); the products.E001 system check reports them missing.
+# To recreate them, add a migration that runs SQLITE_FORWARD again. Then delete the
+# rows with deleted = 0 and run BACKFILL: every product gets a fresh seq, so clients
+# pick up changes made while the triggers were missing. Deletions from that window
+# are not recoverable.
+
+from django.db import migrations, models
+
+# Replacing the product's row (rather than updating it) hands out a fresh, higher seq
+SQLITE_FORWARD = [
+    """
+    CREATE TRIGGER products_productchange_ai AFTER INSERT ON products_product BEGIN
+        DELETE FROM products_productchange WHERE product_id = new.id;
+        INSERT INTO products_productchange(product_id, deleted) VALUES (new.id, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER products_productchange_au AFTER UPDATE ON products_product BEGIN
+        DELETE FROM products_productchange WHERE product_id = new.id;
+        INSERT INTO products_productchange(product_id, deleted) VALUES (new.id, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER products_productchange_ad AFTER DELETE ON products_product BEGIN
+        DELETE FROM products_productchange WHERE product_id = old.id;
+        INSERT INTO products_productchange(product_id, deleted) VALUES (old.id, 1);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS products_productchange_ad",
+    "DROP TRIGGER IF EXISTS products_productchange_au",
+    "DROP TRIGGER IF EXISTS products_productchange_ai",
+]
+
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION products_product_log_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM products_productchange WHERE product_id = OLD.id;
+            INSERT INTO products_productchange(product_id, deleted) VALUES (OLD.id, true);
+            RETURN OLD;
+        END IF;
+        DELETE FROM products_productchange WHERE product_id = NEW.id;
+        INSERT INTO products_productchange(product_id, deleted) VALUES (NEW.id, false);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER products_productchange_log AFTER INSERT OR UPDATE OR DELETE ON products_product
+    FOR EACH ROW EXECUTE FUNCTION products_product_log_change()
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP TRIGGER IF EXISTS products_productchange_log ON products_product",
+    "DROP FUNCTION IF EXISTS products_product_log_change()",
+]
+
+# Existing products enter the log oldest change first
+BACKFILL = """
+    INSERT INTO products_productchange(product_id, deleted)
+    SELECT id, %s FROM products_product ORDER BY updated_at, id
+"""
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+def backfill(apps, schema_editor):
+    schema_editor.execute(BACKFILL, [False])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0007_product_metric_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductChange",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                ("product_id", models.BigIntegerField(unique=True)),
+                ("deleted", models.BooleanField(default=False)),
+            ],
+            options={
+                "ordering": ["seq"],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0008_product_change_log"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="productpricehistory",
+            index=models.Index(
+                fields=["product", "-changed_at", "-id"],
+                name="pricehistory_product_time_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productpricehistory",
+            index=models.Index(
+                fields=["-changed_at", "-id"], name="pricehistory_time_idx"
+            ),
+        ),
+    ]
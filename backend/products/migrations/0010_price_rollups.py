@@ -0,0 +1,164 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:35
+# Daily price rollups (PriceRollup), kept by triggers so every history insert path is covered
+#
+# On SQLite, a later migration that rebuilds products_productpricehistory drops the
+# trigger without an error (see 0006); the products.E001 system check reports it
+# missing. To recreate it, add a migration that runs SQLITE_FORWARD again. Then empty
+# products_pricerollup and run backfill() to roll up history written in the meantime.
+
+import datetime
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Upsert the day's row. Comparing timestamps keeps open/close right even if a
+# history row arrives out of order.
+SQLITE_FORWARD = [
+    """
+    CREATE TRIGGER products_pricerollup_ai AFTER INSERT ON products_productpricehistory BEGIN
+        INSERT INTO products_pricerollup(
+            product_id, day, open, high, low, close, changes, first_changed_at, last_changed_at
+        ) VALUES (
+            new.product_id, date(new.changed_at), new.old_price,
+            max(new.old_price, new.new_price), min(new.old_price, new.new_price), new.new_price,
+            1, new.changed_at, new.changed_at
+        )
+        ON CONFLICT(product_id, day) DO UPDATE SET
+            open = CASE WHEN excluded.first_changed_at < first_changed_at THEN excluded.open ELSE open END,
+            close = CASE WHEN excluded.last_changed_at >= last_changed_at THEN excluded.close ELSE close END,
+            high = max(high, excluded.high),
+            low = min(low, excluded.low),
+            changes = changes + 1,
+            first_changed_at = min(first_changed_at, excluded.first_changed_at),
+            last_changed_at = max(last_changed_at, excluded.last_changed_at);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS products_pricerollup_ai",
+]
+
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION products_pricehistory_rollup() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO products_pricerollup AS r (
+            product_id, day, open, high, low, close, changes, first_changed_at, last_changed_at
+        ) VALUES (
+            NEW.product_id, (NEW.changed_at AT TIME ZONE 'UTC')::date, NEW.old_price,
+            GREATEST(NEW.old_price, NEW.new_price), LEAST(NEW.old_price, NEW.new_price), NEW.new_price,
+            1, NEW.changed_at, NEW.changed_at
+        )
+        ON CONFLICT (product_id, day) DO UPDATE SET
+            open = CASE WHEN EXCLUDED.first_changed_at < r.first_changed_at THEN EXCLUDED.open ELSE r.open END,
+            close = CASE WHEN EXCLUDED.last_changed_at >= r.last_changed_at THEN EXCLUDED.close ELSE r.close END,
+            high = GREATEST(r.high, EXCLUDED.high),
+            low = LEAST(r.low, EXCLUDED.low),
+            changes = r.changes + 1,
+            first_changed_at = LEAST(r.first_changed_at, EXCLUDED.first_changed_at),
+            last_changed_at = GREATEST(r.last_changed_at, EXCLUDED.last_changed_at);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER products_pricerollup_log AFTER INSERT ON products_productpricehistory
+    FOR EACH ROW EXECUTE FUNCTION products_pricehistory_rollup()
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP TRIGGER IF EXISTS products_pricerollup_log ON products_productpricehistory",
+    "DROP FUNCTION IF EXISTS products_pricehistory_rollup()",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+def backfill(apps, schema_editor):
+    """Roll up existing history, one product-day at a time, in insert order"""
+    ProductPriceHistory = apps.get_model("products", "ProductPriceHistory")
+    PriceRollup = apps.get_model("products", "PriceRollup")
+    rows = (
+        ProductPriceHistory.objects.order_by("product_id", "changed_at", "id")
+        .values_list("product_id", "old_price", "new_price", "changed_at")
+    )
+    batch, current = [], None
+    for product_id, old_price, new_price, changed_at in rows.iterator(chunk_size=5000):
+        day = changed_at.astimezone(datetime.timezone.utc).date()
+        if current is None or (current.product_id, current.day) != (product_id, day):
+            current = PriceRollup(
+                product_id=product_id, day=day, open=old_price,
+                high=max(old_price, new_price), low=min(old_price, new_price), close=new_price,
+                changes=0, first_changed_at=changed_at, last_changed_at=changed_at,
+            )
+            batch.append(current)
+        current.high = max(current.high, new_price)
+        current.low = min(current.low, new_price)
+        current.close = new_price
+        current.changes += 1
+        current.last_changed_at = changed_at
+        if len(batch) >= 5000:
+            PriceRollup.objects.bulk_create(batch[:-1])
+            batch = batch[-1:]
+    PriceRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0009_price_history_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("open", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("high", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("low", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("close", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("changes", models.PositiveIntegerField(default=0)),
+                ("first_changed_at", models.DateTimeField()),
+                ("last_changed_at", models.DateTimeField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_rollups",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["product", "day"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pricerollup",
+            constraint=models.UniqueConstraint(
+                fields=("product", "day"), name="uniq_pricerollup_product_day"
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
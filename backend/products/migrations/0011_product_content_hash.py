@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:51
+# Existing products get their hash on their next write; until then an import counts them as changed
+
+from django.db import migrations, models
+
+# On SQLite, AddField with a default rebuilds the table, which silently drops the
+# triggers on products_product (0006 search index, 0008 change log). A plain
+# ADD COLUMN keeps them.
+SQLITE_FORWARD = "ALTER TABLE products_product ADD COLUMN content_hash varchar(32) NOT NULL DEFAULT ''"
+SQLITE_BACKWARD = "ALTER TABLE products_product DROP COLUMN content_hash"
+
+
+def _field():
+    field = models.CharField(blank=True, default="", editable=False, max_length=32)
+    field.set_attributes_from_name("content_hash")
+    return field
+
+
+def add_column(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(SQLITE_FORWARD)
+    else:
+        schema_editor.add_field(apps.get_model("products", "Product"), _field())
+
+
+def drop_column(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(SQLITE_BACKWARD)
+    else:
+        schema_editor.remove_field(apps.get_model("products", "Product"), _field())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0010_price_rollups"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(add_column, drop_column)],
+            state_operations=[
+                migrations.AddField(
+                    model_name="product",
+                    name="content_hash",
+                    field=models.CharField(
+                        blank=True, default="", editable=False, max_length=32
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:05
+# Commit-ordered change feed cursor: on PostgreSQL the change log records the writing transaction
+
+from django.db import migrations, models
+
+# A seq is taken when the row is written, not when its transaction commits, so
+# on PostgreSQL a later seq can become visible before an earlier one. The log
+# also records the transaction id; the feed pages in (txid, seq) order and only
+# returns transactions older than every one still running (see
+# ProductChange.page_after). On SQLite, writes are serialized, seq is already
+# commit order and txid stays 0.
+POSTGRES_FORWARD = [
+    """
+    CREATE OR REPLACE FUNCTION products_product_log_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM products_productchange WHERE product_id = OLD.id;
+            INSERT INTO products_productchange(product_id, deleted, txid) VALUES (OLD.id, true, txid_current());
+            RETURN OLD;
+        END IF;
+        DELETE FROM products_productchange WHERE product_id = NEW.id;
+        INSERT INTO products_productchange(product_id, deleted, txid) VALUES (NEW.id, false, txid_current());
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+# 0008's version of the function
+POSTGRES_BACKWARD = [
+    """
+    CREATE OR REPLACE FUNCTION products_product_log_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM products_productchange WHERE product_id = OLD.id;
+            INSERT INTO products_productchange(product_id, deleted) VALUES (OLD.id, true);
+            RETURN OLD;
+        END IF;
+        DELETE FROM products_productchange WHERE product_id = NEW.id;
+        INSERT INTO products_productchange(product_id, deleted) VALUES (NEW.id, false);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+
+# AddField would rebuild products_productchange on SQLite, which the triggers on
+# products_product refer to; a plain ADD COLUMN leaves them alone
+SQLITE_FORWARD = "ALTER TABLE products_productchange ADD COLUMN txid bigint NOT NULL DEFAULT 0"
+SQLITE_BACKWARD = "ALTER TABLE products_productchange DROP COLUMN txid"
+
+
+def _field():
+    field = models.BigIntegerField(default=0)
+    field.set_attributes_from_name("txid")
+    return field
+
+
+def add_column(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(SQLITE_FORWARD)
+    else:
+        schema_editor.add_field(apps.get_model("products", "ProductChange"), _field())
+
+
+def drop_column(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(SQLITE_BACKWARD)
+    else:
+        schema_editor.remove_field(apps.get_model("products", "ProductChange"), _field())
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0012_product_import_jobs"),
+    ]
+
+    operations = [
+        # Existing rows keep txid 0: all committed, so they sort before any new change
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(add_column, drop_column)],
+            state_operations=[
+                migrations.AddField(
+                    model_name="productchange",
+                    name="txid",
+                    field=models.BigIntegerField(default=0),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productchange",
+            index=models.Index(fields=["txid", "seq"], name="products_change_txid_seq_idx"),
+        ),
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD}),
+            _run({"postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:22
+# Metric indexes with their constants inlined (SQLLiteral), so SQLite matches them to queries
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.lookups
+import products.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0013_productchange_txid"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="product",
+            name="product_profit_margin_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="product_stock_velocity_idx",
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                models.Case(
+                    models.When(
+                        django.db.models.lookups.GreaterThan(
+                            models.F("current_price"), products.models.SQLLiteral(0)
+                        ),
+                        then=django.db.models.functions.comparison.Cast(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.expressions.CombinedExpression(
+                                    django.db.models.expressions.CombinedExpression(
+                                        models.F("current_price"),
+                                        "-",
+                                        models.F("base_price"),
+                                    ),
+                                    "*",
+                                    products.models.SQLLiteral(100.0),
+                                ),
+                                "/",
+                                models.F("current_price"),
+                            ),
+                            models.FloatField(),
+                        ),
+                    ),
+                    default=products.models.SQLLiteral(0.0),
+                    output_field=models.FloatField(),
+                ),
+                name="product_profit_margin_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                models.Case(
+                    models.When(
+                        django.db.models.lookups.GreaterThan(
+                            models.F("stock_qty"), products.models.SQLLiteral(0)
+                        ),
+                        then=django.db.models.expressions.CombinedExpression(
+                            django.db.models.functions.comparison.Cast(
+                                models.F("units_sold"), models.FloatField()
+                            ),
+                            "/",
+                            models.F("stock_qty"),
+                        ),
+                    ),
+                    default=products.models.SQLLiteral(0.0),
+                    output_field=models.FloatField(),
+                ),
+                name="product_stock_velocity_idx",
+            ),
+        ),
+    ]
@@ -1,9 +1,74 @@
 # products/models.py - Updated with auto-optimization for new products
-from django.db import models
+import hashlib
+import re
+from decimal import Decimal
+
+from django.db import connection, models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
 from django.contrib.auth import get_user_model
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
 
 User = get_user_model()
 
+
+@deconstructible(path="products.models.SQLLiteral")
+class SQLLiteral(Value):
+    """
+    A numeric constant written into the SQL instead of bound as a parameter.
+    SQLite only uses an expression index when the query spells the expression
+    the same way, and a bound `?` never matches the literal in the index.
+    """
+
+    def __init__(self, value, output_field=None):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"SQLLiteral takes an int or float, not {value!r}")
+        super().__init__(value, output_field)
+
+    def as_sql(self, compiler, connection):
+        return repr(self.value), []
+
+
+# Computed metrics as SQL expressions. The same expressions back the functional
+# indexes on Product, so filtering/ordering on the annotations can use them.
+# Constants are SQLLiterals so the query matches the index on SQLite too.
+def profit_margin_expression():
+    return Case(
+        When(GreaterThan(F("current_price"), SQLLiteral(0)), then=Cast(
+            (F("current_price") - F("base_price")) * SQLLiteral(100.0) / F("current_price"), models.FloatField(),
+        )),
+        default=SQLLiteral(0.0),
+        output_field=models.FloatField(),
+    )
+
+
+def stock_velocity_expression():
+    return Case(
+        When(GreaterThan(F("stock_qty"), SQLLiteral(0)), then=Cast(F("units_sold"), models.FloatField()) / F("stock_qty")),
+        default=SQLLiteral(0.0),
+        output_field=models.FloatField(),
+    )
+
+
+def revenue_potential_expression():
+    return Cast(F("optimized_price") * F("demand_forecast"), models.FloatField())
+
+
+METRIC_EXPRESSIONS = {
+    "profit_margin": profit_margin_expression,
+    "stock_velocity": stock_velocity_expression,
+    "revenue_potential": revenue_potential_expression,
+}
+
+
+class ProductQuerySet(models.QuerySet):
+    def with_metrics(self):
+        """Annotate profit_margin, stock_velocity and revenue_potential in SQL"""
+        return self.annotate(**{name: expr() for name, expr in METRIC_EXPRESSIONS.items()})
+
+
 class Product(models.Model):
     CATEGORY_CHOICES = [
         ("stationery", "Stationery"),
@@ -39,6 +104,17 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fingerprint of CONTENT_FIELDS as stored; feed imports compare it to skip unchanged rows
+    content_hash = models.CharField(max_length=32, blank=True, default="", editable=False)
+
+    objects = ProductQuerySet.as_manager()
+
+    CONTENT_FIELDS = (
+        "owner_id", "name", "description", "category", "base_price", "current_price",
+        "min_price", "max_price", "optimized_price", "stock_qty", "units_sold",
+        "customer_rating", "demand_forecast", "is_active",
+    )
+
     class Meta:
         ordering = ["-updated_at"]
         indexes = [
@@ -46,6 +122,12 @@ class Product(models.Model):
             models.Index(fields=["category"]),
             models.Index(fields=["owner"]),
             models.Index(fields=["demand_forecast"]),
+            # Keyset pagination key (commons.pagination.KeysetPagination)
+            models.Index(fields=["-updated_at", "-id"], name="product_updated_id_idx"),
+            # Back ?ordering= / range filters on the with_metrics() annotations
+            models.Index(profit_margin_expression(), name="product_profit_margin_idx"),
+            models.Index(stock_velocity_expression(), name="product_stock_velocity_idx"),
+            models.Index(revenue_potential_expression(), name="product_revenue_pot_idx"),
         ]
 
     def __str__(self):
@@ -108,7 +190,8 @@ class Product(models.Model):
         
         return round(float(optimized), 2)
 
-    def save(self, *args, **kwargs):
+    def fill_defaults(self):
+        """Defaults applied on save; bulk writes call this themselves since they skip save()"""
         # Auto-generate SKU if not provided
         if not self.sku:
             import uuid
@@ -118,24 +201,48 @@ class Product(models.Model):
         # CSV products already have optimized_price set during import
         if not self.optimized_price or self.optimized_price == 0:
             self.optimized_price = self.calculate_optimized_price()
-        
+
+        self.content_hash = self.compute_content_hash()
+
+    def compute_content_hash(self):
+        """Hash of CONTENT_FIELDS, with amounts rounded to cents as the database stores them"""
+        values = []
+        for name in self.CONTENT_FIELDS:
+            value = getattr(self, name)
+            # By field type, so an unsaved int 0 hashes like the Decimal("0.00") read back
+            if value is not None and isinstance(self._meta.get_field(name), models.DecimalField):
+                value = Decimal(str(value)).quantize(Decimal("0.01"))
+            values.append(str(value))
+        return hashlib.blake2b("\x1f".join(values).encode(), digest_size=16).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.fill_defaults()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "content_hash"}
         super().save(*args, **kwargs)
 
-    @property
+        # Saved values may have changed; recompute metrics on next access
+        for name in METRIC_EXPRESSIONS:
+            self.__dict__.pop(name, None)
+
+    # Metrics below are overridden by ProductQuerySet.with_metrics() annotations;
+    # the Python versions cover instances that weren't loaded through it.
+
+    @cached_property
     def profit_margin(self):
         """Calculate profit margin percentage"""
         if self.current_price > 0:
-            return ((self.current_price - self.base_price) / self.current_price) * 100
-        return 0
+            return float((self.current_price - self.base_price) * 100 / self.current_price)
+        return 0.0
 
-    @property
+    @cached_property
     def stock_velocity(self):
         """Calculate how fast product sells (units_sold / stock_qty)"""
         if self.stock_qty > 0:
             return self.units_sold / self.stock_qty
-        return 0
+        return 0.0
 
-    @property
+    @cached_property
     def revenue_potential(self):
         """Calculate potential revenue from demand forecast"""
         return float(self.optimized_price * self.demand_forecast)
@@ -159,7 +266,151 @@ class ProductPriceHistory(models.Model):
     new_price = models.DecimalField(max_digits=10, decimal_places=2)
     changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     reason = models.CharField(max_length=200, blank=True)
+    # Product.units_sold when the change was recorded; consecutive snapshots give
+    # the sales that followed each price (null for rows recorded before tracking)
+    units_sold = models.PositiveIntegerField(null=True, blank=True)
     changed_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["-changed_at"]
\ No newline at end of file
+        ordering = ["-changed_at"]
+        indexes = [
+            # Per-product history, newest first, keyset-paginated and range-filtered
+            models.Index(fields=["product", "-changed_at", "-id"], name="pricehistory_product_time_idx"),
+            # Cross-product feed (newest first across a catalog slice)
+            models.Index(fields=["-changed_at", "-id"], name="pricehistory_time_idx"),
+        ]
+
+class ProductChange(models.Model):
+    """
+    Change log behind GET /api/products/changes/ (delta sync).
+
+    One row per product that ever existed. Database triggers (migrations 0008,
+    0013) replace a product's row on every insert, update or delete, so a
+    client holding the last position it saw needs just the rows after it.
+    There is no foreign key: the row outlives the product as its tombstone.
+
+    Positions are (txid, seq). A seq is taken when the row is written, not
+    when its transaction commits, so on PostgreSQL seq 100 can become visible
+    after seq 101; the triggers record the writing transaction in `txid` and
+    page_after() only returns changes of transactions older than every one still
+    running. SQLite serializes writes, so there seq is commit order and txid is 0.
+    """
+    seq = models.BigAutoField(primary_key=True)
+    product_id = models.BigIntegerField(unique=True)
+    deleted = models.BooleanField(default=False)
+    txid = models.BigIntegerField(default=0)  # writing transaction (PostgreSQL)
+
+    class Meta:
+        ordering = ["seq"]
+        indexes = [
+            models.Index(fields=["txid", "seq"], name="products_change_txid_seq_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} product {self.product_id}{' (deleted)' if self.deleted else ''}"
+
+    @staticmethod
+    def format_cursor(txid, seq):
+        """Opaque feed cursor; a plain seq while txid is 0 (SQLite, changes logged before 0013)"""
+        return f"{txid}-{seq}" if txid else str(seq)
+
+    @staticmethod
+    def parse_cursor(value):
+        """(txid, seq) from format_cursor(); ValueError if malformed"""
+        match = re.fullmatch(r"(?:(\d+)-)?(\d+)", value)
+        if match is None:
+            raise ValueError(f"Invalid cursor: {value!r}")
+        return int(match[1] or 0), int(match[2])
+
+    @classmethod
+    def page_after(cls, txid, seq, limit):
+        """
+        Up to `limit` (txid, seq, product_id) rows after the position, in commit
+        order. On PostgreSQL, rows of transactions at or past the oldest one still
+        running are held back: that transaction may yet commit changes that sort
+        before them. Those rows come in a later call.
+        """
+        rows = cls.objects.filter(models.Q(txid__gt=txid) | models.Q(txid=txid, seq__gt=seq))
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+                rows = rows.filter(txid__lt=cursor.fetchone()[0])
+        return list(rows.order_by("txid", "seq").values_list("txid", "seq", "product_id")[:limit])
+
+
+class PriceRollup(models.Model):
+    """
+    Daily open/high/low/close of a product's price, kept up to date by database
+    triggers (migration 0010) as ProductPriceHistory rows are appended. Weekly and
+    monthly rollups are built from these rows, so charts cost one row per day
+    with changes instead of one per change.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="price_rollups")
+    day = models.DateField()  # UTC
+    open = models.DecimalField(max_digits=10, decimal_places=2)  # price before the day's first change
+    high = models.DecimalField(max_digits=10, decimal_places=2)
+    low = models.DecimalField(max_digits=10, decimal_places=2)
+    close = models.DecimalField(max_digits=10, decimal_places=2)
+    changes = models.PositiveIntegerField(default=0)
+    first_changed_at = models.DateTimeField()
+    last_changed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["product", "day"]
+        constraints = [
+            models.UniqueConstraint(fields=["product", "day"], name="uniq_pricerollup_product_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} {self.day}: {self.open}/{self.high}/{self.low}/{self.close}"
+
+
+class ProductImportJob(models.Model):
+    """
+    A catalog upload (POST /api/products/import/) queued for the import worker
+    (`python manage.py process_imports`). The table is the queue: the worker
+    claims the oldest queued job with a conditional UPDATE, commits progress
+    after every chunk, and requeues jobs whose heartbeat stopped.
+    """
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+    FORMAT_CHOICES = [
+        ("csv", "CSV"),
+        ("parquet", "Parquet"),
+        ("arrow", "Arrow IPC"),
+    ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="import_jobs")  # owner of the products
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="+")
+    file_path = models.CharField(max_length=500)
+    original_name = models.CharField(max_length=255, blank=True, default="")
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    size_bytes = models.BigIntegerField(default=0)
+    deactivate_missing = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_total = models.PositiveIntegerField(null=True, blank=True)  # unknown for CSV until done
+    progress = models.FloatField(default=0)  # percent
+    counts = models.JSONField(default=dict)
+    errors = models.JSONField(default=list)  # first MAX_FEED_ERRORS row errors
+    error_count = models.PositiveIntegerField(default=0)
+    message = models.TextField(blank=True, default="")  # why the job failed
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "id"], name="importjob_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"Import #{self.pk} ({self.status}) {self.original_name}"
@@ -0,0 +1,56 @@
+# backend/products/rollups.py
+import datetime
+
+from .models import PriceRollup
+
+PERIODS = ("day", "week", "month")
+
+
+def period_start(day, period):
+    """First day of the bucket `day` falls in; weeks start on Monday"""
+    if period == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def price_rollups(product_ids, period="day", start=None, end=None):
+    """
+    {product_id: [{"start", "open", "high", "low", "close", "changes"}, ...]}
+    from the daily PriceRollup rows. Weeks and months merge their days in order:
+    open of the first, close of the last, extremes and change counts over all.
+    Only days with changes produce buckets. Prices are strings, as in the serializers.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of: {', '.join(PERIODS)}")
+
+    rows = PriceRollup.objects.filter(product_id__in=product_ids)
+    if start is not None:
+        rows = rows.filter(day__gte=start)
+    if end is not None:
+        rows = rows.filter(day__lte=end)
+    rows = rows.order_by("product_id", "day").values_list(
+        "product_id", "day", "open", "high", "low", "close", "changes",
+    )
+
+    result = {pid: [] for pid in product_ids}
+    bucket = None
+    for product_id, day, open_, high, low, close, changes in rows:
+        key = period_start(day, period)
+        buckets = result[product_id]
+        if bucket is None or bucket["product_id"] != product_id or bucket["start"] != key:
+            bucket = {"product_id": product_id, "start": key, "open": open_, "high": high,
+                      "low": low, "close": close, "changes": 0}
+            buckets.append(bucket)
+        bucket["high"] = max(bucket["high"], high)
+        bucket["low"] = min(bucket["low"], low)
+        bucket["close"] = close
+        bucket["changes"] += changes
+
+    for buckets in result.values():
+        for b in buckets:
+            del b["product_id"]
+            for key in ("open", "high", "low", "close"):
+                b[key] = f"{b[key]:.2f}"
+    return result
@@ -0,0 +1,66 @@
+# backend/products/search.py
+import re
+
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+FTS_TABLE = "products_product_fts"
+
+# Column weights, in FTS5 column order: name, sku, category, description
+FTS_WEIGHTS = "10.0, 10.0, 2.0, 1.0"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_tokens(text):
+    """Words from user input; punctuation and query operators are dropped"""
+    return TOKEN_RE.findall(text or "")[:10]
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    """
+    ?search= backed by a full-text index instead of icontains scans.
+
+    - SQLite: FTS5 table products_product_fts, kept in sync with triggers
+    - PostgreSQL: generated tsvector column search_vector with a GIN index
+    - anything else: DRF's SearchFilter over view.search_fields
+
+    Every word is matched as a prefix (all must match) across name, sku,
+    category and description. Results are annotated with search_rank (higher
+    is better) and ordered by it unless the client passes ?ordering=.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        tokens = search_tokens(request.query_params.get(self.search_param, ""))
+        if not tokens:
+            return queryset
+
+        vendor = connections[queryset.db].vendor
+        table = queryset.model._meta.db_table
+        if vendor == "sqlite":
+            match = " ".join(f'"{t}"*' for t in tokens)
+            queryset = queryset.extra(
+                tables=[FTS_TABLE],
+                where=[f"{FTS_TABLE}.rowid = {table}.id", f"{FTS_TABLE} MATCH %s"],
+                params=[match],
+            ).annotate(
+                search_rank=RawSQL(f"-bm25({FTS_TABLE}, {FTS_WEIGHTS})", (), output_field=FloatField()),
+            )
+        elif vendor == "postgresql":
+            tsquery = " & ".join(f"{t}:*" for t in tokens)
+            queryset = queryset.extra(
+                where=[f"{table}.search_vector @@ to_tsquery('simple', %s)"],
+                params=[tsquery],
+            ).annotate(
+                search_rank=RawSQL(
+                    f"ts_rank({table}.search_vector, to_tsquery('simple', %s))",
+                    (tsquery,),
+                    output_field=FloatField(),
+                ),
+            )
+        else:
+            return super().filter_queryset(request, queryset, view)
+
+        return queryset.order_by("-search_rank")
@@ -1,11 +1,19 @@
 # products/serializers.py - Updated to include all CSV fields
+import decimal
+from operator import attrgetter
+
 from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.settings import api_settings
 from django.contrib.auth import get_user_model
-from .models import Product, ProductPriceHistory
+from django.utils.functional import cached_property
+
+from commons.serializers import SparseFieldsMixin
+from .models import Product, ProductImportJob, ProductPriceHistory
 
 User = get_user_model()
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     owner_username = serializers.CharField(source="owner.username", read_only=True)
     owner_id = serializers.IntegerField(source="owner.id", read_only=True)
     
@@ -18,7 +26,7 @@ class ProductSerializer(serializers.ModelSerializer):
         model = Product
         fields = [
             "id", "owner", "owner_id", "owner_username",
-            "name", "category", "description",
+            "name", "sku", "category", "description",
             
             # Price fields
             "base_price", "current_price", "min_price", "max_price",
@@ -39,11 +47,21 @@ class ProductSerializer(serializers.ModelSerializer):
             "is_active", "created_at", "updated_at",
         ]
         read_only_fields = [
-            "owner", "owner_id", "owner_username", 
+            "owner", "owner_id", "owner_username", "sku",
             "created_at", "updated_at",
             "profit_margin", "stock_velocity", "revenue_potential"
         ]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # ?as_of= reads: the price at that time, annotated by ProductViewSet
+        request = self.context.get("request")
+        if request is not None and request.query_params.get("as_of"):
+            fields["price_as_of"] = serializers.DecimalField(
+                max_digits=10, decimal_places=2, read_only=True, allow_null=True,
+            )
+        return fields
+
     def validate(self, attrs):
         """Validate price relationships and ratings"""
         min_p = attrs.get("min_price", getattr(self.instance, "min_price", 0))
@@ -72,7 +90,104 @@ class ProductSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class ProductPriceHistorySerializer(serializers.ModelSerializer):
+def _fast_representation(field):
+    """
+    Specialized to_representation for the field types that dominate product rows.
+    Returns field.to_representation itself whenever a field is configured in a way
+    the fast versions don't reproduce exactly.
+    """
+    if isinstance(field, serializers.DecimalField):
+        coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        if field.decimal_places is None or field.normalize_output or field.localize or not coerce:
+            return field.to_representation
+        exponent = decimal.Decimal(".1") ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+
+        def decimal_repr(value):
+            if not isinstance(value, decimal.Decimal):
+                return field.to_representation(value)
+            return f"{value.quantize(exponent, rounding=field.rounding, context=context):f}"
+        return decimal_repr
+
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != ISO_8601:
+            return field.to_representation
+        tz = getattr(field, "timezone", None) or field.default_timezone()
+
+        def datetime_repr(value):
+            if tz is None or value.tzinfo is None:
+                return field.to_representation(value)
+            value = value.astimezone(tz).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+        return datetime_repr
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return lambda value: value
+    if type(field) in (serializers.ReadOnlyField, serializers.BooleanField):
+        return field.to_representation
+    if type(field) is serializers.CharField:
+        return str
+    if type(field) is serializers.IntegerField:
+        return int
+    if type(field) is serializers.FloatField:
+        return float
+    return field.to_representation
+
+
+class ProductListSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer for product lists with the same output as ProductSerializer.
+
+    ProductSerializer's fields are walked once per serializer instance (not per
+    row) and compiled into (name, getter, to_representation) triples, so a row
+    costs one attribute lookup and one conversion per field. Foreign keys are
+    read from the <name>_id column, as DRF does for pk-only relations.
+    Sparse fieldsets (?fields= / ?omit=) apply through the template serializer.
+    """
+
+    template_class = ProductSerializer
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._accessors = None
+
+    @cached_property
+    def template(self):
+        return self.template_class(context=self.context)
+
+    @property
+    def fields(self):
+        return self.template.fields
+
+    def get_sparse_names(self):
+        return self.template.get_sparse_names()
+
+    def get_accessors(self):
+        if self._accessors is None:
+            accessors = []
+            for name, field in self.fields.items():
+                if field.write_only:
+                    continue
+                if isinstance(field, serializers.PrimaryKeyRelatedField) and len(field.source_attrs) == 1:
+                    getter = attrgetter(f"{field.source}_id")
+                else:
+                    getter = attrgetter(".".join(field.source_attrs))
+                accessors.append((name, getter, _fast_representation(field)))
+            self._accessors = accessors
+        return self._accessors
+
+    def to_representation(self, instance):
+        data = {}
+        for name, getter, represent in self.get_accessors():
+            value = getter(instance)
+            data[name] = None if value is None else represent(value)
+        return data
+
+
+class ProductPriceHistorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     product_sku = serializers.CharField(source="product.sku", read_only=True)
     product_name = serializers.CharField(source="product.name", read_only=True)
     changed_by_username = serializers.CharField(source="changed_by.username", read_only=True)
@@ -85,4 +200,19 @@ class ProductPriceHistorySerializer(serializers.ModelSerializer):
             "changed_by", "changed_by_username",
             "reason", "changed_at"
         ]
-        read_only_fields = ["changed_at", "changed_by"]
\ No newline at end of file
+        read_only_fields = ["changed_at", "changed_by"]
+
+
+class ProductImportJobSerializer(serializers.ModelSerializer):
+    owner_username = serializers.CharField(source="owner.username", read_only=True)
+
+    class Meta:
+        model = ProductImportJob
+        fields = [
+            "id", "status", "format", "original_name", "size_bytes",
+            "owner", "owner_username", "created_by", "deactivate_missing",
+            "rows_processed", "rows_total", "progress", "counts",
+            "error_count", "errors", "message",
+            "created_at", "started_at", "finished_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,371 @@
+# backend/products/services.py
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from commons.permissions import is_admin_user
+from .models import Product, ProductPriceHistory
+from .serializers import ProductSerializer
+
+User = get_user_model()
+
+BATCH_OPS = ("create", "update", "delete")
+MAX_BATCH_SIZE = 5000
+
+# Columns a feed import overwrites on existing products (never the owner). Rows
+# without an elasticity (CSV feeds) keep the stored one.
+FEED_UPDATE_FIELDS = [
+    "name", "description", "category", "base_price", "current_price",
+    "min_price", "max_price", "optimized_price", "stock_qty", "units_sold",
+    "customer_rating", "demand_forecast", "is_active", "elasticity", "content_hash", "updated_at",
+]
+
+# Row errors kept per import (the rest are only counted)
+MAX_FEED_ERRORS = 100
+MAX_POSITIVE_INT = 2147483647
+
+
+def feed_row_errors(sku, fields):
+    """{field: message} for parsed feed values that Product's columns can't hold"""
+    errors = {}
+    opts = Product._meta
+    for name, value in (("sku", sku), *fields.items()):
+        field = opts.get_field(name)
+        if isinstance(field, models.CharField) and field.max_length and len(value) > field.max_length:
+            errors[name] = f"At most {field.max_length} characters"
+        elif isinstance(field, models.DecimalField):
+            limit = Decimal(10) ** (field.max_digits - field.decimal_places)
+            if abs(value) >= limit or abs(round(value, field.decimal_places)) >= limit:
+                errors[name] = f"Must be less than {limit:,}"
+        elif isinstance(field, models.PositiveIntegerField) and not 0 <= value <= MAX_POSITIVE_INT:
+            errors[name] = f"Must be between 0 and {MAX_POSITIVE_INT}"
+    return errors
+
+
+class ProductBatchService:
+    """
+    Batch create/update/delete of products (POST /api/products/batch/).
+
+    Every operation is validated with ProductSerializer's rules first; targets
+    and owners are loaded with one query each. Nothing is written unless every
+    operation is valid, and then everything is written with bulk_create/
+    bulk_update/delete plus bulk price-history inserts. run() does both in one
+    transaction, with the targets locked from the ownership check to the write.
+    """
+
+    @staticmethod
+    def run(operations, user, context=None, reason=""):
+        """Validate and apply a batch atomically; returns (applied, results)"""
+        with transaction.atomic():
+            plan, results = ProductBatchService.validate(operations, user, context)
+            if any(r["status"] == "error" for r in results):
+                return False, results
+            return True, ProductBatchService.apply(plan, results, user, reason=reason)
+
+    @staticmethod
+    def validate(operations, user, context=None):
+        """
+        Returns (plan, results). `results` has one dict per operation; any with
+        status "error" means the batch must not be applied. Update/delete targets
+        are loaded with select_for_update(), so call this inside the transaction
+        that applies the plan (see run()).
+        """
+        results = [{"index": i, "op": op.get("op") if isinstance(op, dict) else None}
+                   for i, op in enumerate(operations)]
+        plan = {"create": [], "update": [], "delete": []}
+
+        def fail(i, errors):
+            results[i]["status"] = "error"
+            results[i]["errors"] = errors
+
+        # One query for every product the batch touches
+        ids, seen = {}, set()
+        for i, op in enumerate(operations):
+            if not isinstance(op, dict) or op.get("op") not in BATCH_OPS:
+                fail(i, {"op": f"Choose one of: {', '.join(BATCH_OPS)}"})
+                continue
+            if op["op"] == "create":
+                continue
+            try:
+                pk = int(op.get("id"))
+            except (TypeError, ValueError):
+                fail(i, {"id": "A valid product id is required"})
+                continue
+            if pk in seen:
+                fail(i, {"id": "Product appears more than once in the batch"})
+                continue
+            seen.add(pk)
+            ids[i] = pk
+
+        # Locked in id order until the batch commits: no concurrent write can change
+        # a target, or its owner, between this check and apply()
+        admin = is_admin_user(user)
+        targets = Product.objects.select_for_update().filter(pk__in=ids.values()).order_by("pk")
+        if not admin:
+            targets = targets.filter(owner=user)
+        targets = targets.in_bulk()
+
+        # Admins may set the owner of new products, as in ProductViewSet.perform_create
+        owner_ids = set()
+        if admin:
+            for op in operations:
+                if isinstance(op, dict) and op.get("op") == "create" and isinstance(op.get("data"), dict):
+                    owner = op["data"].get("owner")
+                    if str(owner).isdigit():
+                        owner_ids.add(int(owner))
+        owners = User.objects.in_bulk(owner_ids) if owner_ids else {}
+
+        # One serializer per kind, reused for every item: same rules, built once
+        creator = ProductSerializer(context=context or {})
+        updater = ProductSerializer(context=context or {}, partial=True)
+
+        for i, op in enumerate(operations):
+            if results[i].get("status") == "error":
+                continue
+            kind = op["op"]
+            instance = None
+            if kind != "create":
+                instance = targets.get(ids[i])
+                if instance is None:
+                    fail(i, {"id": "Not found or not yours"})
+                    continue
+                results[i]["id"] = instance.pk
+                if kind == "delete":
+                    plan["delete"].append((i, instance))
+                    results[i]["status"] = "valid"
+                    continue
+
+            data = op.get("data")
+            if not isinstance(data, dict):
+                fail(i, {"data": "An object of product fields is required"})
+                continue
+            serializer = updater if instance is not None else creator
+            serializer.instance = instance
+            try:
+                attrs = dict(serializer.run_validation(data))
+            except serializers.ValidationError as exc:
+                fail(i, serializers.as_serializer_error(exc))
+                continue
+            attrs.pop("owner", None)
+            if kind == "create":
+                owner = owners.get(int(data["owner"])) if admin and str(data.get("owner")).isdigit() else None
+                plan["create"].append((i, Product(owner=owner or user, **attrs)))
+            else:
+                plan["update"].append((i, instance, instance.current_price, attrs))
+            results[i]["status"] = "valid"
+
+        return plan, results
+
+    @staticmethod
+    def apply(plan, results, user, reason="", batch_size=1000):
+        """Write a validated plan in one transaction; fills in `results`"""
+        now = timezone.now()
+        with transaction.atomic():
+            if plan["delete"]:
+                Product.objects.filter(pk__in=[p.pk for _, p in plan["delete"]]).delete()
+                for i, _ in plan["delete"]:
+                    results[i]["status"] = "deleted"
+
+            if plan["create"]:
+                products = [p for _, p in plan["create"]]
+                for product in products:
+                    product.fill_defaults()
+                Product.objects.bulk_create(products, batch_size=batch_size)
+                for (i, _), product in zip(plan["create"], products):
+                    results[i].update(status="created", id=product.pk)
+
+            if plan["update"]:
+                fields, history = {"updated_at", "content_hash"}, []
+                for i, product, old_price, attrs in plan["update"]:
+                    for name, value in attrs.items():
+                        setattr(product, name, value)
+                    fields.update(attrs)
+                    before = (product.sku, product.optimized_price)
+                    product.fill_defaults()
+                    if (product.sku, product.optimized_price) != before:
+                        fields.update(("sku", "optimized_price"))
+                    product.updated_at = now
+                    if product.current_price != old_price:
+                        history.append(ProductPriceHistory(
+                            product=product,
+                            old_price=old_price,
+                            new_price=product.current_price,
+                            changed_by=user,
+                            reason=reason,
+                            units_sold=product.units_sold,
+                        ))
+                    results[i]["status"] = "updated"
+                Product.objects.bulk_update(
+                    [p for _, p, _, _ in plan["update"]], sorted(fields), batch_size=batch_size,
+                )
+                ProductPriceHistory.objects.bulk_create(history, batch_size=batch_size)
+        return results
+
+
+class ProductFeedWriter:
+    """
+    Single writer for supplier feed imports (seed_products, import_products).
+
+    Takes parsed rows as (sku, fields) in feed order, one chunk at a time. Each
+    row's content hash (Product.compute_content_hash) is compared with the stored
+    one, read for the whole chunk in one query, so unchanged rows are never
+    written: their updated_at, ETags and change-log entries stay put. New rows
+    go through bulk_create, changed ones through a primary-key upsert, and price
+    changes are recorded with bulk history inserts. Call it inside a transaction.
+
+    With collect_errors, rows the database would reject are skipped and listed
+    in `errors` ({"row", "sku", "errors"}, data rows numbered from 1) instead
+    of failing the whole import.
+
+    An import never changes who owns an existing product. With own_products_only
+    (supplier uploads), rows whose SKU belongs to another owner are skipped and
+    listed in `errors` as well.
+    """
+
+    def __init__(
+        self, owner, reason="CSV import/update", dry_run=False, batch_size=1000, collect_errors=False,
+        own_products_only=False,
+    ):
+        self.owner = owner
+        self.reason = reason
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.collect_errors = collect_errors
+        self.own_products_only = own_products_only
+        self.counts = {
+            "rows": 0, "created": 0, "changed": 0, "unchanged": 0, "removed": 0, "price_changed": 0,
+            "errors": 0,
+        }
+        self.errors = []
+        self.seen = set()
+        # Dry runs: sku -> (pk, owner id, hash, price, elasticity) the import would have written so far
+        self._planned = {}
+
+    def write(self, chunk):
+        first_row = self.counts["rows"] + 1
+        self.counts["rows"] += len(chunk)
+        # Invalid rows still count as listed in the feed for deactivate_missing()
+        self.seen.update(sku for sku, _ in chunk)
+        rows = list(enumerate(chunk, start=first_row))
+        if self.collect_errors:
+            rows = self._valid_rows(rows)
+        skus = {sku for _, (sku, _) in rows}
+        state = {
+            sku: (pk, owner_id, content_hash, price, elasticity)
+            for sku, pk, owner_id, content_hash, price, elasticity in Product.objects
+            .filter(sku__in=skus.difference(self._planned))
+            .values_list("sku", "id", "owner_id", "content_hash", "current_price", "elasticity")
+        }
+        # Products not written since content hashes were added (0011): hash the stored row
+        unhashed = [sku for sku, (_, _, content_hash, _, _) in state.items() if not content_hash]
+        for product in Product.objects.filter(sku__in=unhashed):
+            pk, owner_id, _, price, elasticity = state[product.sku]
+            state[product.sku] = (pk, owner_id, product.compute_content_hash(), price, elasticity)
+        state.update((sku, self._planned[sku]) for sku in skus.intersection(self._planned))
+
+        now = timezone.now()
+        created, changed, history = {}, {}, []
+        # Rows are applied in feed order, so a SKU repeated in the feed behaves as
+        # it would row by row: the first row creates it, later ones update it
+        for row, (sku, payload) in rows:
+            obj = Product(sku=sku, owner=self.owner, **payload)
+            if sku not in state:
+                obj.fill_defaults()
+                created[sku] = obj
+                state[sku] = (None, self.owner.pk, obj.content_hash, obj.current_price, obj.elasticity)
+                self.counts["created"] += 1
+                continue
+
+            pk, owner_id, content_hash, old_price, elasticity = state[sku]
+            if owner_id != self.owner.pk:
+                if self.own_products_only:
+                    self._row_error(row, sku, {"sku": "SKU belongs to another supplier"})
+                    continue
+                # Updated in place: the product keeps its owner
+                obj.owner_id = owner_id
+            if "elasticity" not in payload:
+                obj.elasticity = elasticity
+            obj.fill_defaults()
+            if content_hash == obj.content_hash and elasticity == obj.elasticity:
+                self.counts["unchanged"] += 1
+                continue
+            state[sku] = (pk, owner_id, obj.content_hash, obj.current_price, obj.elasticity)
+            self.counts["changed"] += 1
+            if sku in created:
+                # Created earlier in this chunk: update the pending insert in place
+                target = created[sku]
+                for name in FEED_UPDATE_FIELDS:
+                    setattr(target, name, getattr(obj, name))
+                obj = target
+            elif pk is not None:
+                obj.pk = pk
+                obj.updated_at = now
+                changed[sku] = obj
+
+            # Track price changes
+            if old_price != obj.current_price:
+                history.append(ProductPriceHistory(
+                    product=obj,
+                    old_price=old_price,
+                    new_price=obj.current_price,
+                    changed_by=self.owner,
+                    reason=self.reason,
+                    units_sold=obj.units_sold,
+                ))
+                self.counts["price_changed"] += 1
+
+        if self.dry_run:
+            self._planned.update((sku, state[sku]) for sku in skus)
+            return
+        Product.objects.bulk_create(created.values(), batch_size=self.batch_size)
+        # Changed rows go through an upsert on the primary key: a single INSERT ...
+        # ON CONFLICT DO UPDATE, where bulk_update builds a CASE per column and row
+        Product.objects.bulk_create(
+            changed.values(), batch_size=self.batch_size,
+            update_conflicts=True, unique_fields=["id"], update_fields=FEED_UPDATE_FIELDS,
+        )
+        ProductPriceHistory.objects.bulk_create(history, batch_size=self.batch_size)
+
+    def _valid_rows(self, rows):
+        valid = []
+        for row, (sku, fields) in rows:
+            errors = feed_row_errors(sku, fields)
+            if errors:
+                self._row_error(row, sku, errors)
+            else:
+                valid.append((row, (sku, fields)))
+        return valid
+
+    def _row_error(self, row, sku, errors):
+        self.counts["errors"] += 1
+        if len(self.errors) < MAX_FEED_ERRORS:
+            self.errors.append({"row": row, "sku": sku, "errors": errors})
+
+    def deactivate_missing(self):
+        """
+        Deactivate the owner's active products that no row written so far
+        mentioned (the feed dropped them); returns how many.
+        """
+        missing = [
+            pk for pk, sku in Product.objects
+            .filter(owner=self.owner, is_active=True)
+            .values_list("id", "sku")
+            .iterator(chunk_size=10000)
+            if sku not in self.seen
+        ]
+        self.counts["removed"] = len(missing)
+        if self.dry_run:
+            return len(missing)
+
+        now = timezone.now()
+        for start in range(0, len(missing), self.batch_size):
+            products = list(Product.objects.filter(pk__in=missing[start:start + self.batch_size]))
+            for product in products:
+                product.is_active = False
+                product.content_hash = product.compute_content_hash()
+                product.updated_at = now
+            Product.objects.bulk_update(products, ["is_active", "content_hash", "updated_at"])
+        return len(missing)
@@ -0,0 +1,117 @@
+# backend/products/synthetic.py
+"""
+Vectorized value generation for generate_synthetic_data (no Django imports).
+
+Every function takes a numpy Generator and returns column arrays for a chunk
+of rows, so a run is reproducible from its seed and nothing is drawn row by row.
+"""
+import numpy as np
+
+# Share of the catalog per category
+CATEGORY_MIX = {"grocery": 0.35, "stationery": 0.25, "electronics": 0.25, "other": 0.15}
+
+# Cost price: (median, log-normal sigma)
+CATEGORY_COST = {
+    "grocery": (4.0, 0.6),
+    "stationery": (6.0, 0.7),
+    "electronics": (60.0, 0.9),
+    "other": (20.0, 0.9),
+}
+
+# Mean price elasticity (magnitude); groceries sell regardless of price
+CATEGORY_ELASTICITY = {"grocery": 0.8, "stationery": 1.1, "electronics": 1.6, "other": 1.2}
+
+# Customer rating 1-5
+RATING_WEIGHTS = [0.04, 0.08, 0.20, 0.38, 0.30]
+
+ADJECTIVES = np.array([
+    "Classic", "Compact", "Deluxe", "Eco", "Essential", "Everyday", "Premium", "Pro",
+    "Smart", "Ultra", "Value", "Organic", "Portable", "Heavy-Duty", "Mini", "Family",
+])
+NOUNS = {
+    "grocery": np.array(["Coffee", "Tea", "Rice", "Pasta", "Olive Oil", "Cereal", "Honey", "Snack Bar", "Juice", "Flour"]),
+    "stationery": np.array(["Notebook", "Pen Set", "Stapler", "Planner", "Marker", "Binder", "Sticky Notes", "Pencil", "Folder"]),
+    "electronics": np.array(["Headphones", "Charger", "Keyboard", "Mouse", "Speaker", "Webcam", "Monitor", "Power Bank", "Router"]),
+    "other": np.array(["Water Bottle", "Backpack", "Desk Lamp", "Umbrella", "Mug", "Towel", "Candle", "Plant Pot"]),
+}
+
+
+def owner_weights(suppliers):
+    """Zipf-like share of the catalog per supplier: a few large ones, a long tail"""
+    weights = 1.0 / np.arange(1, suppliers + 1) ** 0.8
+    return weights / weights.sum()
+
+
+def products(rng, n, weights):
+    """Column arrays for `n` products; `weights` from owner_weights()"""
+    names = list(CATEGORY_MIX)
+    category = rng.choice(len(names), size=n, p=list(CATEGORY_MIX.values()))
+
+    median = np.array([CATEGORY_COST[c][0] for c in names])[category]
+    sigma = np.array([CATEGORY_COST[c][1] for c in names])[category]
+    base_price = np.maximum(np.round(median * rng.lognormal(0.0, sigma), 2), 0.5)
+    # Markup 10-300%, centred on ~45%
+    markup = np.clip(rng.lognormal(np.log(0.45), 0.4, n), 0.1, 3.0)
+    current_price = np.round(base_price * (1 + markup), 2)
+
+    # Cheap products sell more; a heavy tail of bestsellers
+    units_sold = np.floor(rng.lognormal(np.log(800.0 / np.sqrt(base_price)), 1.0)).astype(np.int64)
+    stock_qty = rng.poisson(np.maximum(units_sold * rng.uniform(0.05, 0.6, n), 1.0))
+    demand_forecast = np.floor(units_sold * rng.lognormal(np.log(0.2), 0.3, n)).astype(np.int64)
+    rating = rng.choice(np.arange(1, 6), size=n, p=RATING_WEIGHTS)
+
+    mean_elasticity = np.array([CATEGORY_ELASTICITY[c] for c in names])[category]
+    elasticity = np.round(np.clip(rng.normal(mean_elasticity, 0.25), 0.2, 3.0), 3)
+
+    adjective = rng.integers(0, len(ADJECTIVES), n)
+    noun_pick = rng.random(n)
+    noun = np.empty(n, dtype=object)
+    for i, name in enumerate(names):
+        mask = category == i
+        noun[mask] = NOUNS[name][(noun_pick[mask] * len(NOUNS[name])).astype(np.int64)]
+
+    return {
+        "owner": rng.choice(len(weights), size=n, p=weights),
+        "category": np.array(names)[category],
+        "adjective": ADJECTIVES[adjective],
+        "noun": noun,
+        "base_price": base_price,
+        "current_price": current_price,
+        "stock_qty": np.minimum(stock_qty, 2_000_000_000),
+        "units_sold": np.minimum(units_sold, 2_000_000_000),
+        "customer_rating": rating,
+        "demand_forecast": np.minimum(demand_forecast, 2_000_000_000),
+        "elasticity": elasticity,
+    }
+
+
+def price_history(rng, current_price, units_sold, mean_changes, days):
+    """
+    Random-walk price changes ending at each product's current price.
+
+    Returns (product index, old price, new price, seconds before now, units sold
+    at the change), ordered by product and then oldest change first.
+    """
+    counts = rng.poisson(mean_changes, len(current_price))
+    index = np.repeat(np.arange(len(current_price)), counts)
+    if not len(index):
+        empty = np.empty(0)
+        return index, empty, empty, empty, empty.astype(np.int64)
+
+    # Log-returns per change; walk backwards from the current price. `after` is
+    # the sum of the steps that follow each change within its product.
+    steps = np.clip(rng.normal(0.0, 0.06, len(index)), -0.3, 0.3)
+    total = np.cumsum(steps)
+    last = np.repeat(np.cumsum(counts)[counts > 0] - 1, counts[counts > 0])
+    after = total[last] - total
+    new_price = np.maximum(np.round(current_price[index] * np.exp(-after), 2), 0.01)
+    old_price = np.maximum(np.round(current_price[index] * np.exp(-(after + steps)), 2), 0.01)
+
+    # Change times: sorted within each product so the walk runs forward in time
+    age = rng.uniform(0, days * 86400.0, len(index))
+    order = np.lexsort((-age, index))
+    age = age[order]
+
+    # Sales so far at the time of the change, growing roughly linearly to today
+    sold = np.floor(units_sold[index] * (1 - age / (days * 86400.0))).astype(np.int64)
+    return index, old_price, new_price, age, sold
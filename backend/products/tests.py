@@ -1,3 +1,377 @@
-from django.test import TestCase
+import csv
+import importlib.util
+import io
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from . import feed, imports
+from .models import Product, ProductPriceHistory
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def make_product(owner, sku, **fields):
+    values = {
+        "name": f"Product {sku}",
+        "category": "other",
+        "base_price": Decimal("10.00"),
+        "current_price": Decimal("15.00"),
+        "stock_qty": 5,
+    }
+    values.update(fields)
+    return Product.objects.create(owner=owner, sku=sku, **values)
+
+
+class TempDirMixin:
+    def setUp(self):
+        super().setUp()
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+
+@skipUnless(HAS_PYARROW, "needs pyarrow")
+class ColumnarRoundTripTests(TempDirMixin, TestCase):
+    """export_products followed by import_products changes nothing"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = User.objects.create_user("supplier1", password="x")
+        make_product(self.owner, "A-1")
+        # Bounds and elasticity that a CSV-style import would derive differently
+        make_product(
+            self.owner, "A-2", min_price=Decimal("5.00"), max_price=Decimal("99.00"),
+            elasticity=2.5, is_active=False,
+        )
+        make_product(self.owner, "A-3", optimized_price=Decimal("14.00"), units_sold=120, demand_forecast=40)
+
+    def snapshot(self):
+        return list(Product.objects.order_by("sku").values())
+
+    def round_trip(self, suffix):
+        path = self.tmp / f"catalog{suffix}"
+        call_command("export_products", path=str(path), owner="supplier1", stdout=StringIO())
+        before = self.snapshot()
+        out = StringIO()
+        call_command("import_products", path=str(path), owner="supplier1", stdout=out)
+        self.assertIn(" Changed=0,", out.getvalue())
+        self.assertEqual(self.snapshot(), before)
+
+    def test_parquet_round_trip(self):
+        self.round_trip(".parquet")
+
+    def test_arrow_round_trip(self):
+        self.round_trip(".arrow")
+
+    def test_missing_columns_are_derived(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = self.tmp / "feed.parquet"
+        pq.write_table(pa.table({
+            "sku": ["A-2", "NEW-1"],
+            "name": ["Renamed", "New"],
+            "cost_price": [10.0, 4.0],
+            "selling_price": [15.0, 6.0],
+            "optimized_price": [14.0, 5.0],
+        }), path)
+        call_command("import_products", path=str(path), owner="supplier1", stdout=StringIO())
+
+        updated, created = Product.objects.get(sku="A-2"), Product.objects.get(sku="NEW-1")
+        # No is_active/min/max columns: derived as for a CSV row; elasticity is kept
+        self.assertTrue(updated.is_active)
+        self.assertEqual((updated.min_price, updated.max_price), (Decimal("10.00"), Decimal("15.00")))
+        self.assertEqual(updated.elasticity, 2.5)
+        self.assertEqual((created.min_price, created.max_price), (Decimal("4.00"), Decimal("6.00")))
+
+
+class ImportJobTests(TempDirMixin, TestCase):
+    """Stored uploads for queued jobs (products.imports)"""
+
+    CSV = b"product_id,name,category,cost_price,selling_price,stock_available\nU-1,Mug,other,2.00,4.00,10\n"
+
+    def setUp(self):
+        super().setUp()
+        self.owner = User.objects.create_user("supplier1", password="x")
+        override = override_settings(IMPORT_UPLOAD_DIR=self.tmp / "uploads")
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def enqueue(self, upload):
+        job = imports.enqueue_upload(upload, self.owner, self.owner)
+        return imports.claim_next_job() or job
+
+    def test_spooled_upload_is_moved(self):
+        upload = TemporaryUploadedFile("catalog.csv", "text/csv", len(self.CSV), "utf-8")
+        upload.write(self.CSV)
+        upload.flush()
+        spooled = upload.temporary_file_path()
+
+        job = self.enqueue(upload)
+        self.assertFalse(Path(spooled).exists())
+        self.assertEqual(Path(job.file_path).read_bytes(), self.CSV)
+        upload.close()
+
+        imports.run_job(job)
+        self.assertEqual(job.status, "done", job.message)
+        self.assertTrue(Product.objects.filter(sku="CSV-U-1", owner=self.owner).exists())
+        self.assertFalse(Path(job.file_path).exists())
+
+    def test_failed_job_deletes_the_upload(self):
+        job = self.enqueue(SimpleUploadedFile("catalog.csv", b""))
+        self.assertTrue(Path(job.file_path).exists())
+
+        imports.run_job(job)
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.message, "CSV has no header row.")
+        self.assertFalse(Path(job.file_path).exists())
+
+
+class BatchTests(APITestCase):
+    """POST /api/products/batch/ is all-or-nothing"""
+
+    def setUp(self):
+        self.supplier = User.objects.create_user("supplier1", password="x")
+        self.supplier.profile.role = "supplier"
+        self.supplier.profile.save()
+        self.other = User.objects.create_user("supplier2", password="x")
+        self.mine = make_product(self.supplier, "B-1")
+        self.doomed = make_product(self.supplier, "B-2")
+        self.theirs = make_product(self.other, "B-3")
+        self.client.force_authenticate(self.supplier)
+
+    def batch(self, *operations):
+        return self.client.post(
+            "/api/products/batch/", {"operations": list(operations), "reason": "Repricing"}, format="json",
+        )
+
+    def snapshot(self):
+        return list(Product.objects.order_by("sku").values()), ProductPriceHistory.objects.count()
+
+    def test_applies_every_operation(self):
+        response = self.batch(
+            {"op": "create", "data": {"name": "Lamp", "category": "other",
+                                      "base_price": "10.00", "current_price": "12.00"}},
+            {"op": "update", "id": self.mine.pk, "data": {"current_price": "18.00"}},
+            {"op": "delete", "id": self.doomed.pk},
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([r["status"] for r in response.data["results"]], ["created", "updated", "deleted"])
+        self.assertEqual(Product.objects.get(name="Lamp").owner, self.supplier)
+        self.assertEqual(Product.objects.get(pk=self.mine.pk).current_price, Decimal("18.00"))
+        self.assertFalse(Product.objects.filter(pk=self.doomed.pk).exists())
+        history = ProductPriceHistory.objects.get(product=self.mine)
+        self.assertEqual((history.old_price, history.reason), (Decimal("15.00"), "Repricing"))
+
+    def test_one_invalid_operation_writes_nothing(self):
+        before = self.snapshot()
+        invalid = [
+            {"op": "update", "id": self.mine.pk, "data": {"current_price": "cheap"}},
+            {"op": "update", "id": self.theirs.pk, "data": {"current_price": "1.00"}},
+            {"op": "delete", "id": self.mine.pk + 1000},
+            {"op": "rename", "id": self.mine.pk},
+        ]
+        for operation in invalid:
+            with self.subTest(operation=operation):
+                response = self.batch(
+                    {"op": "create", "data": {"name": "Lamp", "category": "other",
+                                              "base_price": "10.00", "current_price": "12.00"}},
+                    {"op": "delete", "id": self.doomed.pk},
+                    operation,
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.data["applied"])
+                self.assertEqual(response.data["results"][2]["status"], "error")
+                self.assertEqual(self.snapshot(), before)
+
+    def test_product_listed_twice_is_rejected(self):
+        response = self.batch(
+            {"op": "update", "id": self.mine.pk, "data": {"current_price": "18.00"}},
+            {"op": "delete", "id": self.mine.pk},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Product.objects.filter(pk=self.mine.pk, current_price=Decimal("15.00")).exists())
+
+
+class ConditionalGetTests(APITestCase):
+    """ETags on product reads (commons.views.ConditionalGetMixin)"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user("supplier1", password="x")
+        self.product = make_product(self.owner, "E-1")
+        self.client.force_authenticate(self.owner)
+
+    def revalidate(self, url):
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        return etag
+
+    def test_owner_rename_changes_the_etag(self):
+        for url in ("/api/products/", f"/api/products/{self.product.pk}/"):
+            with self.subTest(url=url):
+                etag = self.revalidate(url)
+                User.objects.filter(pk=self.owner.pk).update(username=f"renamed-{len(url)}")
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+
+    def test_price_history_follows_changed_by_renames(self):
+        url = f"/api/products/{self.product.pk}/price-history/"
+        ProductPriceHistory.objects.create(
+            product=self.product, old_price=Decimal("14.00"), new_price=Decimal("15.00"), changed_by=self.owner,
+        )
+        etag = self.revalidate(url)
+        User.objects.filter(pk=self.owner.pk).update(username="renamed")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ParallelParseTests(TempDirMixin, TestCase):
+    """feed.parse_parallel yields what a serial csv.DictReader pass does"""
+
+    def write_csv(self):
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(feed.CSV_HEADERS)
+        for i in range(300):
+            description = f'Line one\nline "two" of {i}' if i % 7 == 0 else f"Plain {i}, with comma"
+            writer.writerow([
+                f"P{i}", f"Product {i}", description, f"{i % 50}.25", f"{i % 50 + 3}.75",
+                "Electronics" if i % 2 else "Toys", i % 40, i * 3, i % 5 + 1, i * 2, f"{i % 50 + 2}.50",
+            ])
+        path = self.tmp / "feed.csv"
+        path.write_text(out.getvalue(), encoding="utf-8")
+        return path
+
+    def test_matches_serial_parse(self):
+        path = self.write_csv()
+        with open(path, newline="", encoding="utf-8") as f:
+            serial = [feed.parse_row(row) for row in csv.DictReader(f)]
+
+        fieldnames, start = feed.read_header(path)
+        # Ranges and read blocks small enough that cuts land next to quoted newlines
+        with mock.patch.object(feed, "BLOCK_BYTES", 256):
+            ranges = list(feed.split_ranges(path, start, range_bytes=500))
+            parallel = list(feed.parse_parallel(path, fieldnames, start, workers=2, range_bytes=500))
+        self.assertGreater(len(ranges), 10)
+        self.assertEqual(ranges[0][0], start)
+        self.assertEqual(ranges[-1][1], path.stat().st_size)
+        self.assertTrue(all(a[1] == b[0] for a, b in zip(ranges, ranges[1:])))
+        self.assertEqual(parallel, serial)
+
+
+class KeysetListTests(APITestCase):
+    """GET /api/products/ pages with cursors (commons.pagination.KeysetPagination)"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user("supplier1", password="x")
+        self.owner.profile.role = "supplier"
+        self.owner.profile.save()
+        self.products = [make_product(self.owner, f"K-{i}", current_price=Decimal(10 + i % 3)) for i in range(7)]
+        self.client.force_authenticate(self.owner)
+
+    def walk(self, params, edit=None):
+        ids, url, query = [], "/api/products/", dict(params, page_size=3)
+        while True:
+            response = self.client.get(url, query)
+            self.assertEqual(response.status_code, 200, response.data)
+            ids.extend(row["id"] for row in response.data["results"])
+            if edit:
+                edit()
+                edit = None
+            if not response.data["next"]:
+                return ids, response
+            query = {k: v[0] for k, v in parse_qs(urlparse(response.data["next"]).query).items()}
+
+    def test_pages_cover_the_list_once(self):
+        ids, _ = self.walk({})
+        self.assertEqual(ids, [p.pk for p in sorted(self.products, key=lambda p: (p.updated_at, p.pk), reverse=True)])
+
+    def test_client_ordering_with_ties(self):
+        ids, _ = self.walk({"ordering": "current_price"})
+        expected = sorted(self.products, key=lambda p: (p.current_price, -p.updated_at.timestamp(), -p.pk))
+        self.assertEqual(ids, [p.pk for p in expected])
+
+    def test_edits_do_not_shift_later_pages(self):
+        first = sorted(self.products, key=lambda p: (p.updated_at, p.pk), reverse=True)
+
+        def edit():
+            # Moves a product already seen to the front; the cursor is past it
+            self.client.patch(f"/api/products/{first[0].pk}/", {"stock_qty": 99})
+
+        ids, _ = self.walk({}, edit=edit)
+        self.assertEqual(ids, [p.pk for p in first])
+
+    def test_count_and_invalid_cursor(self):
+        response = self.client.get("/api/products/", {"count": "true", "page_size": 3})
+        self.assertEqual((response.data["count"], response.data["count_is_estimate"]), (7, False))
+        self.assertEqual(self.client.get("/api/products/", {"cursor": "not-a-cursor"}).status_code, 404)
+
+
+class ChangeFeedTests(APITestCase):
+    """GET /api/products/changes/ (delta sync from the ProductChange log)"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user("supplier1", password="x")
+        self.owner.profile.role = "supplier"
+        self.owner.profile.save()
+        self.a, self.b, self.c = (make_product(self.owner, sku) for sku in ("C-A", "C-B", "C-C"))
+        self.client.force_authenticate(self.owner)
+
+    def changes(self, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        response = self.client.get("/api/products/changes/", params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_products_in_change_order_at_their_latest_change(self):
+        self.a.name = "Renamed"
+        self.a.save()
+        data = self.changes()
+        self.assertEqual([r["id"] for r in data["results"]], [self.b.pk, self.c.pk, self.a.pk])
+        seqs = [r["seq"] for r in data["results"]]
+        self.assertEqual(seqs, sorted(seqs))
+        self.assertEqual(data["results"][-1]["product"]["name"], "Renamed")
+        self.assertFalse(data["has_more"])
+
+    def test_cursor_pages_and_resumes(self):
+        first = self.changes(page_size=2)
+        self.assertTrue(first["has_more"])
+        rest = self.changes(first["cursor"], page_size=2)
+        self.assertFalse(rest["has_more"])
+        self.assertEqual(
+            [r["id"] for r in first["results"] + rest["results"]], [self.a.pk, self.b.pk, self.c.pk],
+        )
+
+        self.assertEqual(self.changes(rest["cursor"])["results"], [])
+        deleted = self.c.pk
+        self.b.stock_qty = 1
+        self.b.save()
+        self.c.delete()
+        later = self.changes(rest["cursor"])
+        self.assertEqual(
+            [(r["id"], r["deleted"]) for r in later["results"]], [(self.b.pk, False), (deleted, True)],
+        )
+
+    def test_deactivated_products_are_tombstones_for_buyers(self):
+        buyer = User.objects.create_user("buyer1", password="x")
+        self.client.force_authenticate(buyer)
+        cursor = self.changes()["cursor"]
+        self.a.is_active = False
+        self.a.save()
+        results = self.changes(cursor)["results"]
+        self.assertEqual([(r["id"], r["deleted"], r["product"]) for r in results], [(self.a.pk, True, None)])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/products/changes/", {"since": "nope"})
+        self.assertEqual(response.status_code, 400)
@@ -1,28 +1,60 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, filters, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 
-from commons.permissions import IsAdminOrSupplierOwner, is_admin_user
-from .models import Product, ProductPriceHistory
-from .serializers import ProductSerializer, ProductPriceHistorySerializer
+from commons.pagination import KeysetPagination, ChangedAtKeysetPagination
+from commons.permissions import IsAdminOrSupplierOwner, get_role, is_admin_user
+from commons.views import ConditionalGetMixin, SparseFieldsViewMixin
+from .imports import columnar_supported, enqueue_upload, upload_format
+from .models import Product, ProductChange, ProductImportJob, ProductPriceHistory
+from .filters import ProductFilterBackend, PriceHistoryFilterBackend, parse_datetime_param, product_facets
+from .history import price_at_expression
+from .rollups import PERIODS, price_rollups
+from .search import ProductSearchFilter
+from .serializers import (
+    ProductImportJobSerializer, ProductListSerializer, ProductPriceHistorySerializer, ProductSerializer,
+)
+from .services import ProductBatchService, MAX_BATCH_SIZE
 
 User = get_user_model()
 
-class ProductViewSet(viewsets.ModelViewSet):
+# Products per price-rollups request
+MAX_ROLLUP_PRODUCTS = 100
+
+# Delta sync pages are larger than list pages: rows are usually few and small
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 1000
+
+# Import jobs listed by GET /api/products/import/
+IMPORT_JOBS_LISTED = 20
+
+class ProductViewSet(ConditionalGetMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     - Buyer: SAFE_METHODS allowed (list/detail)
     - Supplier: CRUD allowed but only on their own products
     - Admin: full access
+    Reads accept ?fields= / ?omit= (sparse fieldsets, projected into SQL).
+    list/detail/price-history answer If-None-Match / If-Modified-Since with 304.
     """
-    queryset = Product.objects.all().select_related("owner").order_by("-updated_at")
+    queryset = Product.objects.with_metrics().select_related("owner").order_by("-updated_at")
     serializer_class = ProductSerializer
     permission_classes = [IsAdminOrSupplierOwner]
+    pagination_class = KeysetPagination
+    projection_actions = ("list", "retrieve", "mine")
 
     # search/order support
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["name", "sku", "category"]
-    ordering_fields = ["updated_at", "current_price", "stock_qty", "name"]
+    filter_backends = [ProductSearchFilter, ProductFilterBackend, filters.OrderingFilter]
+    search_fields = ["name", "sku", "category", "description"]  # fallback when no full-text index
+    ordering_fields = [
+        "updated_at", "current_price", "stock_qty", "name",
+        "profit_margin", "stock_velocity", "revenue_potential",  # with_metrics() annotations
+    ]
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -30,12 +62,37 @@ class ProductViewSet(viewsets.ModelViewSet):
         if not user.is_authenticated:
             # if you want anonymous SAFE reads, toggle in permission
             return qs.none()
-        role = getattr(getattr(user, "profile", None), "role", "buyer")
+        if self.action in ("list", "retrieve", "mine"):
+            as_of = parse_datetime_param(self.request.query_params, "as_of")
+            if as_of is not None:
+                qs = qs.annotate(price_as_of=price_at_expression(as_of))
+        role = get_role(user)
         # Buyers see only active products; suppliers/admin see all
         if role == "buyer":
             return qs.filter(is_active=True)
         return qs
 
+    def get_serializer_class(self):
+        # Read-only list pages skip ModelSerializer's per-row field walk
+        if self.action in ("list", "mine", "changes"):
+            return ProductListSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        not_modified = self.check_not_modified(
+            self.filter_queryset(self.get_queryset()), related_fields=("owner__username",),
+        )
+        if not_modified:
+            return not_modified
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        not_modified = self.check_not_modified(instance=instance, related_fields=("owner__username",))
+        if not_modified:
+            return not_modified
+        return Response(self.get_serializer(instance).data)
+
     def perform_create(self, serializer):
         """
         Supplier => owner=self
@@ -53,8 +110,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         """
         Save and create ProductPriceHistory if current_price changed.
         """
-        instance = self.get_object()
-        old_price = instance.current_price
+        old_price = serializer.instance.current_price  # already fetched by update()
         obj = serializer.save()
         new_price = obj.current_price
         if old_price != new_price:
@@ -63,23 +119,241 @@ class ProductViewSet(viewsets.ModelViewSet):
                 old_price=old_price,
                 new_price=new_price,
                 changed_by=self.request.user,
-                reason=self.request.data.get("reason", "")
+                reason=self.request.data.get("reason", ""),
+                units_sold=obj.units_sold,
             )
 
     @action(detail=True, methods=["get"], url_path="price-history")
     def price_history(self, request, pk=None):
+        """Price changes of one product, newest first; ?from= / ?to= narrow the range"""
         product = self.get_object()
-        ph = product.price_history.all().order_by("-changed_at")  # newest first
-        data = ProductPriceHistorySerializer(ph, many=True).data
-        return Response(data)
+        ph = PriceHistoryFilterBackend().filter_queryset(
+            request, product.price_history.select_related("changed_by"), self,
+        )
+        not_modified = self.check_not_modified(
+            ph, timestamp_fields=("changed_at",), related_fields=("changed_by__username",),
+        )
+        if not_modified:
+            return not_modified
+        return self._history_page(ph)
+
+    @action(detail=False, methods=["get"], url_path="price-history")
+    def price_history_feed(self, request):
+        """
+        GET /api/products/price-history/
+        Price changes across the caller's visible products, newest first.
+        Filter with ?owner=, ?category=, ?from=, ?to=.
+        """
+        ph = ProductPriceHistory.objects.select_related("product", "changed_by")
+        # Same visibility as get_queryset(), as a join rather than an IN (subquery),
+        # so the newest-first scan can walk pricehistory_time_idx
+        if get_role(request.user) == "buyer":
+            ph = ph.filter(product__is_active=True)
+        ph = PriceHistoryFilterBackend().filter_queryset(request, ph, self)
+        return self._history_page(ph)
+
+    @action(detail=False, methods=["get"], url_path="price-rollups")
+    def price_rollups(self, request):
+        """
+        GET /api/products/price-rollups/?product_ids=1,2&period=week&from=2024-01-01&to=2024-06-30
+        Open/high/low/close price and change count per day, week or month (UTC),
+        read from the daily PriceRollup table rather than raw history.
+        """
+        params = request.query_params
+        try:
+            ids = [int(pid) for pid in params.get("product_ids", "").split(",") if pid.strip()]
+        except ValueError:
+            raise ValidationError({"product_ids": "Invalid product IDs"})
+        if not ids:
+            raise ValidationError({"product_ids": "At least one product id is required"})
+        if len(ids) > MAX_ROLLUP_PRODUCTS:
+            raise ValidationError({"product_ids": f"At most {MAX_ROLLUP_PRODUCTS} products per request"})
+        period = params.get("period", "day")
+        if period not in PERIODS:
+            raise ValidationError({"period": f"Choose one of: {', '.join(PERIODS)}"})
+        start = parse_datetime_param(params, "from")
+        end = parse_datetime_param(params, "to", end_of_day=True)
+
+        visible = list(self.get_queryset().filter(id__in=ids).order_by("id").values_list("id", flat=True))
+        rollups = price_rollups(
+            visible, period,
+            start=start.date() if start else None,
+            end=end.date() if end else None,
+        )
+        return Response({
+            "period": period,
+            "results": [{"product_id": pid, "buckets": buckets} for pid, buckets in rollups.items()],
+        })
+
+    @action(detail=False, methods=["get", "post"], url_path="prices-at")
+    def prices_at(self, request):
+        """
+        GET/POST /api/products/prices-at/
+        Price of many products at a past time in one query.
+        Params (query string for GET, JSON body for POST):
+          at (required), product_ids (optional list / comma string; default: all visible)
+        Products created after `at` map to null.
+        """
+        params = request.query_params if request.method == "GET" else request.data
+        at = parse_datetime_param(params, "at")
+        if at is None:
+            raise ValidationError({"at": "A date/time is required"})
+
+        qs = self.get_queryset().order_by()
+        ids = params.get("product_ids")
+        if ids:
+            if isinstance(ids, str):
+                ids = ids.split(",")
+            try:
+                ids = [int(pid) for pid in ids if str(pid).strip()]
+            except (TypeError, ValueError):
+                raise ValidationError({"product_ids": "Invalid product IDs"})
+            qs = qs.filter(id__in=ids)
+
+        rows = qs.annotate(price_at=price_at_expression(at)).values_list("id", "price_at")
+        prices = {
+            str(pid): None if price is None else f"{price:.2f}"
+            for pid, price in rows.iterator(chunk_size=5000)
+        }
+        return Response({"at": at, "prices": prices})
+
+    def _history_page(self, ph):
+        paginator = ChangedAtKeysetPagination()  # newest first
+        context = self.get_serializer_context()
+        ph = self.project_queryset(ph, ProductPriceHistorySerializer(context=context), required=paginator.ordering)
+        page = paginator.paginate_queryset(ph, self.request, view=self)
+        data = ProductPriceHistorySerializer(page, many=True, context=context).data
+        return paginator.get_paginated_response(data)
 
     @action(detail=False, methods=["get"], url_path="mine", permission_classes=[permissions.IsAuthenticated])
     def mine(self, request):
         """Suppliers get only their products (paginated)."""
-        qs = self.get_queryset().filter(owner=request.user)
+        qs = self.project_queryset(self.get_queryset().filter(owner=request.user))
         page = self.paginate_queryset(qs)
         if page is not None:
             ser = self.get_serializer(page, many=True)
             return self.get_paginated_response(ser.data)
         ser = self.get_serializer(qs, many=True)
         return Response(ser.data)
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        POST /api/products/batch/
+        Body: {"operations": [{"op": "create", "data": {...}},
+                              {"op": "update", "id": 5, "data": {...}},
+                              {"op": "delete", "id": 7}],
+               "reason": "optional price-history reason"}
+        All operations are validated first; if any fails nothing is written (400).
+        Otherwise all are applied in the same transaction, with the targets locked
+        since validation. One result per operation.
+        """
+        operations = request.data.get("operations")
+        if not isinstance(operations, list) or not operations:
+            raise ValidationError({"operations": "A non-empty list of operations is required"})
+        if len(operations) > MAX_BATCH_SIZE:
+            raise ValidationError({"operations": f"At most {MAX_BATCH_SIZE} operations per batch"})
+
+        applied, results = ProductBatchService.run(
+            operations, request.user, self.get_serializer_context(), reason=request.data.get("reason", ""),
+        )
+        if not applied:
+            return Response({"applied": False, "results": results}, status=400)
+        return Response({"applied": True, "results": results})
+
+    @action(detail=False, methods=["get", "post"], url_path="import", parser_classes=[MultiPartParser])
+    def import_catalog(self, request):
+        """
+        POST /api/products/import/  (multipart/form-data)
+          file=<.csv | .parquet | .arrow>, deactivate_missing=true, owner=<user id> (admins)
+        The upload is streamed to disk and queued for the import worker
+        (manage.py process_imports); responds 202 with the job to poll.
+        GET lists the caller's recent jobs.
+        """
+        if request.method == "GET":
+            jobs = self._import_jobs(request.user).select_related("owner")[:IMPORT_JOBS_LISTED]
+            return Response(ProductImportJobSerializer(jobs, many=True).data)
+
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Upload a catalog file"})
+        file_format = upload_format(upload.name)
+        if file_format is None:
+            raise ValidationError({"file": "Use a .csv, .parquet or .arrow/.feather file"})
+        if file_format != "csv" and not columnar_supported():
+            raise ValidationError({"file": "Parquet/Arrow uploads aren't supported on this server"})
+        if upload.size > settings.IMPORT_MAX_UPLOAD_BYTES:
+            raise ValidationError({"file": f"At most {settings.IMPORT_MAX_UPLOAD_BYTES // (1024 * 1024)} MB"})
+
+        # Same owner rules as perform_create
+        owner = request.user
+        if is_admin_user(request.user) and str(request.data.get("owner", "")).isdigit():
+            owner = User.objects.filter(pk=request.data["owner"]).first() or owner
+        deactivate_missing = str(request.data.get("deactivate_missing", "")).lower() in ("1", "true", "yes")
+
+        job = enqueue_upload(upload, owner, request.user, deactivate_missing=deactivate_missing)
+        return Response(ProductImportJobSerializer(job).data, status=202)
+
+    @action(detail=False, methods=["get"], url_path=r"import/(?P<job_id>\d+)")
+    def import_status(self, request, job_id=None):
+        """GET /api/products/import/<id>/ - progress, row errors and final counts of an upload"""
+        job = get_object_or_404(self._import_jobs(request.user).select_related("owner"), pk=job_id)
+        return Response(ProductImportJobSerializer(job).data)
+
+    def _import_jobs(self, user):
+        jobs = ProductImportJob.objects.order_by("-id")
+        if not is_admin_user(user):
+            jobs = jobs.filter(Q(owner=user) | Q(created_by=user))
+        return jobs
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """
+        GET /api/products/changes/?since=<cursor>
+        Delta sync: products created/updated since `since`, plus tombstones for
+        products the caller can no longer see (deleted, or deactivated for buyers),
+        in change order. Omit `since` for a full sync; pass back `cursor` next time
+        and keep going while `has_more` is true.
+        """
+        params = request.query_params
+        try:
+            since = ProductChange.parse_cursor(params.get("since") or "0")
+            limit = int(params.get("page_size") or CHANGES_PAGE_SIZE)
+        except ValueError:
+            raise ValidationError({"since": "Invalid cursor"})
+        limit = max(1, min(limit, CHANGES_MAX_PAGE_SIZE))
+
+        # Commit order, so a change committed late is never behind a returned cursor
+        rows = ProductChange.page_after(*since, limit + 1)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        visible = self.project_queryset(self.get_queryset().filter(id__in=[r[2] for r in rows]))
+        products = {p.id: p for p in visible.order_by()}
+        serializer = self.get_serializer()
+        results = []
+        for _, seq, product_id in rows:
+            product = products.get(product_id)
+            results.append({
+                "seq": seq,
+                "id": product_id,
+                "deleted": product is None,
+                "product": serializer.to_representation(product) if product is not None else None,
+            })
+
+        return Response({
+            "cursor": ProductChange.format_cursor(*(rows[-1][:2] if rows else since)),
+            "has_more": has_more,
+            "results": results,
+        })
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        GET /api/products/facets/
+        Counts per category, price bucket, rating, stock status and active flag for the
+        caller's visible products, honouring ?search= and the ProductFilterBackend filters.
+        """
+        qs = ProductSearchFilter().filter_queryset(request, self.get_queryset(), self)
+        facet_filters = ProductFilterBackend().get_facet_filters(request)
+        return Response(product_facets(qs, facet_filters))
@@ -0,0 +1,55 @@
+# users/authentication.py
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import ROLE_CLAIM, ROLE_VERSION_CLAIM, current_role_version
+
+User = get_user_model()
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the verified token's
+    claims (users.tokens.role_claims) instead of loading the user and profile.
+
+    request.user is a User with only its id and is_staff loaded; it works for
+    ownership checks and foreign keys without a query, and every other field
+    (username, is_active, ...) is read from the database on first access, so it
+    is never stale. Its role is `token_role`, which commons.permissions.get_role
+    prefers over the profile.
+
+    Tokens issued before the user's last role, staff or active status change
+    are refused (users.tokens.revoke_role_tokens), which is what keeps is_staff
+    and the role current and keeps deactivated users out. Changes made with
+    QuerySet.update() skip the signals behind that and need revoke_role_tokens().
+    Tokens without role claims fall back to loading the user.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token or ROLE_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            # The claim is stored as a string; ownership checks compare it with integer foreign keys
+            id_field = User._meta.get_field(api_settings.USER_ID_FIELD)
+            user_id = id_field.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, ValidationError):
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        if validated_token[ROLE_VERSION_CLAIM] != current_role_version(user_id):
+            raise AuthenticationFailed("Your role has changed. Please log in again.", code="role_changed")
+
+        claims = {
+            id_field.attname: user_id,
+            "is_staff": bool(validated_token.get("is_staff", False)),
+        }
+        # Unclaimed fields stay deferred: loaded on access, and never overwritten by save()
+        fields = [f for f in User._meta.concrete_fields if f.attname in claims]
+        user = User.from_db(
+            router.db_for_read(User), [f.attname for f in fields], [claims[f.attname] for f in fields],
+        )
+        user.token_role = validated_token[ROLE_CLAIM]
+        return user
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_supplierrequest_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="role_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
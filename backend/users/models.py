@@ -9,10 +9,21 @@ class UserProfile(models.Model):
     ]
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default="buyer")
+    # Carried in JWTs; bumped when role/staff/active status changes so older tokens stop working
+    role_version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.user.username} ({self.role})"
 
+    def save(self, *args, **kwargs):
+        # role_version only moves through users.tokens.revoke_role_tokens (an F() update);
+        # writing back an instance's stale copy would re-enable revoked tokens
+        if self.pk and not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields if not f.primary_key and f.name != "role_version"
+            ]
+        super().save(*args, **kwargs)
+
 
 class SupplierRequest(models.Model):
     PENDING, APPROVED, REJECTED = "pending", "approved", "rejected"
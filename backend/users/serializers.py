@@ -2,6 +2,8 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from commons.permissions import get_role
+
 from .models import SupplierRequest
 
 User = get_user_model()
@@ -49,8 +51,7 @@ class MeSerializer(serializers.Serializer):
     role = serializers.SerializerMethodField()
 
     def get_role(self, obj):
-        profile = getattr(obj, "profile", None)
-        return getattr(profile, "role", "buyer")
+        return get_role(obj)
 
 
 class SupplierRequestSerializer(serializers.ModelSerializer):
@@ -1,9 +1,45 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from .models import UserProfile
+from .tokens import revoke_role_tokens
+
+# Fields behind the role claims in JWTs (users.tokens.role_claims)
+USER_ACCESS_FIELDS = ("is_staff", "is_active")
+
 
 @receiver(post_save, sender=User)
 def ensure_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.get_or_create(user=instance, defaults={"role": "buyer"})
+
+
+# ---------- Revoke tokens when access changes ----------
+
+@receiver(pre_save, sender=UserProfile)
+def note_role_change(sender, instance, update_fields=None, **kwargs):
+    instance._role_changed = False
+    if instance.pk and (update_fields is None or "role" in update_fields):
+        old = UserProfile.objects.filter(pk=instance.pk).values_list("role", flat=True).first()
+        instance._role_changed = old is not None and old != instance.role
+
+
+@receiver(pre_save, sender=User)
+def note_access_change(sender, instance, update_fields=None, **kwargs):
+    instance._access_changed = False
+    fields = USER_ACCESS_FIELDS if update_fields is None else [f for f in USER_ACCESS_FIELDS if f in update_fields]
+    if instance.pk and fields:
+        old = User.objects.filter(pk=instance.pk).values_list(*fields).first()
+        instance._access_changed = old is not None and old != tuple(getattr(instance, f) for f in fields)
+
+
+@receiver(post_save, sender=UserProfile)
+def revoke_on_role_change(sender, instance, created, **kwargs):
+    if getattr(instance, "_role_changed", False):
+        revoke_role_tokens(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def revoke_on_access_change(sender, instance, created, **kwargs):
+    if getattr(instance, "_access_changed", False):
+        revoke_role_tokens(instance.pk)
@@ -1,3 +1,117 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from products.models import Product
+
+from .tokens import revoke_role_tokens
+
+PASSWORD = "S3cure-pass-123"
+PRODUCT = {
+    "name": "Desk Lamp",
+    "sku": "LAMP-001",
+    "category": "other",
+    "base_price": "10.00",
+    "current_price": "15.00",
+    "stock_qty": 5,
+}
+
+
+def make_user(username, role="buyer", **extra):
+    user = User.objects.create_user(username, f"{username}@example.com", PASSWORD, **extra)
+    user.profile.role = role
+    user.profile.save()
+    return user
+
+
+class RoleClaimsAuthTests(APITestCase):
+    """Requests authenticated from login-issued tokens (users.authentication)"""
+
+    def setUp(self):
+        cache.clear()
+        self.supplier = make_user("supplier1", role="supplier")
+
+    def login(self, username="supplier1"):
+        response = self.client.post("/api/auth/login/", {"username": username, "password": PASSWORD})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def use(self, tokens):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    def test_supplier_updates_and_deletes_own_product(self):
+        self.use(self.login())
+        created = self.client.post("/api/products/", PRODUCT)
+        self.assertEqual(created.status_code, 201, created.data)
+        self.assertEqual(created.data["owner"], self.supplier.pk)
+
+        url = f"/api/products/{created.data['id']}/"
+        updated = self.client.patch(url, {"current_price": "16.00"})
+        self.assertEqual(updated.status_code, 200, updated.data)
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(Product.objects.filter(pk=created.data["id"]).exists())
+
+    def test_supplier_cannot_change_another_suppliers_product(self):
+        other = make_user("supplier2", role="supplier")
+        product = Product.objects.create(owner=other, **PRODUCT)
+        self.use(self.login())
+        url = f"/api/products/{product.pk}/"
+        self.assertEqual(self.client.patch(url, {"current_price": "1.00"}).status_code, 403)
+        self.assertEqual(self.client.delete(url).status_code, 403)
+
+    def test_request_user_is_built_without_queries(self):
+        tokens = self.login()
+        self.use(tokens)
+        self.client.get("/api/auth/me/")  # warms the role version cache
+        # Only the page of products; no user or profile lookups
+        with self.assertNumQueries(1):
+            request = self.client.get("/api/products/mine/", {"fields": "id"}).wsgi_request
+        self.assertEqual(request.user.pk, self.supplier.pk)
+        self.assertIsInstance(request.user.pk, int)
+
+    def test_unclaimed_fields_are_read_from_the_database(self):
+        self.use(self.login())
+        User.objects.filter(pk=self.supplier.pk).update(username="renamed")
+        self.assertEqual(self.client.get("/api/auth/me/").data["username"], "renamed")
+
+    def test_role_change_revokes_tokens(self):
+        tokens = self.login()
+        self.use(tokens)
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 200)
+
+        self.supplier.profile.role = "buyer"
+        self.supplier.profile.save()
+        response = self.client.get("/api/auth/me/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["code"], "role_changed")
+
+        refresh = self.client.post("/api/auth/token/refresh/", {"refresh": tokens["refresh"]})
+        self.assertEqual(refresh.status_code, 401)
+
+        self.use(self.login())
+        self.assertEqual(self.client.get("/api/auth/me/").data["role"], "buyer")
+
+    def test_deactivation_revokes_tokens(self):
+        self.use(self.login())
+        self.supplier.is_active = False
+        self.supplier.save()
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 401)
+
+    def test_revoke_role_tokens(self):
+        self.use(self.login())
+        revoke_role_tokens(self.supplier.pk)
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 401)
+
+    def test_unrelated_save_keeps_tokens(self):
+        self.use(self.login())
+        self.supplier.first_name = "Sam"
+        self.supplier.save()
+        self.supplier.profile.save()
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 200)
+
+    def test_tokens_without_role_claims_load_the_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.supplier)}")
+        response = self.client.get("/api/auth/me/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["role"], "supplier")
@@ -1,7 +1,63 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework import exceptions
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 
+from .models import UserProfile
+
+ROLE_CLAIM = "role"
+ROLE_VERSION_CLAIM = "role_version"
+
+
+def role_claims(user):
+    """Claims users.authentication builds the request user from (no profile query per request)"""
+    profile = getattr(user, "profile", None)
+    return {
+        ROLE_CLAIM: getattr(profile, "role", "buyer"),
+        ROLE_VERSION_CLAIM: getattr(profile, "role_version", 0),
+        "username": user.username,
+        "is_staff": user.is_staff,
+    }
+
+
+# ----------------- Role revocation -----------------
+
+def _role_version_key(user_id):
+    return f"users:role_version:{user_id}"
+
+
+def stored_role_version(user_id):
+    return UserProfile.objects.filter(user_id=user_id).values_list("role_version", flat=True).first() or 0
+
+
+def current_role_version(user_id):
+    """
+    The user's role version, cached for ROLE_VERSION_CACHE_SECONDS. Tokens
+    carrying another version are refused; with a per-process cache other
+    processes notice a change within that window, with a shared one at once.
+    """
+    key = _role_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = stored_role_version(user_id)
+        cache.set(key, version, settings.ROLE_VERSION_CACHE_SECONDS)
+    return version
+
+
+def revoke_role_tokens(user_id):
+    """Invalidate the user's outstanding access and refresh tokens (role, staff or active status changed)"""
+    UserProfile.objects.filter(user_id=user_id).update(role_version=F("role_version") + 1)
+    key = _role_version_key(user_id)
+    cache.delete(key)
+    # A request may cache the old version before this commits; drop it again after
+    transaction.on_commit(lambda: cache.delete(key))
+
+
 # For login: add role in token
 class RoleAwareTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
@@ -15,11 +71,23 @@ class RoleAwareTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        role = getattr(getattr(user, "profile", None), "role", "buyer")
-        token["role"] = role
-        token["username"] = user.username
+        for claim, value in role_claims(user).items():
+            token[claim] = value
         return token
 
+
+class RoleAwareTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuses refresh tokens issued before the user's last role change"""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        version = refresh.payload.get(ROLE_VERSION_CLAIM)
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if version is not None and version != stored_role_version(user_id):
+            raise AuthenticationFailed("Your role has changed. Please log in again.", code="role_changed")
+        return super().validate(attrs)
+
+
 # For email verification
 class EmailVerificationTokenGenerator(PasswordResetTokenGenerator):
     pass
@@ -4,6 +4,7 @@ from .views import (
     # Auth core
     PublicRegisterView,
     RoleTokenView,            # login
+    RoleTokenRefreshView,     # refresh (refuses tokens from before a role change)
     LogoutView,               # logout (blacklist refresh)
     MeView,                   # /auth/me
     VerifyEmailView,          # GET verify link
@@ -16,7 +17,6 @@ from .views import (
     AdminSupplierRequestListView,
     AdminSupplierRequestDetailView,
 )
-from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     # ---------- Auth ----------
@@ -24,7 +24,7 @@ urlpatterns = [
     path("login/", RoleTokenView.as_view(), name="auth-login"),
     path("logout/", LogoutView.as_view(), name="auth-logout"),
     path("me/", MeView.as_view(), name="auth-me"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
+    path("token/refresh/", RoleTokenRefreshView.as_view(), name="token-refresh"),
     # Email verification
     path("verify-email/<uidb64>/<token>/", VerifyEmailView.as_view(), name="auth-verify-email"),
     path("resend-verification/", ResendVerificationView.as_view(), name="auth-resend-verification"),
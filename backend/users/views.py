@@ -5,8 +5,7 @@ from django.db.models import Q
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenBlacklistView
+from rest_framework_simplejwt.views import TokenBlacklistView, TokenRefreshView
 
 from .serializers import (
     PublicRegisterSerializer,
@@ -15,6 +14,7 @@ from .serializers import (
     AdminSupplierRequestUpdateSerializer,
 )
 from .models import SupplierRequest, UserProfile
+from .tokens import RoleAwareTokenObtainPairSerializer, RoleAwareTokenRefreshSerializer
 from .mailer import send_verification_email  # ✅ Add this import
 
 User = get_user_model()
@@ -57,7 +57,7 @@ class PublicRegisterView(generics.CreateAPIView):
 class RoleTokenView(APIView):
     """
     Login with username OR email.
-    Returns JWT tokens if verified.
+    Returns JWT tokens if verified, carrying the user's role (users.tokens.role_claims).
     """
     permission_classes = [permissions.AllowAny]
     authentication_classes = []
@@ -69,7 +69,7 @@ class RoleTokenView(APIView):
             return Response({"detail": "Username/Email and password required"}, status=400)
 
         try:
-            user = User.objects.get(Q(username__iexact=identifier) | Q(email__iexact=identifier))
+            user = User.objects.select_related("profile").get(Q(username__iexact=identifier) | Q(email__iexact=identifier))
         except User.DoesNotExist:
             return Response({"detail": "No active account found with the given credentials"}, status=401)
 
@@ -81,13 +81,18 @@ class RoleTokenView(APIView):
         if not user.is_active:
             return Response({"detail": "Email not verified. Please verify your email."}, status=401)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = RoleAwareTokenObtainPairSerializer.get_token(user)
         return Response({
             "refresh": str(refresh),
             "access": str(refresh.access_token),
         })
 
 
+class RoleTokenRefreshView(TokenRefreshView):
+    """Refresh that refuses tokens issued before the user's last role change"""
+    serializer_class = RoleAwareTokenRefreshSerializer
+
+
 class LogoutView(TokenBlacklistView):
     """Blacklist refresh token on logout"""
     permission_classes = [permissions.IsAuthenticated]
@@ -13,9 +13,10 @@ export async function getForecastOverview() {
   return response.data;
 }
 
-// Get chart data for visualization
-export async function getForecastChartData(productIds = []) {
+// Get chart data for visualization (maxPoints: server-side downsampling per series)
+export async function getForecastChartData(productIds = [], maxPoints) {
   const params = productIds.length > 0 ? { product_ids: productIds.join(',') } : {};
+  if (maxPoints) params.max_points = maxPoints;
   const response = await api.get("/forecast/chart-data/", { params });
   return response.data;
 }
@@ -1,4 +1,4 @@
-import React, { useCallback, useEffect, useMemo, useState } from "react";
+import React, { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import {
   Alert, AppBar, Box, Button, Card, CardContent, Checkbox, Container, Dialog, DialogActions,
   DialogContent, DialogTitle, Grid, IconButton, MenuItem, Paper, Snackbar,
@@ -491,6 +491,8 @@ export default function ProductsPage() {
   const [totalCount, setTotalCount] = useState(0);
   const [page, setPage] = useState(0);
   const [rowsPerPage, setRowsPerPage] = useState(10);
+  // Keyset pagination: cursorsRef.current[i] is the API cursor for page i
+  const cursorsRef = useRef([null]);
   
   // Form and dialog states
   const [formOpen, setFormOpen] = useState(false);
@@ -552,9 +554,12 @@ export default function ProductsPage() {
     setLoading(true);
     try {
       const params = {
-        page: page + 1, // API expects 1-based pagination
         page_size: rowsPerPage,
+        count: "true",
       };
+      if (cursorsRef.current[page]) {
+        params.cursor = cursorsRef.current[page];
+      }
 
       // Only add non-empty filters to params
       if (activeFilters.search) {
@@ -574,6 +579,9 @@ export default function ProductsPage() {
         // Paginated response from Django
         setProducts(response.data.results);
         setTotalCount(response.data.count || 0);
+        // Remember the cursor that leads to the following page
+        const next = response.data.next;
+        cursorsRef.current[page + 1] = next ? new URL(next).searchParams.get("cursor") : null;
       } else if (Array.isArray(response.data)) {
         // Non-paginated response - apply client-side filtering
         let filteredData = response.data;
@@ -628,8 +636,9 @@ export default function ProductsPage() {
     fetchProducts();
   }, [fetchProducts]);
 
-  // Reset page when filters change
+  // Reset page (and cursors) when filters change
   useEffect(() => {
+    cursorsRef.current = [null];
     setPage(0);
   }, [activeFilters]);
 
@@ -704,6 +713,7 @@ export default function ProductsPage() {
   };
 
   const handleChangeRowsPerPage = (event) => {
+    cursorsRef.current = [null];
     setRowsPerPage(parseInt(event.target.value, 10));
     setPage(0);
   };